@@ -1,12 +1,12 @@
 from logging.config import fileConfig
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config, event, pool
 from alembic import context
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.database import Base
+from app.database import Base, register_sqlite_functions
 from app.models import *
 
 config = context.config
@@ -35,6 +35,9 @@ def run_migrations_online() -> None:
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
+    if connectable.dialect.name == "sqlite":
+        # Data migrations compute the same keys as the app
+        event.listen(connectable, "connect", register_sqlite_functions)
 
     with connectable.connect() as connection:
         context.configure(connection=connection, target_metadata=target_metadata)
@@ -0,0 +1,91 @@
+"""add_release_id_to_audit_logs
+
+Revision ID: 6e1f0a2b7c9d
+Revises: 27ab7cbdd29b
+Create Date: 2026-10-17 09:00:00.000000
+
+Denormalizes the release an audit entry belongs to into an indexed column so
+release history no longer scans the whole audit_logs table. Existing rows are
+backfilled from entity_id (release entries) or the release_id stored in the
+new_value / old_value JSON. The backfill runs in Python so it behaves the same
+on SQLite and PostgreSQL.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1f0a2b7c9d'
+down_revision: Union[str, None] = '27ab7cbdd29b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('audit_logs', sa.Column('release_id', sa.Integer(), nullable=True))
+
+    # Backfill existing rows in batches
+    audit_logs = sa.table(
+        'audit_logs',
+        sa.column('id', sa.Integer()),
+        sa.column('entity_type', sa.String()),
+        sa.column('entity_id', sa.Integer()),
+        sa.column('old_value', sa.JSON()),
+        sa.column('new_value', sa.JSON()),
+        sa.column('release_id', sa.Integer()),
+    )
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(
+                audit_logs.c.id,
+                audit_logs.c.entity_type,
+                audit_logs.c.entity_id,
+                audit_logs.c.old_value,
+                audit_logs.c.new_value,
+            )
+            .where(audit_logs.c.id > last_id)
+            .order_by(audit_logs.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = []
+        for row in rows:
+            release_id = None
+            if row.entity_type == 'release':
+                release_id = row.entity_id
+            else:
+                for value in (row.new_value, row.old_value):
+                    if value and value.get('release_id') is not None:
+                        release_id = value['release_id']
+                        break
+            if release_id is not None:
+                updates.append({'row_id': row.id, 'release_id': release_id})
+
+        if updates:
+            conn.execute(
+                audit_logs.update()
+                .where(audit_logs.c.id == sa.bindparam('row_id'))
+                .values(release_id=sa.bindparam('release_id')),
+                updates,
+            )
+
+    op.create_index(
+        'ix_audit_logs_release_id_timestamp',
+        'audit_logs',
+        ['release_id', 'timestamp'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_release_id_timestamp', table_name='audit_logs')
+    with op.batch_alter_table('audit_logs') as batch_op:
+        batch_op.drop_column('release_id')
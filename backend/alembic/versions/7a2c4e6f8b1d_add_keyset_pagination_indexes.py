@@ -0,0 +1,31 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: 7a2c4e6f8b1d
+Revises: 6e1f0a2b7c9d
+Create Date: 2026-10-17 10:00:00.000000
+
+Composite indexes backing cursor pagination of releases (created_at, id),
+audit logs (timestamp, id) and users (name, id).
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2c4e6f8b1d'
+down_revision: Union[str, None] = '6e1f0a2b7c9d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_releases_created_at_id', 'releases', ['created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_timestamp_id', 'audit_logs', ['timestamp', 'id'], unique=False)
+    op.create_index('ix_users_name_id', 'users', ['name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_name_id', table_name='users')
+    op.drop_index('ix_audit_logs_timestamp_id', table_name='audit_logs')
+    op.drop_index('ix_releases_created_at_id', table_name='releases')
@@ -0,0 +1,53 @@
+"""add_release_progress_counters
+
+Revision ID: 8b3d5f7a9c2e
+Revises: 7a2c4e6f8b1d
+Create Date: 2026-10-17 11:00:00.000000
+
+Materializes per-release progress (mandatory/optional totals and approved
+counts) on the releases table and fills it from existing criteria.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3d5f7a9c2e'
+down_revision: Union[str, None] = '7a2c4e6f8b1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ['mandatory_total', 'mandatory_approved', 'optional_total', 'optional_approved']
+
+
+def upgrade() -> None:
+    for name in COUNTERS:
+        op.add_column('releases', sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from release_criteria (statuses are stored by enum name)
+    op.execute("""
+        UPDATE releases SET
+            mandatory_total = (
+                SELECT COUNT(*) FROM release_criteria c
+                WHERE c.release_id = releases.id AND c.is_mandatory = true
+            ),
+            mandatory_approved = (
+                SELECT COUNT(*) FROM release_criteria c
+                WHERE c.release_id = releases.id AND c.is_mandatory = true AND c.status = 'APPROVED'
+            ),
+            optional_total = (
+                SELECT COUNT(*) FROM release_criteria c
+                WHERE c.release_id = releases.id AND c.is_mandatory = false
+            ),
+            optional_approved = (
+                SELECT COUNT(*) FROM release_criteria c
+                WHERE c.release_id = releases.id AND c.is_mandatory = false AND c.status = 'APPROVED'
+            )
+    """)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('releases') as batch_op:
+        for name in reversed(COUNTERS):
+            batch_op.drop_column(name)
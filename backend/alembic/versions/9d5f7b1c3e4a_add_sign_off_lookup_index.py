@@ -0,0 +1,32 @@
+"""add_sign_off_lookup_index
+
+Revision ID: 9d5f7b1c3e4a
+Revises: 8b3d5f7a9c2e
+Create Date: 2026-10-17 12:00:00.000000
+
+Composite index answering "does this user have an active sign-off on this
+criteria" from the index alone, used by the dashboard's pending anti-join.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d5f7b1c3e4a'
+down_revision: Union[str, None] = '8b3d5f7a9c2e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_sign_offs_criteria_signer_status',
+        'sign_offs',
+        ['criteria_id', 'signed_by_id', 'status'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sign_offs_criteria_signer_status', table_name='sign_offs')
@@ -0,0 +1,48 @@
+"""add_product_release_counts
+
+Revision ID: a1c3e5f7b9d2
+Revises: 9d5f7b1c3e4a
+Create Date: 2026-10-17 13:00:00.000000
+
+Materializes per-product release counts by status on the products table and
+fills them from existing (non-deleted) releases.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f7b9d2'
+down_revision: Union[str, None] = '9d5f7b1c3e4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Counter column -> release status (statuses are stored by enum name)
+COUNTERS = {
+    'draft_releases': 'DRAFT',
+    'in_review_releases': 'IN_REVIEW',
+    'approved_releases': 'APPROVED',
+    'released_releases': 'RELEASED',
+    'cancelled_releases': 'CANCELLED',
+}
+
+
+def upgrade() -> None:
+    for name in COUNTERS:
+        op.add_column('products', sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    assignments = ",\n".join(
+        f"""{name} = (
+                SELECT COUNT(*) FROM releases r
+                WHERE r.product_id = products.id AND r.is_deleted = false AND r.status = '{status}'
+            )"""
+        for name, status in COUNTERS.items()
+    )
+    op.execute(f"UPDATE products SET {assignments}")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('products') as batch_op:
+        for name in reversed(list(COUNTERS)):
+            batch_op.drop_column(name)
@@ -0,0 +1,39 @@
+"""add_revision_counters
+
+Revision ID: b2d4f6a8c0e1
+Revises: a1c3e5f7b9d2
+Create Date: 2026-10-17 14:00:00.000000
+
+Per-release change counter and per-collection change counters backing the
+ETags of the release detail, sign-off matrix, product and template lists.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a8c0e1'
+down_revision: Union[str, None] = 'a1c3e5f7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('releases', sa.Column('revision', sa.Integer(), nullable=False, server_default='0'))
+    collection_versions = op.create_table(
+        'collection_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('revision', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.bulk_insert(collection_versions, [
+        {'name': 'products', 'revision': 0},
+        {'name': 'templates', 'revision': 0},
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table('collection_versions')
+    with op.batch_alter_table('releases') as batch_op:
+        batch_op.drop_column('revision')
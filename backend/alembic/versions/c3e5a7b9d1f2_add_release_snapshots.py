@@ -0,0 +1,36 @@
+"""add_release_snapshots
+
+Revision ID: c3e5a7b9d1f2
+Revises: b2d4f6a8c0e1
+Create Date: 2026-10-17 15:00:00.000000
+
+Stored detail and sign-off matrix response bodies of released and cancelled
+releases. Existing finished releases get theirs on first view.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b9d1f2'
+down_revision: Union[str, None] = 'b2d4f6a8c0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'release_snapshots',
+        sa.Column('release_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('revision', sa.Integer(), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['release_id'], ['releases.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('release_id', 'kind'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('release_snapshots')
@@ -0,0 +1,46 @@
+"""unique_active_sign_off
+
+Revision ID: d4f6a8c0e2b3
+Revises: c3e5a7b9d1f2
+Create Date: 2026-10-17 16:00:00.000000
+
+Partial unique index allowing one active (non-revoked) sign-off per user and
+criteria. Concurrent submissions could previously leave duplicates; all but
+the latest of each are revoked first, matching what the sign-off matrix shows.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6a8c0e2b3'
+down_revision: Union[str, None] = 'c3e5a7b9d1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE sign_offs SET status = 'REVOKED'
+        WHERE status != 'REVOKED'
+          AND id NOT IN (
+            SELECT MAX(id) FROM sign_offs
+            WHERE status != 'REVOKED'
+            GROUP BY criteria_id, signed_by_id
+          )
+        """
+    )
+    op.create_index(
+        'uq_sign_offs_active_criteria_signer',
+        'sign_offs',
+        ['criteria_id', 'signed_by_id'],
+        unique=True,
+        sqlite_where=sa.text("status != 'REVOKED'"),
+        postgresql_where=sa.text("status != 'REVOKED'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_sign_offs_active_criteria_signer', table_name='sign_offs')
@@ -0,0 +1,68 @@
+"""add_criteria_sort_key
+
+Revision ID: e5a7c9e1f3b4
+Revises: d4f6a8c0e2b3
+Create Date: 2026-10-17 17:00:00.000000
+
+Stores each criteria's canonical display position (predefined criteria in
+their fixed order, then custom ones alphabetically) so release detail and the
+sign-off matrix can ORDER BY it instead of sorting in Python, and fills it
+from the existing names.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9e1f3b4'
+down_revision: Union[str, None] = 'd4f6a8c0e2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.utils.criteria_order.PREDEFINED_CRITERIA_ORDER at the time of this migration
+PREDEFINED_CRITERIA_ORDER = [
+    "Content Review",
+    "Bug Verification",
+    "Smoke & Extended Smoke Regression",
+    "Full Regression",
+    "CPT Sign-off",
+    "Pre-Prod Monitoring incl. Crash Analysis",
+    "Production Monitoring",
+    "Security Audit",
+]
+
+
+def upgrade() -> None:
+    # Byte-wise comparison on PostgreSQL, like SQLite and the Python key
+    sort_key_type = sa.String(260).with_variant(sa.String(260, collation='C'), 'postgresql')
+    op.add_column('release_criteria', sa.Column('sort_key', sort_key_type, nullable=False, server_default=''))
+
+    # Backfill: predefined names get '0:<position>', custom ones '1:<lowercased name>'
+    release_criteria = sa.table('release_criteria', sa.column('name', sa.String), sa.column('sort_key', sa.String))
+    predefined = {name: f'0:{index:02d}' for index, name in enumerate(PREDEFINED_CRITERIA_ORDER)}
+    # Fold non-ASCII names like Python's str.lower: alembic/env.py registers
+    # py_lower() on SQLite, and PostgreSQL gets an explicit ICU collation
+    if op.get_bind().dialect.name == 'sqlite':
+        lowered = sa.func.py_lower(release_criteria.c.name)
+    elif op.get_bind().dialect.name == 'postgresql':
+        lowered = sa.func.lower(release_criteria.c.name.collate('und-x-icu'))
+    else:
+        lowered = sa.func.lower(release_criteria.c.name)
+    op.execute(
+        release_criteria.update().values(
+            sort_key=sa.case(
+                predefined,
+                value=release_criteria.c.name,
+                else_=sa.literal('1:') + lowered,
+            )
+        )
+    )
+
+    op.create_index('ix_release_criteria_release_sort_key', 'release_criteria', ['release_id', 'sort_key'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_release_criteria_release_sort_key', table_name='release_criteria')
+    with op.batch_alter_table('release_criteria') as batch_op:
+        batch_op.drop_column('sort_key')
@@ -1,11 +1,12 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select, or_, and_, cast, String
-from sqlalchemy.orm import selectinload
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models.audit import AuditLog
 from app.models.user import User
+from app.utils.pagination import apply_keyset, parse_cursor, set_next_cursor
 
 router = APIRouter()
 
@@ -13,33 +14,31 @@ router = APIRouter()
 @router.get("/releases/{release_id}/history")
 async def get_release_history(
     release_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
-    # Get all audit logs with actor relationship
-    result = await db.execute(
-        select(AuditLog)
-        .options(selectinload(AuditLog.actor))
-        .order_by(AuditLog.timestamp.desc())
-    )
-    all_logs = result.scalars().all()
-
-    # Filter in Python for SQLite compatibility
-    filtered_logs = []
-    for log in all_logs:
-        # Direct release match
-        if log.entity_type == "release" and log.entity_id == release_id:
-            filtered_logs.append(log)
-            continue
+    """
+    A release's audit entries, newest first.
 
-        # Check new_value for release_id
-        if log.new_value and log.new_value.get("release_id") == release_id:
-            filtered_logs.append(log)
-            continue
-
-        # Check old_value for release_id (for delete operations)
-        if log.old_value and log.old_value.get("release_id") == release_id:
-            filtered_logs.append(log)
-            continue
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next
+    page by keyset on (timestamp, id); `skip` is ignored when a cursor is given.
+    """
+    cursor_values = parse_cursor(cursor, datetime, int)
+    # Single query on the (release_id, timestamp) index, with the actor name joined in
+    query = (
+        select(AuditLog, User.name)
+        .outerjoin(User, AuditLog.actor_id == User.id)
+        .where(AuditLog.release_id == release_id)
+    )
+    query = apply_keyset(query, [AuditLog.timestamp, AuditLog.id], cursor_values, descending=True)
+    if cursor_values is None:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    rows = result.all()
+    set_next_cursor(response, [log for log, _ in rows], limit, "timestamp", "id")
 
     return [
         {
@@ -48,25 +47,34 @@ async def get_release_history(
             "entity_id": log.entity_id,
             "action": log.action,
             "actor_id": log.actor_id,
-            "actor_name": log.actor.name if log.actor else None,
+            "actor_name": actor_name,
             "old_value": log.old_value,
             "new_value": log.new_value,
             "timestamp": log.timestamp.isoformat(),
         }
-        for log in filtered_logs
+        for log, actor_name in rows
     ]
 
 
 @router.get("/audit")
 async def query_audit_logs(
+    response: Response,
     entity_type: Optional[str] = None,
     entity_id: Optional[int] = None,
     actor_id: Optional[int] = None,
     action: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
+    """
+    Query audit logs, newest first.
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next
+    page by keyset on (timestamp, id); `skip` is ignored when a cursor is given.
+    """
+    cursor_values = parse_cursor(cursor, datetime, int)
     query = select(AuditLog)
 
     if entity_type:
@@ -78,9 +86,12 @@ async def query_audit_logs(
     if action:
         query = query.where(AuditLog.action == action)
 
-    query = query.offset(skip).limit(limit).order_by(AuditLog.timestamp.desc())
-    result = await db.execute(query)
+    query = apply_keyset(query, [AuditLog.timestamp, AuditLog.id], cursor_values, descending=True)
+    if cursor_values is None:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
     logs = result.scalars().all()
+    set_next_cursor(response, logs, limit, "timestamp", "id")
 
     return [
         {
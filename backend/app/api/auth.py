@@ -3,14 +3,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
 
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.config import get_settings
 from app.utils.jwt import create_access_token
+from app.utils.google_auth import GoogleCertsUnavailableError, get_google_token_verifier
 from app.dependencies.auth import get_current_user
+from app.services.user_cache import user_cache
+from app.services.versions import bump_user_releases
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -73,10 +74,9 @@ async def google_auth(
         )
 
     try:
-        # Verify the Google ID token
-        idinfo = id_token.verify_oauth2_token(
+        # Verify the Google ID token (cached certs, signature check off the event loop)
+        idinfo = await get_google_token_verifier().verify(
             request.credential,
-            google_requests.Request(),
             settings.google_client_id
         )
 
@@ -97,6 +97,11 @@ async def google_auth(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid Google token: {str(e)}"
         )
+    except GoogleCertsUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unable to verify Google token right now, please retry"
+        )
 
     # Check if user exists by google_id or email
     result = await db.execute(
@@ -110,11 +115,18 @@ async def google_auth(
         # Update existing user's Google info if needed
         if not user.google_id:
             user.google_id = google_id
+        changed = False
         if avatar_url and user.avatar_url != avatar_url:
             user.avatar_url = avatar_url
+            changed = True
         if user.name != name:
             user.name = name
+            changed = True
+        if changed:
+            # Names and avatars are shown on the releases the user is a stakeholder on
+            await bump_user_releases(db, [user.id])
         await db.commit()
+        user_cache.invalidate(user.id)
         await db.refresh(user)
     else:
         # Create new user (auto-create on first login)
@@ -155,15 +167,10 @@ async def google_auth(
 @router.get("/me", response_model=CurrentUserResponse)
 async def get_current_user_info(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
 ):
     """Get the current authenticated user's information."""
-    # Check if user has any product permissions (is product owner)
-    from app.models.product_permission import ProductPermission
-    result = await db.execute(
-        select(ProductPermission).where(ProductPermission.user_id == current_user.id).limit(1)
-    )
-    is_product_owner = result.scalar_one_or_none() is not None
+    # Product permissions are resolved (and cached) by get_current_user
+    is_product_owner = len(current_user.product_permissions) > 0
 
     return CurrentUserResponse(
         id=current_user.id,
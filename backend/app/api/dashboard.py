@@ -1,12 +1,14 @@
+from datetime import date
+from typing import Optional
 from fastapi import APIRouter, Depends
-from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from app.database import get_db
-from app.models.release import Release, ReleaseCriteria, ReleaseStatus, CriteriaStatus
-from app.models.release_stakeholder import ReleaseStakeholder
-from app.models.signoff import SignOff, SignOffStatus
 from app.dependencies import RequireAnyRole
+from app.readmodels import my_pending_count, my_pending_rows, product_release_count_rows, release_count_totals
+from app.services.release_counts import counts_from_product
+from app.utils import fastjson
+from app.utils.fastjson import json_response
+from app.utils.pagination import parse_cursor, set_next_cursor
 
 router = APIRouter()
 
@@ -14,82 +16,74 @@ router = APIRouter()
 @router.get("/dashboard/my-pending")
 async def get_my_pending_signoffs(
     current_user: RequireAnyRole,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
-    # Find releases where the current user is a stakeholder
-    stakeholder_result = await db.execute(
-        select(ReleaseStakeholder.release_id).where(
-            ReleaseStakeholder.user_id == current_user.id
-        )
-    )
-    stakeholder_release_ids = [r[0] for r in stakeholder_result.all()]
+    """
+    Criteria awaiting the current user's sign-off, soonest target date first.
 
-    if not stakeholder_release_ids:
-        return []
-
-    # Get all criteria for those releases that are in review
-    criteria_result = await db.execute(
-        select(ReleaseCriteria, Release)
-        .join(Release)
-        .options(selectinload(ReleaseCriteria.sign_offs))
-        .where(
-            ReleaseCriteria.release_id.in_(stakeholder_release_ids),
-            Release.is_deleted == False,
-            Release.status == ReleaseStatus.IN_REVIEW,  # Only show for releases in review
-        )
-        .order_by(Release.target_date.asc().nullslast())
-    )
-    all_rows = criteria_result.all()
-
-    # Filter to criteria where user hasn't signed off (or sign-off was revoked)
-    pending_items = []
-    for criteria, release in all_rows:
-        # Check if user has an active (non-revoked) sign-off for this criteria
-        user_signoffs = [
-            so for so in criteria.sign_offs
-            if so.signed_by_id == current_user.id and so.status != SignOffStatus.REVOKED
-        ]
-        if not user_signoffs:
-            pending_items.append((criteria, release))
-
-    return [
+    Returns every item unless `limit` is given. When paging, pass the
+    X-Next-Cursor response header back as `cursor` to fetch the next page by
+    keyset on (target date, release id, criteria id).
+    """
+    cursor_values = parse_cursor(cursor, date, int, int)
+    rows = await my_pending_rows(db, current_user.id, limit, cursor_values)
+    items = [
         {
-            "criteria_id": c.id,
-            "criteria_name": c.name,
-            "release_id": c.release_id,
-            "release_name": r.name,
-            "release_version": r.version,
-            "is_mandatory": c.is_mandatory,
+            "criteria_id": row.id,
+            "criteria_name": row.name,
+            "release_id": row.release_id,
+            "release_name": row.release_name,
+            "release_version": row.version,
+            "is_mandatory": row.is_mandatory,
+            "criteria_status": row.status,
         }
-        for c, r in pending_items
+        for row in rows
     ]
+    response = json_response(fastjson.dumps(items))
+    if limit is not None:
+        set_next_cursor(response, rows, limit, "sort_date", "release_id", "id")
+    return response
+
+
+@router.get("/dashboard/my-pending/count")
+async def get_my_pending_count(
+    current_user: RequireAnyRole,
+    db: AsyncSession = Depends(get_db),
+):
+    """Number of criteria awaiting the current user's sign-off, for header badges."""
+    return {"count": await my_pending_count(db, current_user.id)}
 
 
 @router.get("/dashboard/releases-summary")
 async def get_releases_summary(
     current_user: RequireAnyRole,
+    include_products: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Release.status, func.count(Release.id))
-        .where(Release.is_deleted == False)
-        .group_by(Release.status)
-    )
-    status_counts = {status.value: count for status, count in result.all()}
+    """
+    Release counts overall and by status, summed from the counters kept on
+    each product row (see app.services.release_counts) in one aggregate
+    query. The per-product breakdown costs a second query and is only
+    included when asked for.
+    """
+    by_status = counts_from_product(await release_count_totals(db))
+    summary = {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+    }
 
-    # Get total releases
-    total_result = await db.execute(
-        select(func.count(Release.id)).where(Release.is_deleted == False)
-    )
-    total = total_result.scalar()
+    if include_products:
+        by_product = []
+        for row in await product_release_count_rows(db):
+            counts = counts_from_product(row)
+            by_product.append({
+                "product_id": row.id,
+                "product_name": row.name,
+                "total": sum(counts.values()),
+                "by_status": counts,
+            })
+        summary["by_product"] = by_product
 
-    return {
-        "total": total,
-        "by_status": {
-            "draft": status_counts.get("draft", 0),
-            "in_review": status_counts.get("in_review", 0),
-            "approved": status_counts.get("approved", 0),
-            "released": status_counts.get("released", 0),
-            "cancelled": status_counts.get("cancelled", 0),
-        },
-    }
+    return summary
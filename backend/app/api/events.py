@@ -0,0 +1,58 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import get_db
+from app.models.release import Release
+from app.dependencies import RequireAnyRole
+from app.services.events import event_bus, format_sse
+
+router = APIRouter()
+
+
+@router.get("/releases/{release_id}/events")
+async def stream_release_events(
+    release_id: int,
+    current_user: RequireAnyRole,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Stream live sign-off matrix deltas for a release as Server-Sent Events.
+
+    The first frame is a "ready" event; clients should (re)load the matrix when
+    they receive it or a "resync" event, then apply deltas as they arrive.
+    """
+    result = await db.execute(select(Release.id).where(Release.id == release_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Release not found",
+        )
+    # Don't hold a pooled connection for the lifetime of the stream
+    await db.close()
+
+    heartbeat = get_settings().sse_heartbeat_seconds
+
+    async def stream():
+        subscription = await event_bus.subscribe(release_id)
+        try:
+            yield "retry: 3000\n\n"
+            yield format_sse("ready", {"release_id": release_id})
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    # Comment frame keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event["type"], event)
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,6 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
@@ -8,12 +8,17 @@ from app.models.product import Product
 from app.models.product_permission import ProductPermission
 from app.models.user import User
 from app.schemas.product_permission import (
+    ProductPermissionBulkAction,
+    ProductPermissionBulkResult,
+    ProductPermissionBulkUpdate,
     ProductPermissionCreate,
     ProductPermissionResponse,
     ProductPermissionWithUser,
     UserBasicInfo,
 )
 from app.dependencies import RequireAdmin
+from app.services.permissions import grant_permissions, revoke_permissions, sync_roles
+from app.services.versions import PRODUCTS, bump_collection
 
 router = APIRouter()
 
@@ -53,40 +58,21 @@ async def grant_product_permissions(
             detail="One or more user IDs are invalid",
         )
 
-    # Grant permissions (skip duplicates)
-    created_permissions = []
-    for user_id in permission_data.user_ids:
-        # Check if already has permission
-        existing = await db.execute(
-            select(ProductPermission).where(
-                ProductPermission.product_id == product_id,
-                ProductPermission.user_id == user_id,
-            )
-        )
-        if existing.scalar_one_or_none():
-            continue  # Skip if already has permission
-
-        permission = ProductPermission(
-            product_id=product_id,
-            user_id=user_id,
-            permission_type=permission_data.permission_type,
-            granted_by_id=current_user.id,
-        )
-        db.add(permission)
-        created_permissions.append(permission)
-
-    await db.commit()
-
-    # Refresh and sync roles for affected users
-    for permission in created_permissions:
-        await db.refresh(permission)
-        # Get user and sync their role
-        user_result = await db.execute(select(User).where(User.id == permission.user_id))
-        user = user_result.scalar_one()
-        await user.sync_role_from_permissions(db)
-
+    # Grant permissions (skip duplicates) in one INSERT ... SELECT, then
+    # recompute every affected user's role in one UPDATE
+    created_permissions = await grant_permissions(
+        db,
+        permission_data.user_ids,
+        granted_by_id=current_user.id,
+        product_ids=[product_id],
+        permission_type=permission_data.permission_type,
+    )
+    await sync_roles(db, [p.user_id for p in created_permissions])
     await db.commit()
 
+    # Keep the caller's order
+    position = {user_id: i for i, user_id in reversed(list(enumerate(permission_data.user_ids)))}
+    created_permissions.sort(key=lambda p: position[p.user_id])
     return created_permissions
 
 
@@ -170,10 +156,58 @@ async def revoke_product_permission(
         )
 
     await db.delete(permission)
+    await db.flush()
+    await bump_collection(db, PRODUCTS)
 
     # Sync role for affected user
-    user_result = await db.execute(select(User).where(User.id == user_id))
-    user = user_result.scalar_one()
-    await user.sync_role_from_permissions(db)
+    await sync_roles(db, [user_id])
+    await db.commit()
 
+
+@router.post(
+    "/product-permissions/bulk",
+    response_model=ProductPermissionBulkResult,
+)
+async def bulk_update_product_permissions(
+    bulk_data: ProductPermissionBulkUpdate,
+    current_user: RequireAdmin,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Grant or revoke permissions for many users on many products in one
+    transaction. Existing grants and missing permissions are skipped.
+    Only admins can change product permissions.
+    """
+    user_ids = list(dict.fromkeys(bulk_data.user_ids))
+    product_ids = list(dict.fromkeys(bulk_data.product_ids))
+
+    # Verify all users and products exist
+    user_count = await db.scalar(select(func.count(User.id)).where(User.id.in_(user_ids)))
+    if user_count != len(user_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="One or more user IDs are invalid",
+        )
+    product_count = await db.scalar(select(func.count(Product.id)).where(Product.id.in_(product_ids)))
+    if product_count != len(product_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="One or more product IDs are invalid",
+        )
+
+    if bulk_data.action == ProductPermissionBulkAction.GRANT:
+        created = await grant_permissions(
+            db,
+            user_ids,
+            granted_by_id=current_user.id,
+            product_ids=product_ids,
+            permission_type=bulk_data.permission_type,
+        )
+        changed = [(p.product_id, p.user_id) for p in created]
+    else:
+        changed = await revoke_permissions(db, user_ids, product_ids)
+
+    await sync_roles(db, {user_id for _, user_id in changed})
     await db.commit()
+
+    return ProductPermissionBulkResult(action=bulk_data.action, changed=len(changed))
@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,49 +8,32 @@ from app.models.product import Product
 from app.models.template import Template
 from app.schemas.product import ProductCreate, ProductResponse, ProductUpdate
 from app.dependencies import RequireAdmin, RequireAnyRole
+from app.readmodels import product_list
+from app.services.user_cache import user_cache
+from app.services.versions import PRODUCTS, bump_collection, collection_version
+from app.utils import fastjson
+from app.utils.etag import make_etag, not_modified
+from app.utils.fastjson import json_response
 
 router = APIRouter()
 
 
 @router.get("/products", response_model=List[ProductResponse])
 async def list_products(
+    request: Request,
+    response: Response,
     current_user: RequireAnyRole,
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Product)
-        .options(selectinload(Product.permissions))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Product.name)
-    )
-    products = result.scalars().all()
+    """List products with their owners. Sends an ETag and answers If-None-Match with 304."""
+    etag = make_etag(PRODUCTS, await collection_version(db, PRODUCTS))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
 
-    # Map permissions to product_owners for response
-    response_products = []
-    for product in products:
-        product_dict = {
-            "id": product.id,
-            "name": product.name,
-            "description": product.description,
-            "default_template_id": product.default_template_id,
-            "created_at": product.created_at,
-            "updated_at": product.updated_at,
-            "product_owners": [
-                {
-                    "id": p.id,
-                    "user_id": p.user_id,
-                    "permission_type": p.permission_type,
-                    "granted_at": p.granted_at,
-                }
-                for p in product.permissions
-            ],
-        }
-        response_products.append(product_dict)
-
-    return response_products
+    return json_response(fastjson.dumps(await product_list(db, skip, limit)), etag)
 
 
 @router.post("/products", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
@@ -69,6 +52,7 @@ async def create_product(
 
     db_product = Product(**product.model_dump())
     db.add(db_product)
+    await bump_collection(db, PRODUCTS)
     await db.commit()
     await db.refresh(db_product)
     return db_product
@@ -145,6 +129,7 @@ async def update_product(
     for field, value in update_data.items():
         setattr(product, field, value)
 
+    await bump_collection(db, PRODUCTS)
     await db.commit()
     await db.refresh(product)
     return product
@@ -165,4 +150,7 @@ async def delete_product(
         )
 
     await db.delete(product)
+    await bump_collection(db, PRODUCTS)
     await db.commit()
+    # Deleting a product cascades to its permissions; cached owners are stale
+    user_cache.clear()
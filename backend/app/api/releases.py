@@ -1,26 +1,45 @@
+from collections import defaultdict
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models.product import Product
 from app.models.product_permission import ProductPermission
-from app.models.template import Template, TemplateCriteria
 from app.models.release import Release, ReleaseCriteria, ReleaseStatus, CriteriaStatus
 from app.models.release_stakeholder import ReleaseStakeholder
+from app.models.signoff import SignOff
 from app.models.user import User
 from app.schemas.release import (
     ReleaseCreate,
     ReleaseResponse,
     ReleaseUpdate,
+    ReleaseClone,
     ReleaseDetailResponse,
     ReleaseCriteriaCreate,
     ReleaseCriteriaResponse,
     ReleaseCriteriaUpdate,
+    CriteriaStatusRebuildResponse,
 )
 from app.dependencies import RequireAdmin, RequireAnyRole, get_current_user
+from app.readmodels import RELEASE_COLUMNS, release_rows
 from app.services.audit import AuditService
+from app.services.criteria_status import rebuild_criteria_statuses
+from app.services.progress import adjust_progress, progress_from_counters
+from app.services.release_copy import clone_criteria, clone_stakeholders, instantiate_template
+from app.services.release_counts import adjust_release_counts
+from app.services.versions import bump_release
+from app.services import events
+from app.services import snapshots
+from app.services.snapshots import FROZEN_STATUSES, fill_snapshot, snapshot_query, store_snapshots
+from app.api.stakeholders import build_sign_off_matrix
+from app.utils.signoff_logic import compute_criteria_statuses
+from app.utils.etag import make_etag, not_modified
+from app.utils import fastjson
+from app.utils.fastjson import json_response
+from app.utils.pagination import parse_cursor, set_next_cursor
 
 router = APIRouter()
 
@@ -49,56 +68,6 @@ def criteria_to_dict(criteria: ReleaseCriteria) -> dict:
         "owner_id": criteria.owner_id,
     }
 
-# Canonical order for predefined criteria
-PREDEFINED_CRITERIA_ORDER = [
-    "Content Review",
-    "Bug Verification",
-    "Smoke & Extended Smoke Regression",
-    "Full Regression",
-    "CPT Sign-off",
-    "Pre-Prod Monitoring incl. Crash Analysis",
-    "Production Monitoring",
-    "Security Audit",
-]
-
-
-def get_criteria_sort_key(criteria: ReleaseCriteria) -> tuple:
-    """
-    Returns a sort key for criteria to ensure consistent ordering.
-    Predefined criteria come first in canonical order, custom criteria come last.
-    """
-    try:
-        # If it's a predefined criteria, use its index in the canonical order
-        index = PREDEFINED_CRITERIA_ORDER.index(criteria.name)
-        return (0, index)  # (0 = predefined, index in canonical order)
-    except ValueError:
-        # Custom criteria come after predefined, sorted by name
-        return (1, criteria.name.lower())  # (1 = custom, alphabetical)
-
-
-def sort_criteria(criteria: List[ReleaseCriteria]) -> List[ReleaseCriteria]:
-    """Sort criteria according to canonical order."""
-    return sorted(criteria, key=get_criteria_sort_key)
-
-
-def calculate_progress(criteria: List[ReleaseCriteria]) -> dict:
-    mandatory = [c for c in criteria if c.is_mandatory]
-    optional = [c for c in criteria if not c.is_mandatory]
-
-    mandatory_approved = sum(1 for c in mandatory if c.status == CriteriaStatus.APPROVED)
-    optional_approved = sum(1 for c in optional if c.status == CriteriaStatus.APPROVED)
-
-    return {
-        "mandatory_total": len(mandatory),
-        "mandatory_approved": mandatory_approved,
-        "mandatory_percent": (mandatory_approved / len(mandatory) * 100) if mandatory else 100,
-        "optional_total": len(optional),
-        "optional_approved": optional_approved,
-        "optional_percent": (optional_approved / len(optional) * 100) if optional else 100,
-        "all_mandatory_approved": mandatory_approved == len(mandatory),
-    }
-
-
 async def check_release_permission(
     user: User,
     release_id: int,
@@ -122,6 +91,21 @@ async def check_release_permission(
             detail="Release not found",
         )
 
+    await check_release_product_permission(user, release, db)
+
+
+async def check_release_product_permission(
+    user: User,
+    release: Release,
+    db: AsyncSession
+) -> None:
+    """
+    check_release_permission for a release the caller has already loaded.
+    Raises HTTPException if user doesn't have permission.
+    """
+    if user.is_admin:
+        return
+
     # Check if user is a product owner for this product
     permission_result = await db.execute(
         select(ProductPermission).where(
@@ -143,18 +127,20 @@ async def list_releases(
     status: Optional[ReleaseStatus] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Release).where(Release.is_deleted == False)
-
-    if product_id:
-        query = query.where(Release.product_id == product_id)
-    if status:
-        query = query.where(Release.status == status)
+    """
+    List releases, newest first.
 
-    query = query.offset(skip).limit(limit).order_by(Release.created_at.desc())
-    result = await db.execute(query)
-    return result.scalars().all()
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next
+    page by keyset on (created_at, id); `skip` is ignored when a cursor is given.
+    """
+    cursor_values = parse_cursor(cursor, datetime, int)
+    rows = await release_rows(db, product_id, status, skip, limit, cursor_values)
+    response = json_response(fastjson.dumps([row._asdict() for row in rows]))
+    set_next_cursor(response, rows, limit, "created_at", "id")
+    return response
 
 
 @router.post("/releases", response_model=ReleaseDetailResponse, status_code=status.HTTP_201_CREATED)
@@ -201,29 +187,18 @@ async def create_release(
         name=release.name,
         description=release.description,
         target_date=release.target_date,
+        candidate_build=release.candidate_build,
     )
     db.add(db_release)
     await db.flush()
+    await adjust_release_counts(db, db_release.product_id, None, db_release.status)
 
-    # If template provided, copy criteria from template
+    # If template provided, copy its criteria inside the database
     if template_id:
-        template_result = await db.execute(
-            select(Template)
-            .where(Template.id == template_id)
-            .options(selectinload(Template.criteria))
-        )
-        template = template_result.scalar_one_or_none()
-        if template:
-            for tc in template.criteria:
-                db_criteria = ReleaseCriteria(
-                    release_id=db_release.id,
-                    name=tc.name,
-                    description=tc.description,
-                    is_mandatory=tc.is_mandatory,
-                    owner_id=tc.default_owner_id,
-                    order=tc.order,
-                )
-                db.add(db_criteria)
+        criteria = await instantiate_template(db, template_id, [db_release.id])
+        # Template criteria start pending, so only the totals are non-zero
+        db_release.mandatory_total = sum(1 for c in criteria if c.is_mandatory)
+        db_release.optional_total = sum(1 for c in criteria if not c.is_mandatory)
 
     # Automatically assign the creating user as a stakeholder
     stakeholder = ReleaseStakeholder(
@@ -243,55 +218,213 @@ async def create_release(
 
     await db.commit()
 
-    # Reload with relationships
-    result = await db.execute(
-        select(Release)
-        .where(Release.id == db_release.id)
-        .options(
-            selectinload(Release.criteria).selectinload(ReleaseCriteria.sign_offs),
-            selectinload(Release.stakeholders).selectinload(ReleaseStakeholder.user)
+    detail = await build_release_detail(db, db_release.id)
+    return json_response(fastjson.dumps(detail), status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    "/releases/{release_id}/clone",
+    response_model=ReleaseDetailResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def clone_release(
+    release_id: int,
+    clone: ReleaseClone,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Create a new version of a release with its criteria (including owners),
+    stakeholders and candidate build. Criteria start pending; sign-offs are
+    not copied. Description, target date and candidate build default to the
+    source's.
+
+    Criteria and stakeholders are copied with one INSERT ... SELECT each,
+    however many there are.
+    """
+    result = await db.execute(select(Release).where(Release.id == release_id, Release.is_deleted == False))
+    source = result.scalar_one_or_none()
+    if not source:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Release not found",
         )
+
+    # Check permission (admin or product owner)
+    await check_release_product_permission(current_user, source, db)
+
+    copied = {
+        field: getattr(clone, field) if field in clone.model_fields_set else getattr(source, field)
+        for field in ("description", "target_date", "candidate_build")
+    }
+    db_release = Release(
+        product_id=source.product_id,
+        template_id=source.template_id,
+        version=clone.version,
+        name=clone.name,
+        **copied,
+    )
+    db.add(db_release)
+    await db.flush()
+    await adjust_release_counts(db, db_release.product_id, None, db_release.status)
+
+    criteria = await clone_criteria(db, source.id, db_release.id)
+    # Cloned criteria start pending, so only the totals are non-zero
+    db_release.mandatory_total = sum(1 for c in criteria if c.is_mandatory)
+    db_release.optional_total = sum(1 for c in criteria if not c.is_mandatory)
+    if clone.include_stakeholders:
+        await clone_stakeholders(db, source.id, db_release.id)
+
+    # Audit log: release created from the source
+    audit_service = AuditService(db)
+    await audit_service.log_create(
+        entity_type="release",
+        entity_id=db_release.id,
+        new_value={**release_to_dict(db_release), "cloned_from_id": source.id},
+        actor_id=current_user.id,
     )
-    release_obj = result.scalar_one()
 
-    return ReleaseDetailResponse(
-        **{c.name: getattr(release_obj, c.name) for c in Release.__table__.columns},
-        criteria=release_obj.criteria,
-        progress=calculate_progress(release_obj.criteria),
-        stakeholders=release_obj.stakeholders,
+    await db.commit()
+
+    detail = await build_release_detail(db, db_release.id)
+    return json_response(fastjson.dumps(detail), status_code=status.HTTP_201_CREATED)
+
+
+# Columns of the nested parts of the detail payload, in response-model field order
+DETAIL_CRITERIA_COLUMNS = [
+    ReleaseCriteria.name, ReleaseCriteria.description, ReleaseCriteria.is_mandatory, ReleaseCriteria.owner_id,
+    ReleaseCriteria.order, ReleaseCriteria.id, ReleaseCriteria.release_id, ReleaseCriteria.status,
+    ReleaseCriteria.created_at, ReleaseCriteria.updated_at,
+]
+DETAIL_SIGN_OFF_COLUMNS = [
+    SignOff.status, SignOff.comment, SignOff.link, SignOff.id, SignOff.criteria_id, SignOff.signed_by_id,
+    SignOff.signed_at,
+]
+
+
+async def build_release_detail(db: AsyncSession, release_id: int) -> Optional[dict]:
+    """
+    Detail payload of a release (ReleaseDetailResponse shape) as plain dicts,
+    or None if it does not exist.
+
+    Four Core queries - release, criteria, sign-offs, stakeholders - select
+    only the response's columns, so nothing is hydrated into ORM objects or
+    validated into pydantic models; encode the result with app.utils.fastjson.
+    Criteria statuses are recomputed from the sign-offs, except manually
+    BLOCKED ones.
+    """
+    release = (await db.execute(
+        select(*RELEASE_COLUMNS).where(Release.id == release_id, Release.is_deleted == False)
+    )).one_or_none()
+    if not release:
+        return None
+
+    criteria = (await db.execute(
+        select(*DETAIL_CRITERIA_COLUMNS)
+        .where(ReleaseCriteria.release_id == release_id)
+        .order_by(ReleaseCriteria.sort_key, ReleaseCriteria.id)
+    )).all()
+    sign_offs = (await db.execute(
+        select(*DETAIL_SIGN_OFF_COLUMNS)
+        .join(ReleaseCriteria, SignOff.criteria_id == ReleaseCriteria.id)
+        .where(ReleaseCriteria.release_id == release_id)
+        .order_by(SignOff.id)
+    )).all()
+    stakeholders = (await db.execute(
+        select(
+            ReleaseStakeholder.id, ReleaseStakeholder.release_id, ReleaseStakeholder.user_id,
+            ReleaseStakeholder.assigned_at, User.name, User.email, User.role,
+        )
+        .join(User, ReleaseStakeholder.user_id == User.id)
+        .where(ReleaseStakeholder.release_id == release_id)
+        .order_by(ReleaseStakeholder.id)
+    )).all()
+
+    # Criteria arrive in canonical order; statuses are computed in bulk
+    computed_statuses = compute_criteria_statuses(
+        criteria, {release_id: {s.user_id for s in stakeholders}}, sign_offs
     )
+    sign_offs_by_criteria = defaultdict(list)
+    for sign_off in sign_offs:
+        sign_offs_by_criteria[sign_off.criteria_id].append(sign_off._asdict())
+
+    return {
+        **release._asdict(),
+        "criteria": [
+            {
+                **c._asdict(),
+                "status": c.status if c.status == CriteriaStatus.BLOCKED else computed_statuses[c.id],
+                "sign_offs": sign_offs_by_criteria[c.id],
+            }
+            for c in criteria
+        ],
+        "progress": progress_from_counters(release),
+        "stakeholders": [
+            {
+                "id": s.id,
+                "release_id": s.release_id,
+                "user_id": s.user_id,
+                "assigned_at": s.assigned_at,
+                "user": {"id": s.user_id, "name": s.name, "email": s.email, "role": s.role},
+            }
+            for s in stakeholders
+        ],
+    }
+
+
+async def freeze_release(db: AsyncSession, release_id: int) -> None:
+    """Store the detail and sign-off matrix snapshots of a release that just reached a final status."""
+    revision = await db.scalar(select(Release.revision).where(Release.id == release_id))
+    detail = await build_release_detail(db, release_id)
+    matrix = await build_sign_off_matrix(db, release_id)
+    await store_snapshots(db, release_id, revision, {
+        snapshots.RELEASE: fastjson.dumps(detail),
+        snapshots.MATRIX: fastjson.dumps(matrix),
+    })
 
 
 @router.get("/releases/{release_id}", response_model=ReleaseDetailResponse)
 async def get_release(
     release_id: int,
+    request: Request,
+    response: Response,
     current_user: RequireAnyRole,
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Release)
-        .where(Release.id == release_id, Release.is_deleted == False)
-        .options(
-            selectinload(Release.criteria).selectinload(ReleaseCriteria.sign_offs),
-            selectinload(Release.stakeholders).selectinload(ReleaseStakeholder.user)
+    """
+    Release with criteria, progress and stakeholders.
+
+    Sends an ETag; a matching If-None-Match gets 304 after a single lookup of
+    the release's change counter, without loading the object graph. Finished
+    releases are served from their stored snapshot by that same lookup.
+    Bodies are encoded directly from plain dicts; response_model only
+    documents the shape.
+    """
+    row = (await db.execute(
+        snapshot_query(release_id, snapshots.RELEASE).where(Release.is_deleted == False)
+    )).one_or_none()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Release not found",
         )
-    )
-    release = result.scalar_one_or_none()
-    if not release:
+    etag = make_etag("release", release_id, row.revision)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    if row.body is not None:
+        return json_response(row.body, etag)
+
+    detail = await build_release_detail(db, release_id)
+    if not detail:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Release not found",
         )
-
-    # Sort criteria in canonical order
-    sorted_criteria = sort_criteria(release.criteria)
-
-    return ReleaseDetailResponse(
-        **{c.name: getattr(release, c.name) for c in Release.__table__.columns},
-        criteria=sorted_criteria,
-        progress=calculate_progress(sorted_criteria),
-        stakeholders=release.stakeholders,
-    )
+    body = fastjson.dumps(detail)
+    if row.status in FROZEN_STATUSES:
+        await fill_snapshot(db, release_id, snapshots.RELEASE, row.revision, body)
+    return json_response(body, etag)
 
 
 @router.put("/releases/{release_id}", response_model=ReleaseResponse)
@@ -316,6 +449,7 @@ async def update_release(
 
     # Capture old values for audit logging
     old_values = release_to_dict(release)
+    old_status = release.status
 
     update_data = release_update.model_dump(exclude_unset=True)
 
@@ -330,6 +464,10 @@ async def update_release(
 
     for field, value in update_data.items():
         setattr(release, field, value)
+    await adjust_release_counts(db, release.product_id, old_status, release.status)
+    await bump_release(db, release.id)
+    if release.status != old_status and release.status in FROZEN_STATUSES:
+        await freeze_release(db, release.id)
 
     # Audit log: release updated (including status changes)
     audit_service = AuditService(db)
@@ -390,6 +528,7 @@ async def delete_release(
 
     # Soft delete
     release.is_deleted = True
+    await adjust_release_counts(db, release.product_id, release.status, None)
     await db.commit()
 
 
@@ -411,6 +550,8 @@ async def add_release_criteria(
     db_criteria = ReleaseCriteria(**criteria.model_dump(), release_id=release_id)
     db.add(db_criteria)
     await db.flush()
+    await adjust_progress(db, release_id, None, (db_criteria.is_mandatory, db_criteria.status))
+    await bump_release(db, release_id)
 
     # Audit log: criteria added
     audit_service = AuditService(db)
@@ -423,6 +564,9 @@ async def add_release_criteria(
 
     await db.commit()
 
+    # Live update: the matrix gains a row
+    await events.event_bus.publish(release_id, [events.criteria_added(db_criteria, db_criteria.status)])
+
     # Reload with sign_offs
     result = await db.execute(
         select(ReleaseCriteria)
@@ -463,10 +607,13 @@ async def update_release_criteria(
 
     # Capture old values for audit logging
     old_values = criteria_to_dict(criteria)
+    old_state = (criteria.is_mandatory, criteria.status)
 
     update_data = criteria_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(criteria, field, value)
+    await adjust_progress(db, release_id, old_state, (criteria.is_mandatory, criteria.status))
+    await bump_release(db, release_id)
 
     # Audit log: criteria updated
     audit_service = AuditService(db)
@@ -479,6 +626,13 @@ async def update_release_criteria(
     )
 
     await db.commit()
+
+    # Live update: e.g. a criteria manually marked BLOCKED
+    if criteria.status != old_state[1]:
+        await events.event_bus.publish(
+            release_id, [events.criteria_status_changed(criteria.id, criteria.status)]
+        )
+
     await db.refresh(criteria)
     return criteria
 
@@ -518,5 +672,35 @@ async def delete_release_criteria(
         actor_id=current_user.id,
     )
 
+    await adjust_progress(db, release_id, (criteria.is_mandatory, criteria.status), None)
+    await bump_release(db, release_id)
     await db.delete(criteria)
     await db.commit()
+
+
+@router.post("/releases/rebuild-criteria-statuses", response_model=CriteriaStatusRebuildResponse)
+async def rebuild_release_criteria_statuses(
+    current_user: RequireAdmin,
+    batch_size: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Recompute every release's stored criteria statuses and progress from its
+    stakeholders and active sign-offs (admin only).
+
+    Consistency repair: releases are processed and committed batch_size at a
+    time, one aggregate query and at most one bulk update per batch.
+    """
+    checked, changed_by_release = await rebuild_criteria_statuses(db, batch_size)
+
+    # Live update: push the corrected statuses to anyone watching
+    for release_id, changed in changed_by_release.items():
+        await events.event_bus.publish(release_id, [
+            events.criteria_status_changed(criteria_id, new_status) for criteria_id, new_status in changed.items()
+        ])
+
+    return CriteriaStatusRebuildResponse(
+        releases_checked=checked,
+        releases_changed=len(changed_by_release),
+        criteria_updated=sum(len(changed) for changed in changed_by_release.values()),
+    )
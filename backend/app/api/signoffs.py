@@ -1,20 +1,44 @@
-from typing import List
+from collections import defaultdict
+from typing import Dict, List, Set
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import and_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from app.database import get_db, is_sqlite
 from app.models.release import Release, ReleaseCriteria, CriteriaStatus, ReleaseStatus
 from app.models.signoff import SignOff, SignOffStatus
 from app.models.release_stakeholder import ReleaseStakeholder
-from app.schemas.signoff import SignOffCreate, SignOffResponse
+from app.schemas.signoff import (
+    SignOffCreate,
+    SignOffResponse,
+    SignOffBatchCreate,
+    SignOffBatchItemResult,
+    SignOffBatchResponse,
+)
 from app.dependencies import RequireAdminOrProductOwner, RequireAnyRole
-from app.utils.signoff_logic import compute_criteria_status
+from app.utils.signoff_logic import compute_criteria_statuses
 from app.services.audit import AuditService
+from app.services.criteria_status import computed_criteria_status
+from app.services.progress import adjust_progress, adjust_progress_many
+from app.services.versions import bump_release
+from app.services import events
 
 router = APIRouter()
 
+# Attempts at a sign-off write that keeps losing races to the same user's
+# concurrent submissions (see with_conflict_retries)
+SIGN_OFF_ATTEMPTS = 3
+
+# Criteria whose approval must link to test results
+CRITERIA_REQUIRING_LINK = (
+    "Smoke & Extended Smoke Regression",
+    "Full Regression",
+    "CPT Sign-off",
+)
+
 
 def signoff_to_dict(signoff: SignOff, criteria_name: str = None, release_id: int = None) -> dict:
     """Convert sign-off to dict for audit logging."""
@@ -30,6 +54,44 @@ def signoff_to_dict(signoff: SignOff, criteria_name: str = None, release_id: int
     }
 
 
+class SignOffConflict(Exception):
+    """A concurrent submission by the same user got its active sign-off in first."""
+
+
+def insert_sign_offs():
+    """
+    INSERT INTO sign_offs that skips rows conflicting with the active-sign-off
+    unique index instead of failing, returning only the rows it wrote.
+    """
+    dialect_insert = sqlite.insert if is_sqlite else postgresql.insert
+    return (
+        dialect_insert(SignOff)
+        .on_conflict_do_nothing(
+            index_elements=[SignOff.criteria_id, SignOff.signed_by_id],
+            # Same predicate text as the partial index, so the database matches it
+            index_where=text("status != 'REVOKED'"),
+        )
+        .returning(SignOff)
+    )
+
+
+async def with_conflict_retries(db: AsyncSession, write, *args):
+    """
+    Run a sign-off write, starting over if it loses a race on the
+    active-sign-off unique index to a concurrent submission by the same user.
+    The write's INSERT ... ON CONFLICT DO NOTHING reports the race as a
+    SignOffConflict; an IntegrityError from the index is handled the same way.
+    The retry reads that sign-off and revokes it like any other.
+    """
+    for attempt in range(SIGN_OFF_ATTEMPTS):
+        try:
+            return await write(db, *args)
+        except (SignOffConflict, IntegrityError):
+            await db.rollback()
+            if attempt == SIGN_OFF_ATTEMPTS - 1:
+                raise
+
+
 @router.post(
     "/criteria/{criteria_id}/sign-off",
     response_model=SignOffResponse,
@@ -41,11 +103,27 @@ async def create_sign_off(
     current_user: RequireAnyRole,  # Changed from RequireAdminOrProductOwner - stakeholders need to sign off
     db: AsyncSession = Depends(get_db),
 ):
-    # Verify criteria exists
+    return await with_conflict_retries(db, _create_sign_off, criteria_id, sign_off, current_user.id)
+
+
+async def _create_sign_off(db: AsyncSession, criteria_id: int, sign_off: SignOffCreate, user_id: int) -> SignOff:
+    # Criteria, release status and stakeholder membership in one query
     result = await db.execute(
-        select(ReleaseCriteria).where(ReleaseCriteria.id == criteria_id)
+        select(
+            ReleaseCriteria.name,
+            ReleaseCriteria.release_id,
+            ReleaseCriteria.is_mandatory,
+            Release.status.label("release_status"),
+            ReleaseStakeholder.user_id.is_not(None).label("is_stakeholder"),
+        )
+        .join(Release, Release.id == ReleaseCriteria.release_id)
+        .outerjoin(
+            ReleaseStakeholder,
+            and_(ReleaseStakeholder.release_id == ReleaseCriteria.release_id, ReleaseStakeholder.user_id == user_id),
+        )
+        .where(ReleaseCriteria.id == criteria_id)
     )
-    criteria = result.scalar_one_or_none()
+    criteria = result.first()
     if not criteria:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -53,125 +131,352 @@ async def create_sign_off(
         )
 
     # Check if release is cancelled
-    release_result = await db.execute(
-        select(Release).where(Release.id == criteria.release_id)
-    )
-    release = release_result.scalar_one_or_none()
-    if release and release.status == ReleaseStatus.CANCELLED:
+    if criteria.release_status == ReleaseStatus.CANCELLED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot sign off on a cancelled release",
         )
 
     # Verify user is assigned as stakeholder to this release
-    stakeholder_check = await db.execute(
-        select(ReleaseStakeholder).where(
-            ReleaseStakeholder.release_id == criteria.release_id,
-            ReleaseStakeholder.user_id == current_user.id,
-        )
-    )
-    if not stakeholder_check.scalar_one_or_none():
+    if not criteria.is_stakeholder:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not assigned as a stakeholder for this release",
         )
 
     # Validate link requirement for specific criteria
-    criteria_requiring_link = [
-        "Smoke & Extended Smoke Regression",
-        "Full Regression",
-        "CPT Sign-off",
-    ]
-    if criteria.name in criteria_requiring_link and sign_off.status == SignOffStatus.APPROVED:
+    if criteria.name in CRITERIA_REQUIRING_LINK and sign_off.status == SignOffStatus.APPROVED:
         if not sign_off.link or not sign_off.link.strip():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"A test results link is required for '{criteria.name}'",
             )
 
-    # Initialize audit service
-    audit_service = AuditService(db)
+    # Bumping the revision first takes the write lock (SQLite) or the release's
+    # row lock (PostgreSQL), so concurrent sign-offs on the release queue here
+    # and everything read below stays current until commit
+    await bump_release(db, criteria.release_id)
 
-    # Revoke any existing non-revoked sign-off by this user for this criteria
-    existing_result = await db.execute(
-        select(SignOff).where(
-            SignOff.criteria_id == criteria_id,
-            SignOff.signed_by_id == current_user.id,
-            SignOff.status != SignOffStatus.REVOKED,
+    # Stored criteria status and the user's active sign-off, if any
+    result = await db.execute(
+        select(ReleaseCriteria.status, SignOff)
+        .outerjoin(
+            SignOff,
+            and_(
+                SignOff.criteria_id == ReleaseCriteria.id,
+                SignOff.signed_by_id == user_id,
+                SignOff.status != SignOffStatus.REVOKED,
+            ),
         )
+        .where(ReleaseCriteria.id == criteria_id)
     )
-    existing_signoff = existing_result.scalar_one_or_none()
+    old_status, existing_signoff = result.one()
+
+    audit_entries = []
+
+    # Revoke any existing non-revoked sign-off by this user for this criteria
     if existing_signoff:
         old_signoff_data = signoff_to_dict(existing_signoff, criteria.name, criteria.release_id)
         existing_signoff.status = SignOffStatus.REVOKED
         # Audit log: auto-revoke previous sign-off
-        await audit_service.log(
-            entity_type="sign_off",
-            entity_id=existing_signoff.id,
-            action="auto_revoke",
-            actor_id=current_user.id,
-            old_value=old_signoff_data,
-            new_value={**old_signoff_data, "status": "revoked"},
-        )
-
-    # Create new sign-off
-    db_signoff = SignOff(
-        criteria_id=criteria_id,
-        signed_by_id=current_user.id,
-        status=sign_off.status,
-        comment=sign_off.comment,
-        link=sign_off.link,
+        audit_entries.append({
+            "entity_type": "sign_off",
+            "entity_id": existing_signoff.id,
+            "action": "auto_revoke",
+            "actor_id": user_id,
+            "old_value": old_signoff_data,
+            "new_value": {**old_signoff_data, "status": "revoked"},
+        })
+
+    # Create new sign-off (flushing the revoke first)
+    db_signoff = await db.scalar(
+        insert_sign_offs(),
+        [{
+            "criteria_id": criteria_id,
+            "signed_by_id": user_id,
+            "status": sign_off.status,
+            "comment": sign_off.comment,
+            "link": sign_off.link,
+        }],
     )
-    db.add(db_signoff)
-    await db.flush()  # Flush to get the signoff ID
+    if db_signoff is None:
+        raise SignOffConflict()
 
     # Audit log: sign-off created
-    await audit_service.log(
-        entity_type="sign_off",
-        entity_id=db_signoff.id,
-        action=f"sign_off:{sign_off.status.value}",
-        actor_id=current_user.id,
-        new_value=signoff_to_dict(db_signoff, criteria.name, criteria.release_id),
-    )
+    audit_entries.append({
+        "entity_type": "sign_off",
+        "entity_id": db_signoff.id,
+        "action": f"sign_off:{sign_off.status.value}",
+        "actor_id": user_id,
+        "new_value": signoff_to_dict(db_signoff, criteria.name, criteria.release_id),
+    })
+    await AuditService(db).log_many(audit_entries)
 
     # Compute new criteria status based on all stakeholder sign-offs
-    new_status = await compute_criteria_status(db, criteria_id)
-    criteria.status = new_status
+    new_status = await computed_criteria_status(db, criteria_id)
+    if new_status != old_status:
+        await db.execute(
+            update(ReleaseCriteria)
+            .where(ReleaseCriteria.id == criteria_id)
+            .values(status=new_status)
+            .execution_options(synchronize_session=False)
+        )
+    await adjust_progress(
+        db, criteria.release_id, (criteria.is_mandatory, old_status), (criteria.is_mandatory, new_status)
+    )
 
     await db.commit()
-    await db.refresh(db_signoff)
+
+    # Live update: push the deltas to anyone watching the release
+    release_events = []
+    if existing_signoff:
+        release_events.append(events.sign_off_revoked(existing_signoff))
+    release_events.append(events.sign_off_created(db_signoff))
+    if new_status != old_status:
+        release_events.append(events.criteria_status_changed(criteria_id, new_status))
+    await events.event_bus.publish(criteria.release_id, release_events)
+
     return db_signoff
 
 
+@router.post("/sign-offs/batch", response_model=SignOffBatchResponse)
+async def create_sign_offs_batch(
+    batch: SignOffBatchCreate,
+    current_user: RequireAnyRole,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Sign off many criteria, possibly across releases, as the current user.
+
+    Each item is checked and applied like POST /criteria/{criteria_id}/sign-off
+    and gets its own result; items that fail validation are skipped and the
+    rest are committed together. Runs a fixed number of set-based queries
+    however many items or releases are involved.
+    """
+    return await with_conflict_retries(db, _create_sign_offs_batch, batch, current_user.id)
+
+
+async def _create_sign_offs_batch(db: AsyncSession, batch: SignOffBatchCreate, user_id: int) -> SignOffBatchResponse:
+    criteria_ids = list(dict.fromkeys(item.criteria_id for item in batch.items))
+
+    # Criteria, their release's status and whether the user is a stakeholder
+    result = await db.execute(
+        select(
+            ReleaseCriteria.id,
+            ReleaseCriteria.name,
+            ReleaseCriteria.release_id,
+            ReleaseCriteria.is_mandatory,
+            Release.status.label("release_status"),
+            ReleaseStakeholder.user_id.is_not(None).label("is_stakeholder"),
+        )
+        .join(Release, Release.id == ReleaseCriteria.release_id)
+        .outerjoin(
+            ReleaseStakeholder,
+            and_(
+                ReleaseStakeholder.release_id == ReleaseCriteria.release_id,
+                ReleaseStakeholder.user_id == user_id,
+            ),
+        )
+        .where(ReleaseCriteria.id.in_(criteria_ids))
+    )
+    criteria_by_id = {row.id: row for row in result.all()}
+
+    results: List[SignOffBatchItemResult] = []
+    accepted = {}  # criteria_id -> index into results
+    items = {}  # criteria_id -> accepted item
+    for item in batch.items:
+        criteria = criteria_by_id.get(item.criteria_id)
+        error = None
+        if item.criteria_id in accepted:
+            error = (status.HTTP_400_BAD_REQUEST, "Criteria appears more than once in the batch")
+        elif criteria is None:
+            error = (status.HTTP_404_NOT_FOUND, "Criteria not found")
+        elif criteria.release_status == ReleaseStatus.CANCELLED:
+            error = (status.HTTP_400_BAD_REQUEST, "Cannot sign off on a cancelled release")
+        elif not criteria.is_stakeholder:
+            error = (status.HTTP_403_FORBIDDEN, "You are not assigned as a stakeholder for this release")
+        elif (
+            criteria.name in CRITERIA_REQUIRING_LINK
+            and item.status == SignOffStatus.APPROVED
+            and (not item.link or not item.link.strip())
+        ):
+            error = (status.HTTP_400_BAD_REQUEST, f"A test results link is required for '{criteria.name}'")
+        if error:
+            results.append(SignOffBatchItemResult(criteria_id=item.criteria_id, status_code=error[0], detail=error[1]))
+        else:
+            accepted[item.criteria_id] = len(results)
+            items[item.criteria_id] = item
+            results.append(SignOffBatchItemResult(criteria_id=item.criteria_id, status_code=status.HTTP_201_CREATED))
+    if not accepted:
+        return SignOffBatchResponse(results=results)
+
+    accepted_ids = list(accepted)
+    release_ids = list(dict.fromkeys(criteria_by_id[c].release_id for c in accepted_ids))
+
+    # Lock the releases first, as _create_sign_off does, then read the stored
+    # statuses and the user's active sign-offs on those criteria
+    await bump_release(db, *release_ids)
+    existing_result = await db.execute(
+        select(
+            ReleaseCriteria.id.label("stored_criteria_id"),
+            ReleaseCriteria.status.label("stored_status"),
+            SignOff.id,
+            SignOff.criteria_id,
+            SignOff.signed_by_id,
+            SignOff.status,
+            SignOff.comment,
+            SignOff.link,
+        )
+        .outerjoin(
+            SignOff,
+            and_(
+                SignOff.criteria_id == ReleaseCriteria.id,
+                SignOff.signed_by_id == user_id,
+                SignOff.status != SignOffStatus.REVOKED,
+            ),
+        )
+        .where(ReleaseCriteria.id.in_(accepted_ids))
+    )
+    existing_rows = existing_result.all()
+    stored_statuses = {row.stored_criteria_id: row.stored_status for row in existing_rows}
+
+    # Revoke them
+    revoked = [row for row in existing_rows if row.id is not None]
+    if revoked:
+        await db.execute(
+            update(SignOff)
+            .where(SignOff.id.in_([s.id for s in revoked]))
+            .values(status=SignOffStatus.REVOKED)
+            .execution_options(synchronize_session=False)
+        )
+
+    now = datetime.utcnow()
+    created = (await db.scalars(
+        # Rows come back in any order; each criteria appears once
+        insert_sign_offs(),
+        [
+            {
+                "criteria_id": criteria_id,
+                "signed_by_id": user_id,
+                "status": items[criteria_id].status,
+                "comment": items[criteria_id].comment,
+                "link": items[criteria_id].link,
+                "signed_at": now,
+            }
+            for criteria_id in accepted_ids
+        ],
+    )).all()
+    if len(created) < len(accepted_ids):
+        raise SignOffConflict()
+
+    audit_entries = []
+    for existing in revoked:
+        criteria = criteria_by_id[existing.criteria_id]
+        old_signoff_data = signoff_to_dict(existing, criteria.name, criteria.release_id)
+        audit_entries.append({
+            "entity_type": "sign_off",
+            "entity_id": existing.id,
+            "action": "auto_revoke",
+            "actor_id": user_id,
+            "old_value": old_signoff_data,
+            "new_value": {**old_signoff_data, "status": "revoked"},
+        })
+    for signoff in created:
+        criteria = criteria_by_id[signoff.criteria_id]
+        audit_entries.append({
+            "entity_type": "sign_off",
+            "entity_id": signoff.id,
+            "action": f"sign_off:{signoff.status.value}",
+            "actor_id": user_id,
+            "new_value": signoff_to_dict(signoff, criteria.name, criteria.release_id),
+        })
+    await AuditService(db).log_many(audit_entries)
+
+    # Recompute the touched criteria from their releases' stakeholders and active sign-offs
+    stakeholders_result = await db.execute(
+        select(ReleaseStakeholder.release_id, ReleaseStakeholder.user_id)
+        .where(ReleaseStakeholder.release_id.in_(release_ids))
+    )
+    stakeholder_ids_by_release: Dict[int, Set[int]] = defaultdict(set)
+    for stakeholder_release_id, stakeholder_user_id in stakeholders_result.all():
+        stakeholder_ids_by_release[stakeholder_release_id].add(stakeholder_user_id)
+    signoffs_result = await db.execute(
+        select(SignOff.criteria_id, SignOff.signed_by_id, SignOff.status)
+        .where(SignOff.criteria_id.in_(accepted_ids), SignOff.status != SignOffStatus.REVOKED)
+        .order_by(SignOff.id)
+    )
+    computed_statuses = compute_criteria_statuses(
+        [criteria_by_id[c] for c in accepted_ids], stakeholder_ids_by_release, signoffs_result.all()
+    )
+    changed = {c: s for c, s in computed_statuses.items() if s != stored_statuses[c]}
+    if changed:
+        await db.execute(
+            update(ReleaseCriteria),
+            [{"id": criteria_id, "status": new_status} for criteria_id, new_status in changed.items()],
+        )
+        await adjust_progress_many(db, [
+            (
+                criteria_by_id[criteria_id].release_id,
+                (criteria_by_id[criteria_id].is_mandatory, stored_statuses[criteria_id]),
+                (criteria_by_id[criteria_id].is_mandatory, new_status),
+            )
+            for criteria_id, new_status in changed.items()
+        ])
+
+    await db.commit()
+
+    # Live update: push each release its deltas
+    release_events = defaultdict(list)
+    for existing in revoked:
+        release_events[criteria_by_id[existing.criteria_id].release_id].append(events.sign_off_revoked(existing))
+    for signoff in created:
+        release_id = criteria_by_id[signoff.criteria_id].release_id
+        release_events[release_id].append(events.sign_off_created(signoff))
+        if signoff.criteria_id in changed:
+            release_events[release_id].append(events.criteria_status_changed(signoff.criteria_id, changed[signoff.criteria_id]))
+        results[accepted[signoff.criteria_id]].sign_off = SignOffResponse.model_validate(signoff)
+    for release_id, deltas in release_events.items():
+        await events.event_bus.publish(release_id, deltas)
+
+    return SignOffBatchResponse(results=results)
+
+
 @router.delete("/criteria/{criteria_id}/sign-off", status_code=status.HTTP_204_NO_CONTENT)
 async def revoke_sign_off(
     criteria_id: int,
     current_user: RequireAnyRole,  # Changed - stakeholders can revoke their own sign-offs
     db: AsyncSession = Depends(get_db),
 ):
-    # Get criteria for audit logging
-    criteria_result = await db.execute(
-        select(ReleaseCriteria).where(ReleaseCriteria.id == criteria_id)
+    # Criteria fields for audit logging and the release to lock
+    result = await db.execute(
+        select(ReleaseCriteria.name, ReleaseCriteria.release_id, ReleaseCriteria.is_mandatory)
+        .where(ReleaseCriteria.id == criteria_id)
     )
-    criteria = criteria_result.scalar_one_or_none()
+    criteria = result.first()
     if not criteria:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Criteria not found",
         )
 
-    # Find the most recent non-revoked sign-off by this user
+    # Take the release lock before reading anything the revoke changes, as
+    # sign-offs do, so a concurrent sign-off cannot slip in between
+    await bump_release(db, criteria.release_id)
+
+    # Stored criteria status and the user's active sign-off, if any
     result = await db.execute(
-        select(SignOff)
-        .where(
-            SignOff.criteria_id == criteria_id,
-            SignOff.signed_by_id == current_user.id,
-            SignOff.status != SignOffStatus.REVOKED,
+        select(ReleaseCriteria.status, SignOff)
+        .outerjoin(
+            SignOff,
+            and_(
+                SignOff.criteria_id == ReleaseCriteria.id,
+                SignOff.signed_by_id == current_user.id,
+                SignOff.status != SignOffStatus.REVOKED,
+            ),
         )
-        .order_by(SignOff.signed_at.desc())
-        .limit(1)
+        .where(ReleaseCriteria.id == criteria_id)
     )
-    sign_off = result.scalar_one_or_none()
+    old_status, sign_off = result.one()
     if not sign_off:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -196,11 +501,26 @@ async def revoke_sign_off(
     )
 
     # Recompute criteria status based on remaining sign-offs
-    new_status = await compute_criteria_status(db, criteria_id)
-    criteria.status = new_status
+    new_status = await computed_criteria_status(db, criteria_id)
+    if new_status != old_status:
+        await db.execute(
+            update(ReleaseCriteria)
+            .where(ReleaseCriteria.id == criteria_id)
+            .values(status=new_status)
+            .execution_options(synchronize_session=False)
+        )
+    await adjust_progress(
+        db, criteria.release_id, (criteria.is_mandatory, old_status), (criteria.is_mandatory, new_status)
+    )
 
     await db.commit()
 
+    # Live update: push the deltas to anyone watching the release
+    release_events = [events.sign_off_revoked(sign_off)]
+    if new_status != old_status:
+        release_events.append(events.criteria_status_changed(criteria_id, new_status))
+    await events.event_bus.publish(criteria.release_id, release_events)
+
 
 @router.get(
     "/releases/{release_id}/sign-offs",
@@ -1,6 +1,6 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select, insert, delete
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
@@ -10,18 +10,22 @@ from app.models.signoff import SignOff, SignOffStatus
 from app.models.user import User
 from app.schemas.release_stakeholder import (
     ReleaseStakeholderCreate,
+    ReleaseStakeholderBulkRemove,
     ReleaseStakeholderResponse,
     ReleaseStakeholderWithUser,
-    StakeholderUser,
-)
-from app.schemas.release import (
-    ReleaseSignOffMatrixResponse,
-    CriteriaSignOffMatrix,
-    StakeholderSignOffStatus,
 )
+from app.schemas.release import ReleaseSignOffMatrixResponse
 from app.dependencies import RequireAdminOrProductOwner, RequireAnyRole
-from app.utils.signoff_logic import compute_criteria_status
+from app.utils.signoff_logic import compute_criteria_statuses
 from app.services.audit import AuditService
+from app.services.criteria_status import recompute_criteria_statuses
+from app.services.versions import bump_release
+from app.utils.etag import make_etag, not_modified
+from app.services import snapshots
+from app.services.snapshots import FROZEN_STATUSES, fill_snapshot, snapshot_query
+from app.utils import fastjson
+from app.utils.fastjson import json_response
+from app.services import events
 
 router = APIRouter()
 
@@ -36,38 +40,6 @@ def stakeholder_to_dict(stakeholder: ReleaseStakeholder, user: User = None) -> d
         "user_email": user.email if user else None,
     }
 
-# Canonical order for predefined criteria (must match releases.py)
-PREDEFINED_CRITERIA_ORDER = [
-    "Content Review",
-    "Bug Verification",
-    "Smoke & Extended Smoke Regression",
-    "Full Regression",
-    "CPT Sign-off",
-    "Pre-Prod Monitoring incl. Crash Analysis",
-    "Production Monitoring",
-    "Security Audit",
-]
-
-
-def get_criteria_sort_key(criteria: ReleaseCriteria) -> tuple:
-    """
-    Returns a sort key for criteria to ensure consistent ordering.
-    Predefined criteria come first in canonical order, custom criteria come last.
-    """
-    try:
-        # If it's a predefined criteria, use its index in the canonical order
-        index = PREDEFINED_CRITERIA_ORDER.index(criteria.name)
-        return (0, index)  # (0 = predefined, index in canonical order)
-    except ValueError:
-        # Custom criteria come after predefined, sorted by name
-        return (1, criteria.name.lower())  # (1 = custom, alphabetical)
-
-
-def sort_criteria(criteria: List[ReleaseCriteria]) -> List[ReleaseCriteria]:
-    """Sort criteria according to canonical order."""
-    return sorted(criteria, key=get_criteria_sort_key)
-
-
 @router.post(
     "/releases/{release_id}/stakeholders",
     response_model=List[ReleaseStakeholderResponse],
@@ -79,7 +51,12 @@ async def assign_stakeholders(
     current_user: RequireAdminOrProductOwner,
     db: AsyncSession = Depends(get_db),
 ):
-    """Assign multiple stakeholders to a release"""
+    """
+    Assign multiple stakeholders to a release.
+
+    Set-based: one query for existing assignments, one multi-row insert and one
+    batched audit insert, however many users are assigned.
+    """
     # Verify release exists
     result = await db.execute(select(Release).where(Release.id == release_id))
     release = result.scalar_one_or_none()
@@ -89,12 +66,15 @@ async def assign_stakeholders(
             detail="Release not found",
         )
 
+    # De-duplicate while keeping the caller's order
+    user_ids = list(dict.fromkeys(stakeholder_data.user_ids))
+
     # Verify all users exist and are stakeholders
     user_result = await db.execute(
-        select(User).where(User.id.in_(stakeholder_data.user_ids))
+        select(User).where(User.id.in_(user_ids))
     )
     users = user_result.scalars().all()
-    if len(users) != len(stakeholder_data.user_ids):
+    if len(users) != len(user_ids):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="One or more user IDs are invalid",
@@ -103,43 +83,128 @@ async def assign_stakeholders(
     # Create a mapping of user_id to user for audit logging
     user_map = {user.id: user for user in users}
 
-    # Initialize audit service
+    # Skip users that are already assigned
+    existing_result = await db.execute(
+        select(ReleaseStakeholder.user_id).where(
+            ReleaseStakeholder.release_id == release_id,
+            ReleaseStakeholder.user_id.in_(user_ids),
+        )
+    )
+    existing_user_ids = set(existing_result.scalars().all())
+    new_user_ids = [user_id for user_id in user_ids if user_id not in existing_user_ids]
+    if not new_user_ids:
+        return []
+
+    # Multi-row insert, returning the created rows
+    insert_result = await db.scalars(
+        insert(ReleaseStakeholder).returning(ReleaseStakeholder),
+        [{"release_id": release_id, "user_id": user_id} for user_id in new_user_ids],
+    )
+    created_stakeholders = insert_result.all()
+
+    # Audit log: stakeholders assigned
     audit_service = AuditService(db)
+    await audit_service.log_many([
+        {
+            "entity_type": "release_stakeholder",
+            "entity_id": stakeholder.id,
+            "action": "assign",
+            "actor_id": current_user.id,
+            "new_value": stakeholder_to_dict(stakeholder, user_map.get(stakeholder.user_id)),
+        }
+        for stakeholder in created_stakeholders
+    ])
+
+    # New stakeholders change who must sign off: refresh statuses and progress
+    # (bumping the revision first takes the release lock, as sign-offs do)
+    await bump_release(db, release_id)
+    changed_statuses = await recompute_criteria_statuses(db, [release_id])
+
+    await db.commit()
+
+    # Live update: push the deltas to anyone watching the release
+    await events.event_bus.publish(release_id, [
+        *(events.stakeholder_added(user_map[s.user_id]) for s in created_stakeholders),
+        *(events.criteria_status_changed(cid, st) for cid, st in changed_statuses.items()),
+    ])
+
+    return created_stakeholders
+
+
+@router.post(
+    "/releases/{release_id}/stakeholders/bulk-remove",
+    response_model=List[ReleaseStakeholderResponse],
+)
+async def bulk_remove_stakeholders(
+    release_id: int,
+    stakeholder_data: ReleaseStakeholderBulkRemove,
+    current_user: RequireAdminOrProductOwner,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Remove multiple stakeholders from a release in one transaction.
 
-    # Create stakeholder assignments (skip duplicates)
-    created_stakeholders = []
-    for user_id in stakeholder_data.user_ids:
-        # Check if already assigned
-        existing = await db.execute(
-            select(ReleaseStakeholder).where(
-                ReleaseStakeholder.release_id == release_id,
-                ReleaseStakeholder.user_id == user_id,
-            )
+    Users that are not assigned are ignored. Returns the removed assignments.
+    """
+    # Verify release exists
+    result = await db.execute(select(Release).where(Release.id == release_id))
+    release = result.scalar_one_or_none()
+    if not release:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Release not found",
         )
-        if existing.scalar_one_or_none():
-            continue  # Skip if already assigned
-
-        stakeholder = ReleaseStakeholder(release_id=release_id, user_id=user_id)
-        db.add(stakeholder)
-        await db.flush()  # Flush to get the stakeholder ID
-
-        # Audit log: stakeholder assigned
-        user = user_map.get(user_id)
-        await audit_service.log(
-            entity_type="release_stakeholder",
-            entity_id=stakeholder.id,
-            action="assign",
-            actor_id=current_user.id,
-            new_value=stakeholder_to_dict(stakeholder, user),
+
+    result = await db.execute(
+        select(ReleaseStakeholder, User)
+        .join(User, ReleaseStakeholder.user_id == User.id)
+        .where(
+            ReleaseStakeholder.release_id == release_id,
+            ReleaseStakeholder.user_id.in_(stakeholder_data.user_ids),
         )
+    )
+    rows = result.all()
+    if not rows:
+        return []
 
-        created_stakeholders.append(stakeholder)
+    removed = [
+        ReleaseStakeholderResponse.model_validate(stakeholder)
+        for stakeholder, _ in rows
+    ]
+
+    # Audit log: stakeholders removed
+    audit_service = AuditService(db)
+    await audit_service.log_many([
+        {
+            "entity_type": "release_stakeholder",
+            "entity_id": stakeholder.id,
+            "action": "remove",
+            "actor_id": current_user.id,
+            "old_value": stakeholder_to_dict(stakeholder, user),
+        }
+        for stakeholder, user in rows
+    ])
+
+    await db.execute(
+        delete(ReleaseStakeholder)
+        .where(ReleaseStakeholder.id.in_([stakeholder.id for stakeholder, _ in rows]))
+        .execution_options(synchronize_session=False)
+    )
+
+    # The removed stakeholders no longer count: refresh statuses and progress
+    # (bumping the revision first takes the release lock, as sign-offs do)
+    await bump_release(db, release_id)
+    changed_statuses = await recompute_criteria_statuses(db, [release_id])
 
     await db.commit()
-    for stakeholder in created_stakeholders:
-        await db.refresh(stakeholder)
 
-    return created_stakeholders
+    # Live update: push the deltas to anyone watching the release
+    await events.event_bus.publish(release_id, [
+        *(events.stakeholder_removed(s.user_id) for s, _ in rows),
+        *(events.criteria_status_changed(cid, st) for cid, st in changed_statuses.items()),
+    ])
+
+    return removed
 
 
 @router.get(
@@ -199,120 +264,138 @@ async def remove_stakeholder(
     )
 
     await db.delete(stakeholder)
+    await db.flush()
+
+    # The removed stakeholder no longer counts: refresh statuses and progress
+    # (bumping the revision first takes the release lock, as sign-offs do)
+    await bump_release(db, release_id)
+    changed_statuses = await recompute_criteria_statuses(db, [release_id])
+
     await db.commit()
 
+    # Live update: push the deltas to anyone watching the release
+    await events.event_bus.publish(release_id, [
+        events.stakeholder_removed(user_id),
+        *(events.criteria_status_changed(cid, st) for cid, st in changed_statuses.items()),
+    ])
 
-@router.get(
-    "/releases/{release_id}/sign-off-matrix",
-    response_model=ReleaseSignOffMatrixResponse,
-)
-async def get_sign_off_matrix(
-    release_id: int,
-    current_user: RequireAnyRole,
-    db: AsyncSession = Depends(get_db),
-):
-    """Get complete sign-off matrix for a release (criteria × stakeholders)"""
-    # Verify release exists
-    release_result = await db.execute(select(Release).where(Release.id == release_id))
-    release = release_result.scalar_one_or_none()
-    if not release:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Release not found",
-        )
 
-    # Get all stakeholders
-    stakeholders_result = await db.execute(
-        select(ReleaseStakeholder)
-        .options(selectinload(ReleaseStakeholder.user))
+async def build_sign_off_matrix(db: AsyncSession, release_id: int) -> dict:
+    """
+    Sign-off matrix of an existing release (ReleaseSignOffMatrixResponse shape)
+    as plain dicts.
+
+    Three Core queries - stakeholders, criteria, active sign-offs - select only
+    the columns the matrix shows; no ORM objects or pydantic models are built
+    per cell. Encode the result with app.utils.fastjson.
+    """
+    stakeholders = (await db.execute(
+        select(ReleaseStakeholder.user_id, User.name, User.email, User.role)
+        .join(User, ReleaseStakeholder.user_id == User.id)
         .where(ReleaseStakeholder.release_id == release_id)
         .order_by(ReleaseStakeholder.assigned_at)
-    )
-    stakeholders = stakeholders_result.scalars().all()
-    stakeholder_users = [
-        StakeholderUser(
-            id=s.user.id,
-            name=s.user.name,
-            email=s.user.email,
-            role=s.user.role.value,
-        )
-        for s in stakeholders
-    ]
-
-    # Get all criteria
-    criteria_result = await db.execute(
-        select(ReleaseCriteria)
+    )).all()
+    criteria_list = (await db.execute(
+        select(ReleaseCriteria.id, ReleaseCriteria.release_id, ReleaseCriteria.name, ReleaseCriteria.is_mandatory)
         .where(ReleaseCriteria.release_id == release_id)
-    )
-    criteria_list = criteria_result.scalars().all()
-
-    # Sort criteria in canonical order
-    criteria_list = sort_criteria(criteria_list)
-
-    # Get all sign-offs for this release
-    signoffs_result = await db.execute(
-        select(SignOff)
-        .join(ReleaseCriteria)
+        .order_by(ReleaseCriteria.sort_key, ReleaseCriteria.id)
+    )).all()
+
+    # Active sign-offs, oldest first so the latest per (criteria, user) wins below
+    all_signoffs = (await db.execute(
+        select(
+            SignOff.criteria_id, SignOff.signed_by_id, SignOff.status, SignOff.comment, SignOff.link,
+            SignOff.signed_at,
+        )
+        .join(ReleaseCriteria, SignOff.criteria_id == ReleaseCriteria.id)
         .where(
             ReleaseCriteria.release_id == release_id,
             SignOff.status != SignOffStatus.REVOKED,
         )
+        .order_by(SignOff.id)
+    )).all()
+
+    # Compute every criteria status from the data already loaded above
+    computed_statuses = compute_criteria_statuses(
+        criteria_list,
+        {release_id: {s.user_id for s in stakeholders}},
+        all_signoffs,
     )
-    all_signoffs = signoffs_result.scalars().all()
+
+    # Index sign-offs by (criteria, user) for constant-time lookups; plain
+    # tuples keep the per-cell work down on large matrices
+    signoff_map = {
+        (s.criteria_id, s.signed_by_id): (s.status, s.comment, s.link, s.signed_at) for s in all_signoffs
+    }
+    no_signoff = (None, None, None, None)
+    columns = [(s.user_id, s.name, s.email) for s in stakeholders]
 
     # Build matrix
     criteria_matrix = []
     for criteria in criteria_list:
-        # Compute status
-        computed_status = await compute_criteria_status(db, criteria.id)
+        stakeholder_signoffs = []
+        for user_id, user_name, user_email in columns:
+            signoff_status, comment, link, signed_at = signoff_map.get((criteria.id, user_id), no_signoff)
+            stakeholder_signoffs.append({
+                "user_id": user_id,
+                "user_name": user_name,
+                "user_email": user_email,
+                "status": signoff_status,
+                "comment": comment,
+                "link": link,
+                "signed_at": signed_at,
+            })
+        criteria_matrix.append({
+            "criteria_id": criteria.id,
+            "criteria_name": criteria.name,
+            "is_mandatory": criteria.is_mandatory,
+            "computed_status": computed_statuses[criteria.id],
+            "stakeholder_signoffs": stakeholder_signoffs,
+        })
 
-        # Get sign-offs for this criteria
-        criteria_signoffs = [s for s in all_signoffs if s.criteria_id == criteria.id]
+    return {
+        "release_id": release_id,
+        "stakeholders": [
+            {"id": s.user_id, "name": s.name, "email": s.email, "role": s.role} for s in stakeholders
+        ],
+        "criteria_matrix": criteria_matrix,
+    }
 
-        # Build stakeholder sign-off status list
-        stakeholder_signoffs = []
-        for stakeholder in stakeholders:
-            user_signoff = next(
-                (s for s in criteria_signoffs if s.signed_by_id == stakeholder.user_id),
-                None
-            )
-            if user_signoff:
-                stakeholder_signoffs.append(
-                    StakeholderSignOffStatus(
-                        user_id=stakeholder.user_id,
-                        user_name=stakeholder.user.name,
-                        user_email=stakeholder.user.email,
-                        status=user_signoff.status.value,
-                        comment=user_signoff.comment,
-                        link=user_signoff.link,
-                        signed_at=user_signoff.signed_at,
-                    )
-                )
-            else:
-                stakeholder_signoffs.append(
-                    StakeholderSignOffStatus(
-                        user_id=stakeholder.user_id,
-                        user_name=stakeholder.user.name,
-                        user_email=stakeholder.user.email,
-                        status=None,
-                        comment=None,
-                        link=None,
-                        signed_at=None,
-                    )
-                )
-
-        criteria_matrix.append(
-            CriteriaSignOffMatrix(
-                criteria_id=criteria.id,
-                criteria_name=criteria.name,
-                is_mandatory=criteria.is_mandatory,
-                computed_status=computed_status,
-                stakeholder_signoffs=stakeholder_signoffs,
-            )
-        )
 
-    return ReleaseSignOffMatrixResponse(
-        release_id=release_id,
-        stakeholders=stakeholder_users,
-        criteria_matrix=criteria_matrix,
-    )
+@router.get(
+    "/releases/{release_id}/sign-off-matrix",
+    response_model=ReleaseSignOffMatrixResponse,
+)
+async def get_sign_off_matrix(
+    release_id: int,
+    request: Request,
+    response: Response,
+    current_user: RequireAnyRole,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get complete sign-off matrix for a release (criteria × stakeholders).
+
+    Sends an ETag; a matching If-None-Match gets 304 after a single lookup of
+    the release's change counter. Finished releases are served from their
+    stored snapshot by that same lookup. Bodies are encoded directly from
+    plain dicts; response_model only documents the shape.
+    """
+    # Verify release exists
+    row = (await db.execute(snapshot_query(release_id, snapshots.MATRIX))).one_or_none()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Release not found",
+        )
+    etag = make_etag("matrix", release_id, row.revision)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    if row.body is not None:
+        return json_response(row.body, etag)
+
+    body = fastjson.dumps(await build_sign_off_matrix(db, release_id))
+    if row.status in FROZEN_STATUSES:
+        await fill_snapshot(db, release_id, snapshots.MATRIX, row.revision, body)
+    return json_response(body, etag)
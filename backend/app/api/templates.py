@@ -1,9 +1,11 @@
+from collections import defaultdict
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
+from app.models.release import Release, CriteriaStatus
 from app.models.template import Template, TemplateCriteria
 from app.schemas.template import (
     TemplateCreate,
@@ -11,19 +13,33 @@ from app.schemas.template import (
     TemplateUpdate,
     TemplateCriteriaCreate,
     TemplateCriteriaResponse,
+    TemplateApply,
+    TemplateApplyResponse,
 )
 from app.dependencies import RequireAdmin, RequireAdminOrProductOwner, RequireAnyRole
+from app.services import events
+from app.services.audit import AuditService
+from app.services.progress import adjust_progress_many
+from app.services.release_copy import instantiate_template
+from app.services.versions import PRODUCTS, TEMPLATES, bump_collection, bump_release, collection_version
+from app.utils.etag import make_etag, not_modified
 
 router = APIRouter()
 
 
 @router.get("/templates", response_model=List[TemplateResponse])
 async def list_templates(
+    request: Request,
+    response: Response,
     current_user: RequireAnyRole,
     include_inactive: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
-    """List all templates."""
+    """List all templates. Sends an ETag and answers If-None-Match with 304."""
+    cached = not_modified(request, response, make_etag(TEMPLATES, await collection_version(db, TEMPLATES)))
+    if cached:
+        return cached
+
     query = select(Template).options(selectinload(Template.criteria))
     if not include_inactive:
         query = query.where(Template.is_active == True)
@@ -60,6 +76,7 @@ async def create_template(
         )
         db.add(db_criteria)
 
+    await bump_collection(db, TEMPLATES)
     await db.commit()
 
     # Reload with relationships
@@ -114,6 +131,7 @@ async def update_template(
     for field, value in update_data.items():
         setattr(template, field, value)
 
+    await bump_collection(db, TEMPLATES)
     await db.commit()
     await db.refresh(template)
     return template
@@ -134,6 +152,9 @@ async def delete_template(
         )
 
     await db.delete(template)
+    # Products pointing at it lose their default template
+    await bump_collection(db, TEMPLATES)
+    await bump_collection(db, PRODUCTS)
     await db.commit()
 
 
@@ -159,6 +180,7 @@ async def add_template_criteria(
 
     db_criteria = TemplateCriteria(**criteria.model_dump(), template_id=template_id)
     db.add(db_criteria)
+    await bump_collection(db, TEMPLATES)
     await db.commit()
     await db.refresh(db_criteria)
     return db_criteria
@@ -188,4 +210,81 @@ async def delete_template_criteria(
         )
 
     await db.delete(criteria)
+    await bump_collection(db, TEMPLATES)
     await db.commit()
+
+
+@router.post("/templates/{template_id}/apply", response_model=TemplateApplyResponse)
+async def apply_template(
+    template_id: int,
+    apply: TemplateApply,
+    current_user: RequireAdmin,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Add the template's criteria to many releases at once, e.g. to roll a new
+    check out across a platform. Criteria a release already has (by name) are
+    skipped, so applying a template again only adds what is missing.
+
+    One INSERT ... SELECT copies the criteria into every release; counters,
+    audit entries and revisions follow in one statement each.
+    """
+    template_result = await db.execute(select(Template.id).where(Template.id == template_id))
+    if not template_result.scalar_one_or_none():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Template not found",
+        )
+
+    release_ids = list(dict.fromkeys(apply.release_ids))
+    release_result = await db.execute(
+        select(Release.id).where(Release.id.in_(release_ids), Release.is_deleted == False)
+    )
+    if len(release_result.all()) != len(release_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="One or more release IDs are invalid",
+        )
+
+    criteria = await instantiate_template(db, template_id, release_ids, skip_existing=True)
+    if not criteria:
+        return TemplateApplyResponse(criteria_added=0, releases_updated=[])
+    # In the order the caller listed the releases
+    touched = {c.release_id for c in criteria}
+    updated = [release_id for release_id in release_ids if release_id in touched]
+
+    await adjust_progress_many(db, [
+        (c.release_id, None, (c.is_mandatory, CriteriaStatus.PENDING)) for c in criteria
+    ])
+
+    # Audit log: criteria added
+    await AuditService(db).log_many([
+        {
+            "entity_type": "release_criteria",
+            "entity_id": c.id,
+            "action": "create",
+            "actor_id": current_user.id,
+            "new_value": {
+                "id": c.id,
+                "release_id": c.release_id,
+                "name": c.name,
+                "is_mandatory": c.is_mandatory,
+                "status": CriteriaStatus.PENDING.value,
+                "owner_id": c.owner_id,
+                "template_id": template_id,
+            },
+        }
+        for c in criteria
+    ])
+    await bump_release(db, *updated)
+
+    await db.commit()
+
+    # Live update: one message per release with the criteria it gained
+    added = defaultdict(list)
+    for c in criteria:
+        added[c.release_id].append(events.criteria_added(c, CriteriaStatus.PENDING))
+    for release_id in updated:
+        await events.event_bus.publish(release_id, added[release_id])
+
+    return TemplateApplyResponse(criteria_added=len(criteria), releases_updated=updated)
@@ -1,12 +1,11 @@
-from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, delete
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.models.product import Product
 from app.models.product_permission import ProductPermission
 from app.models.user import User
 from app.dependencies import RequireAdmin
+from app.services.permissions import grant_permissions, revoke_permissions, sync_roles
 
 router = APIRouter()
 
@@ -36,29 +35,9 @@ async def grant_product_owner_permission(
             detail="System administrators already have full access",
         )
     
-    # Get all products
-    products_result = await db.execute(select(Product))
-    products = products_result.scalars().all()
-    
-    # Grant permission for each product (skip if already exists)
-    for product in products:
-        existing = await db.execute(
-            select(ProductPermission).where(
-                ProductPermission.product_id == product.id,
-                ProductPermission.user_id == user_id,
-            )
-        )
-        if not existing.scalar_one_or_none():
-            permission = ProductPermission(
-                product_id=product.id,
-                user_id=user_id,
-                permission_type="product_owner",
-                granted_by_id=current_user.id,
-            )
-            db.add(permission)
-    
-    # Sync role
-    await user.sync_role_from_permissions(db)
+    # Grant on every product the user doesn't own yet, in one INSERT ... SELECT
+    await grant_permissions(db, [user_id], granted_by_id=current_user.id)
+    await sync_roles(db, [user_id])
     await db.commit()
     
     return {"message": "Product owner permission granted successfully"}
@@ -83,12 +62,8 @@ async def revoke_product_owner_permission(
         )
     
     # Delete all product permissions for this user
-    await db.execute(
-        delete(ProductPermission).where(ProductPermission.user_id == user_id)
-    )
-    
-    # Sync role
-    await user.sync_role_from_permissions(db)
+    await revoke_permissions(db, [user_id])
+    await sync_roles(db, [user_id])
     await db.commit()
     
     return {"message": "Product owner permission revoked successfully"}
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,6 +6,12 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
 from app.dependencies import RequireAdmin, RequireAnyRole
+from app.readmodels import user_rows
+from app.services.user_cache import user_cache
+from app.services.versions import bump_user_releases
+from app.utils import fastjson
+from app.utils.fastjson import json_response
+from app.utils.pagination import parse_cursor, set_next_cursor
 
 router = APIRouter()
 
@@ -23,18 +29,21 @@ async def list_users(
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
     """
     List all users. This endpoint is publicly accessible for the user selector dropdown.
     Note: In production, you may want to add authentication or limit the data returned.
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next
+    page by keyset on (name, id); `skip` is ignored when a cursor is given.
     """
-    query = select(User)
-    if active_only:
-        query = query.where(User.is_active == True)
-    query = query.offset(skip).limit(limit).order_by(User.name)
-    result = await db.execute(query)
-    return result.scalars().all()
+    cursor_values = parse_cursor(cursor, str, int)
+    rows = await user_rows(db, active_only, skip, limit, cursor_values)
+    response = json_response(fastjson.dumps([row._asdict() for row in rows]))
+    set_next_cursor(response, rows, limit, "name", "id")
+    return response
 
 
 @router.post("/users", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -97,8 +106,11 @@ async def update_user(
 
     # Sync deprecated role field from permissions
     await user.sync_role_from_permissions(db)
+    # Names and roles are shown on the releases the user is a stakeholder on
+    await bump_user_releases(db, [user_id])
 
     await db.commit()
+    user_cache.invalidate(user_id)
     await db.refresh(user)
     return user
 
@@ -119,4 +131,6 @@ async def delete_user(
 
     # Soft delete by deactivating
     user.is_active = False
+    await bump_user_releases(db, [user_id])
     await db.commit()
+    user_cache.invalidate(user_id)
@@ -0,0 +1,57 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli repair-progress [--batch-size N]
+"""
+import argparse
+import asyncio
+from sqlalchemy import select
+from app.database import async_session_maker, engine
+from app.models import Release
+from app.services.progress import recompute_progress
+
+
+async def repair_progress(batch_size: int) -> int:
+    """Recompute every release's progress counters, committing one batch at a time."""
+    repaired = 0
+    last_id = 0
+    async with async_session_maker() as db:
+        while True:
+            result = await db.execute(
+                select(Release.id)
+                .where(Release.id > last_id)
+                .order_by(Release.id)
+                .limit(batch_size)
+            )
+            release_ids = result.scalars().all()
+            if not release_ids:
+                break
+            repaired += await recompute_progress(db, release_ids)
+            await db.commit()
+            last_id = release_ids[-1]
+    return repaired
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Release Tracker maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    repair = subparsers.add_parser("repair-progress", help="Recompute materialized release progress counters")
+    repair.add_argument("--batch-size", type=int, default=500)
+
+    args = parser.parse_args()
+
+    async def run() -> None:
+        try:
+            if args.command == "repair-progress":
+                count = await repair_progress(args.batch_size)
+                print(f"Recomputed progress for {count} releases")
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
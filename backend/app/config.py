@@ -11,6 +11,29 @@ class Settings(BaseSettings):
     database_url: str = "sqlite+aiosqlite:///./release_tracker.db"
     database_url_sync: str = "sqlite:///./release_tracker.db"
 
+    # SQLite tuning, applied to every connection (ignored for other databases)
+    sqlite_journal_mode: str = "wal"  # readers don't block the writer, and vice versa
+    sqlite_synchronous: str = "normal"  # fsync at checkpoints, not every commit (safe with WAL)
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
+    # Queue write requests for a single writer per worker instead of contending for the lock
+    sqlite_single_writer: bool = True
+
+    # Read replicas: comma-separated async URLs. GET requests read from them in turn,
+    # except for users that wrote within read_your_writes_seconds
+    database_replica_urls: str = ""
+    read_your_writes_seconds: float = 5.0
+
+    # Connection pool (ignored for in-memory SQLite, which shares one connection)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 5.0  # checkout deadline; requests get a 503 after it
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True  # server databases only; a SQLite file can't drop the connection
+    # Cancel statements running longer than this (0 disables)
+    db_statement_timeout_ms: int = 30000
+
     # API
     api_prefix: str = "/api"
 
@@ -19,9 +42,19 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24 * 7  # 7 days
 
+    # Authenticated-user cache (per process; set either to 0 to disable)
+    user_cache_ttl_seconds: float = 30.0
+    user_cache_max_entries: int = 1024
+
+    # Live release events: "local" (single worker) or "postgres" (LISTEN/NOTIFY across workers)
+    event_bus_backend: str = "local"
+    event_queue_size: int = 100
+    sse_heartbeat_seconds: float = 15.0
+
     # Google OAuth Settings
     google_client_id: Optional[str] = None
     google_client_secret: Optional[str] = None
+    google_certs_url: str = "https://www.googleapis.com/oauth2/v1/certs"
 
     class Config:
         env_file = ".env"
@@ -1,29 +1,356 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+import asyncio
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.util import await_
 from app.config import get_settings
+from app.utils.criteria_order import SQLITE_LOWER_FUNCTION
+from app.utils.jwt import get_user_id_from_token
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
+
+def engine_options(database_url: str) -> dict:
+    """create_async_engine() keyword arguments for a database URL, from Settings."""
+    url = make_url(database_url)
+    options = {"echo": settings.debug, "future": True}
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping and url.get_backend_name() != "sqlite",
+    )
+    if url.get_driver_name() == "asyncpg" and settings.db_statement_timeout_ms > 0:
+        # Enforced by the server; SQLite uses a progress handler instead (below)
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(int(settings.db_statement_timeout_ms))}
+        }
+    return options
+
+
+# HTTP methods whose requests may write
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+def sqlite_pragmas() -> list:
+    """PRAGMA statements run on every new SQLite connection, from Settings."""
+    return [
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size={-int(settings.sqlite_cache_size_kib)}",
+    ]
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _python_lower(value):
+    return None if value is None else str(value).lower()
+
+
+def register_sqlite_functions(dbapi_connection, connection_record=None):
+    """
+    Add py_lower(), Python's str.lower, alongside SQLite's ASCII-only lower(),
+    so keys computed in SQL (app.utils.criteria_order.criteria_sort_key_sql)
+    match the ones computed in Python. lower() itself is left alone.
+    """
+    dbapi_connection.create_function(SQLITE_LOWER_FUNCTION, 1, _python_lower, deterministic=True)
+
+
+# SQLite has no statement_timeout: a progress handler, called every
+# PROGRESS_INTERVAL virtual machine instructions, interrupts the running
+# statement once the deadline set before it started has passed.
+PROGRESS_INTERVAL = 10_000
+_DEADLINE_KEY = "statement_deadline"
+
+
+def _install_sqlite_statement_timeout(dbapi_connection, connection_record):
+    info = connection_record.info
+
+    def past_deadline() -> int:
+        deadline = info.get(_DEADLINE_KEY)
+        return 1 if deadline is not None and time.monotonic() > deadline else 0
+
+    await_(connection_record.driver_connection.set_progress_handler(past_deadline, PROGRESS_INTERVAL))
+
+
+def _start_statement_clock(conn, cursor, statement, parameters, context, executemany):
+    conn.info[_DEADLINE_KEY] = time.monotonic() + settings.db_statement_timeout_ms / 1000
+
+
+def _stop_statement_clock(conn, *args):
+    conn.info.pop(_DEADLINE_KEY, None)
+
+
+def _stop_statement_clock_on_error(context):
+    if context.connection is not None:
+        _stop_statement_clock(context.connection)
+
+
+def is_statement_timeout(exc: DBAPIError) -> bool:
+    """True if a database error is a statement cancelled by db_statement_timeout_ms."""
+    orig = exc.orig
+    # PostgreSQL query_canceled; sqlite3 reports an interrupted statement
+    return getattr(orig, "sqlstate", None) == "57014" or str(orig) == "interrupted"
+
+
+def make_engine(database_url: str) -> AsyncEngine:
+    """An engine configured from Settings, with the SQLite connection hooks if it is SQLite."""
+    new_engine = create_async_engine(database_url, **engine_options(database_url))
+    sync_engine = new_engine.sync_engine
+    if new_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
+        event.listen(sync_engine, "connect", register_sqlite_functions)
+        if settings.db_statement_timeout_ms > 0:
+            event.listen(sync_engine, "connect", _install_sqlite_statement_timeout)
+            event.listen(sync_engine, "before_cursor_execute", _start_statement_clock)
+            event.listen(sync_engine, "after_cursor_execute", _stop_statement_clock)
+            event.listen(sync_engine, "handle_error", _stop_statement_clock_on_error)
+    return new_engine
+
+
+def replica_urls() -> List[str]:
+    return [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()]
+
+
+engine = make_engine(settings.database_url)
+replica_engines: List[AsyncEngine] = [make_engine(url) for url in replica_urls()]
+_replica_turns = itertools.count()
+
+is_sqlite = engine.dialect.name == "sqlite"
+
+# Most connections the primary's pool hands out at once (None without a bounded pool)
+pool_capacity = (
+    settings.db_pool_size + settings.db_max_overflow if "pool_size" in engine_options(settings.database_url) else None
 )
 
+# Session.info key holding the replica a session reads from, if any
+REPLICA_KEY = "replica"
+
+
+class RoutingSession(Session):
+    """
+    Sends a session's reads to its replica, when it has one, and everything
+    else to the primary: flushes, INSERT/UPDATE/DELETE statements, connections
+    asked for without a statement (ORM bulk writes do this) and every statement
+    of a session without a replica. A read-mostly request that also writes
+    (such as a GET filling a cache) therefore still writes to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get(REPLICA_KEY)
+        if replica is None or self._flushing or clause is None or isinstance(clause, UpdateBase):
+            return super().get_bind(mapper, clause=clause, **kw)
+        return replica.sync_engine
+
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
 )
 
 
-class Base(DeclarativeBase):
-    pass
+def next_replica() -> Optional[AsyncEngine]:
+    """The replica for the next read-only session, round robin (None without replicas)."""
+    if not replica_engines:
+        return None
+    return replica_engines[next(_replica_turns) % len(replica_engines)]
+
+
+# Cookie holding when the client last wrote (Unix time); set by
+# app.middleware.read_your_writes while replicas are configured
+LAST_WRITE_COOKIE = "rt_last_write"
+
+
+def request_user_id(request: Request) -> Optional[int]:
+    """
+    The user a request acts as, from its headers alone: X-User-Id if given,
+    else the bearer token's subject. Not an authentication check; it only
+    decides where reads go.
+    """
+    try:
+        return int(request.headers["x-user-id"])
+    except (KeyError, ValueError):
+        pass
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return get_user_id_from_token(token)
+    return None
+
+
+class RecentWriters:
+    """
+    When each user last wrote through this process, forgotten after
+    read_your_writes_seconds. Keyed by user rather than by client, so a user's
+    other tabs and cookie-less API clients also read their own writes; the
+    LAST_WRITE_COOKIE still covers the user's next request landing on another
+    worker.
+    """
+
+    def __init__(self):
+        self._last_write: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write.pop(user_id, None)
+            self._last_write[user_id] = now
+            # Oldest first: drop entries that can no longer pin anyone
+            cutoff = now - settings.read_your_writes_seconds
+            for stale, written_at in list(self._last_write.items()):
+                if written_at >= cutoff:
+                    break
+                del self._last_write[stale]
+
+    def wrote_recently(self, user_id: int) -> bool:
+        with self._lock:
+            written_at = self._last_write.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < settings.read_your_writes_seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._last_write.clear()
+
+
+recent_writers = RecentWriters()
+
+
+def wrote_recently(request: Request) -> bool:
+    """True if the user or client wrote within read_your_writes_seconds, so replicas may not have it yet."""
+    user_id = request_user_id(request)
+    if user_id is not None and recent_writers.wrote_recently(user_id):
+        return True
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - last_write < settings.read_your_writes_seconds
+
+
+class WriterQueue:
+    """
+    First-come, first-served turns for writers within this process.
+
+    SQLite allows one writer at a time. In WAL mode readers never wait for it,
+    but concurrent writers would spin on the database lock (and fail with
+    "database is locked" once busy_timeout runs out). Queuing them on an
+    asyncio lock instead lets each write transaction run uncontended, in
+    arrival order, while reads carry on. busy_timeout still covers writers in
+    other worker processes. Turns are not re-entrant.
+
+    Write requests hold a turn per transaction (see queue_transactions), so
+    work a handler does before its first statement, such as fetching Google's
+    signing certs at login, does not keep other writers waiting.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        # Called with the seconds each writer waited (see app.services.metrics)
+        self.on_wait: Optional[Callable[[float], None]] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _current_lock(self) -> asyncio.Lock:
+        # asyncio locks belong to one event loop; tests run a loop per test
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._lock = loop, asyncio.Lock()
+        return self._lock
+
+    async def acquire(self) -> None:
+        """Wait for this writer's turn; pair with release()."""
+        lock = self._current_lock()
+        started = time.perf_counter()
+        await lock.acquire()
+        if self.on_wait:
+            self.on_wait(time.perf_counter() - started)
+
+    def release(self) -> None:
+        self._lock.release()
+
+    @asynccontextmanager
+    async def turn(self) -> AsyncIterator[None]:
+        """Wait for this writer's turn and hold it for the block."""
+        if not self.enabled:
+            yield
+            return
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def queue_transactions(self, session: AsyncSession) -> None:
+        """
+        Make every transaction of `session` wait for a turn when it begins and
+        give the turn back when it commits, rolls back or the session closes.
+        """
+        if self.enabled:
+            session.sync_session.info[_WRITER_QUEUE_KEY] = self
+
+
+# Session.info keys: the WriterQueue a session's transactions queue on, and
+# whether its current transaction holds a turn
+_WRITER_QUEUE_KEY = "writer_queue"
+_HOLDS_TURN_KEY = "holds_writer_turn"
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _take_writer_turn(session, transaction, connection):
+    queue = session.info.get(_WRITER_QUEUE_KEY)
+    if queue is not None and not session.info.get(_HOLDS_TURN_KEY):
+        # Runs before the transaction's first statement, inside the session's greenlet
+        await_(queue.acquire())
+        session.info[_HOLDS_TURN_KEY] = True
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _give_back_writer_turn(session, transaction):
+    if transaction.parent is None and session.info.pop(_HOLDS_TURN_KEY, False):
+        session.info[_WRITER_QUEUE_KEY].release()
+
+
+writer_queue = WriterQueue(enabled=is_sqlite and settings.sqlite_single_writer)
 
 
-async def get_db() -> AsyncSession:
+async def get_db(request: Request) -> AsyncSession:
     async with async_session_maker() as session:
         try:
-            yield session
+            if request.method in WRITE_METHODS:
+                # Write requests take their turn for each transaction
+                writer_queue.queue_transactions(session)
+                yield session
+            else:
+                if replica_engines and not wrote_recently(request):
+                    session.info[REPLICA_KEY] = next_replica()
+                yield session
         finally:
             await session.close()
@@ -7,15 +7,44 @@ except ImportError:
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models.user import User, UserRole
+from app.services.user_cache import user_cache
 from app.utils.jwt import get_user_id_from_token
 
 # Optional bearer token security scheme
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
+async def load_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """
+    Resolve a user by id through the per-process identity cache.
+
+    On a hit no query is issued; on a miss the user is loaded with their
+    product permissions and cached. Either way the User is detached from the
+    session, with only its columns and product_permissions loaded: handlers
+    must not lazy-load other relationships from it or modify it, and should
+    query the user again when they need to change it.
+    """
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    result = await db.execute(
+        select(User)
+        .where(User.id == user_id)
+        .options(selectinload(User.product_permissions))
+    )
+    user = result.scalar_one_or_none()
+    if user is not None:
+        user_cache.put(user)
+        # Same shape as a cache hit, and unaffected by the handler's commits
+        db.expunge(user)
+    return user
+
+
 async def get_current_user(
     x_user_id: Annotated[Optional[int], Header()] = None,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
@@ -41,8 +70,7 @@ async def get_current_user(
         jwt_user_id = get_user_id_from_token(credentials.credentials)
         if jwt_user_id:
             # Valid JWT token
-            result = await db.execute(select(User).where(User.id == jwt_user_id))
-            jwt_user = result.scalar_one_or_none()
+            jwt_user = await load_user(db, jwt_user_id)
 
             if jwt_user and jwt_user.is_active:
                 # Check if admin is trying to impersonate via X-User-Id
@@ -66,13 +94,11 @@ async def get_current_user(
 
     # Fetch the target user
     if is_impersonating:
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+        user = await load_user(db, user_id)
     else:
         user = jwt_user if jwt_user and jwt_user.id == user_id else None
         if not user:
-            result = await db.execute(select(User).where(User.id == user_id))
-            user = result.scalar_one_or_none()
+            user = await load_user(db, user_id)
 
     if not user:
         raise HTTPException(
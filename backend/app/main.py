@@ -1,10 +1,29 @@
-from fastapi import FastAPI
+import math
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 from app.config import get_settings
-from app.api import products, templates, releases, signoffs, stakeholders, dashboard, audit, users, product_permissions, user_permissions, auth
+from app.database import engine, is_statement_timeout, pool_capacity, replica_engines, writer_queue
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.api import products, templates, releases, signoffs, stakeholders, dashboard, audit, users, product_permissions, user_permissions, auth, events
+from app.services.events import event_bus
+from app.services.metrics import instrument_engine, instrument_writer_queue, mark_worker_dead, render_metrics
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close the event bus listener connection, if any
+    await event_bus.stop()
+    mark_worker_dead()
+
+
 app = FastAPI(
     title=settings.app_name,
     description="Release Management & Sign-off Workflow System",
@@ -12,6 +31,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -21,8 +41,41 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Keep clients that just wrote on the primary while replicas catch up
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Request and database metrics, served at /metrics
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine, pool_capacity)
+for replica in replica_engines:
+    instrument_engine(replica, pool_capacity)
+instrument_writer_queue(writer_queue)
+
+
+def database_unavailable(detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(settings.db_pool_timeout_seconds)))},
+    )
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # No connection came free within db_pool_timeout_seconds
+    return database_unavailable("Database is busy, please retry")
+
+
+@app.exception_handler(DBAPIError)
+async def statement_timeout_handler(request: Request, exc: DBAPIError):
+    if not is_statement_timeout(exc):
+        raise exc
+    return database_unavailable("Database query timed out, please retry")
+
+
 # Include routers
 app.include_router(auth.router, prefix=settings.api_prefix, tags=["Authentication"])
 app.include_router(products.router, prefix=settings.api_prefix, tags=["Products"])
@@ -30,6 +83,7 @@ app.include_router(templates.router, prefix=settings.api_prefix, tags=["Template
 app.include_router(releases.router, prefix=settings.api_prefix, tags=["Releases"])
 app.include_router(signoffs.router, prefix=settings.api_prefix, tags=["Sign-offs"])
 app.include_router(stakeholders.router, prefix=settings.api_prefix, tags=["Stakeholders"])
+app.include_router(events.router, prefix=settings.api_prefix, tags=["Events"])
 app.include_router(dashboard.router, prefix=settings.api_prefix, tags=["Dashboard"])
 app.include_router(audit.router, prefix=settings.api_prefix, tags=["Audit"])
 app.include_router(users.router, prefix=settings.api_prefix, tags=["Users"])
@@ -40,3 +94,9 @@ app.include_router(product_permissions.router, prefix=settings.api_prefix, tags=
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,100 @@
+import time
+from typing import List, Optional, Pattern, Set, Tuple
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.metrics import (
+    DB_STATEMENTS_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    RequestDbStats,
+    current_request_stats,
+)
+
+# Label for requests that matched no route, so unknown URLs can't blow up cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+EVENT_STREAM_CONTENT_TYPE = b"text/event-stream"
+
+
+def is_event_stream(message: Message) -> bool:
+    for name, value in message.get("headers", ()):
+        if name.lower() == b"content-type":
+            return value.startswith(EVENT_STREAM_CONTENT_TYPE)
+    return False
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status, in-flight count and DB usage per route template.
+
+    Routes are labelled by template ("/api/releases/{release_id}"), never by
+    the concrete path. Server-Sent Event streams stay open for as long as the
+    client listens, so they leave the in-flight gauge and stop the latency
+    clock as soon as their response starts.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._routes: Optional[List[Tuple[Pattern, str, Set[str]]]] = None
+
+    def _route_table(self, scope: Scope) -> List[Tuple[Pattern, str, Set[str]]]:
+        if self._routes is None:
+            routes = []
+            for template, operations in scope["app"].openapi()["paths"].items():
+                regex, _, _ = compile_path(template)
+                routes.append((regex, template, {m.upper() for m in operations}))
+            self._routes = routes
+        return self._routes
+
+    def route_template(self, scope: Scope) -> str:
+        path = scope["path"]
+        candidates = [(template, methods) for regex, template, methods in self._route_table(scope) if regex.match(path)]
+        for template, methods in candidates:
+            if scope["method"] in methods:
+                return template
+        if candidates:
+            return candidates[0][0]
+        # Routes left out of the schema, e.g. /metrics itself
+        route = scope.get("route")
+        return getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_flight = True
+        elapsed: Optional[float] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, in_flight, elapsed
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if is_event_stream(message):
+                    elapsed = time.perf_counter() - started
+                    in_progress.dec()
+                    in_flight = False
+            await send(message)
+
+        stats = RequestDbStats()
+        token = current_request_stats.set(stats)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if elapsed is None:
+                elapsed = time.perf_counter() - started
+            if in_flight:
+                in_progress.dec()
+            current_request_stats.reset(token)
+            route = self.route_template(scope)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(method, route).observe(elapsed)
+            DB_STATEMENTS_PER_REQUEST.labels(method, route).observe(stats.statements)
+            DB_TIME_PER_REQUEST.labels(method, route).observe(stats.seconds)
@@ -0,0 +1,44 @@
+import math
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app import database
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Records successful writes while read replicas are configured. For
+    read_your_writes_seconds afterwards, the writer's GET requests read from
+    the primary (see app.database.get_db), so they see their own changes even
+    if the replicas are behind. The write is marked against the user it was
+    made as (app.database.recent_writers), which covers all of the user's
+    clients on this worker, and stamped on the response as the
+    LAST_WRITE_COOKIE, which lives with the client and so holds whichever
+    worker serves its next request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in database.WRITE_METHODS or not database.replica_engines:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                user_id = database.request_user_id(Request(scope))
+                if user_id is not None:
+                    database.recent_writers.mark(user_id)
+                max_age = math.ceil(settings.read_your_writes_seconds)
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{database.LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
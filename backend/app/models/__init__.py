@@ -4,6 +4,10 @@ from app.models.template import Template, TemplateCriteria
 from app.models.release import Release, ReleaseCriteria
 from app.models.signoff import SignOff
 from app.models.audit import AuditLog
+from app.models.release_stakeholder import ReleaseStakeholder
+from app.models.product_permission import ProductPermission
+from app.models.collection_version import CollectionVersion
+from app.models.release_snapshot import ReleaseSnapshot
 
 __all__ = [
     "User",
@@ -14,4 +18,8 @@ __all__ = [
     "ReleaseCriteria",
     "SignOff",
     "AuditLog",
+    "ReleaseStakeholder",
+    "ProductPermission",
+    "CollectionVersion",
+    "ReleaseSnapshot",
 ]
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, Dict, Any, TYPE_CHECKING
-from sqlalchemy import String, Integer, ForeignKey, DateTime, JSON
+from sqlalchemy import String, Integer, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -10,6 +10,10 @@ if TYPE_CHECKING:
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_release_id_timestamp", "release_id", "timestamp"),
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     entity_type: Mapped[str] = mapped_column(String(50), index=True)
@@ -18,6 +22,9 @@ class AuditLog(Base):
     actor_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True)
     old_value: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
     new_value: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    # Denormalized from entity_id / old_value / new_value so release history is an
+    # indexed lookup. Deliberately not a foreign key: audit rows outlive releases.
+    release_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
     # Relationships
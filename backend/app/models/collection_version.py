@@ -0,0 +1,14 @@
+from sqlalchemy import String, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class CollectionVersion(Base):
+    """
+    Change counter for a whole collection (e.g. all products), bumped by every
+    write that changes what its list endpoint returns. Backs list ETags.
+    """
+    __tablename__ = "collection_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    revision: Mapped[int] = mapped_column(Integer, default=0)
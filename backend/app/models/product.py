@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
-from sqlalchemy import String, Text, DateTime, ForeignKey
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -19,6 +19,12 @@ class Product(Base):
     default_template_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("templates.id", ondelete="SET NULL"), nullable=True
     )
+    # Materialized release counts by status, maintained by app.services.release_counts
+    draft_releases: Mapped[int] = mapped_column(Integer, default=0)
+    in_review_releases: Mapped[int] = mapped_column(Integer, default=0)
+    approved_releases: Mapped[int] = mapped_column(Integer, default=0)
+    released_releases: Mapped[int] = mapped_column(Integer, default=0)
+    cancelled_releases: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
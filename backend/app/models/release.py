@@ -1,9 +1,10 @@
 from datetime import datetime, date
 from typing import Optional, List, TYPE_CHECKING
 from enum import Enum as PyEnum
-from sqlalchemy import String, Text, Integer, ForeignKey, DateTime, Date, Enum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Text, Integer, ForeignKey, DateTime, Date, Enum, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from app.database import Base
+from app.utils.criteria_order import criteria_sort_key
 
 if TYPE_CHECKING:
     from app.models.product import Product
@@ -30,6 +31,9 @@ class CriteriaStatus(str, PyEnum):
 
 class Release(Base):
     __tablename__ = "releases"
+    __table_args__ = (
+        Index("ix_releases_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), index=True)
@@ -49,6 +53,14 @@ class Release(Base):
         ForeignKey("users.id"), nullable=True
     )
     is_deleted: Mapped[bool] = mapped_column(default=False)
+    # Materialized progress counters, maintained by app.services.progress
+    mandatory_total: Mapped[int] = mapped_column(Integer, default=0)
+    mandatory_approved: Mapped[int] = mapped_column(Integer, default=0)
+    optional_total: Mapped[int] = mapped_column(Integer, default=0)
+    optional_approved: Mapped[int] = mapped_column(Integer, default=0)
+    # Bumped by every write that changes the release detail or sign-off matrix
+    # (app.services.versions); backs their ETags
+    revision: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -59,15 +71,26 @@ class Release(Base):
     template: Mapped[Optional["Template"]] = relationship("Template")
     created_by: Mapped[Optional["User"]] = relationship("User")
     criteria: Mapped[List["ReleaseCriteria"]] = relationship(
-        "ReleaseCriteria", back_populates="release", cascade="all, delete-orphan"
+        "ReleaseCriteria",
+        back_populates="release",
+        cascade="all, delete-orphan",
+        order_by="(ReleaseCriteria.sort_key, ReleaseCriteria.id)",
     )
     stakeholders: Mapped[List["ReleaseStakeholder"]] = relationship(
         "ReleaseStakeholder", back_populates="release", cascade="all, delete-orphan"
     )
 
 
+def _default_sort_key(context) -> str:
+    # Core inserts that leave sort_key out derive it from the name
+    return criteria_sort_key(context.get_current_parameters()["name"])
+
+
 class ReleaseCriteria(Base):
     __tablename__ = "release_criteria"
+    __table_args__ = (
+        Index("ix_release_criteria_release_sort_key", "release_id", "sort_key"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     release_id: Mapped[int] = mapped_column(ForeignKey("releases.id"), index=True)
@@ -79,6 +102,10 @@ class ReleaseCriteria(Base):
         Enum(CriteriaStatus, native_enum=False), default=CriteriaStatus.PENDING
     )
     order: Mapped[int] = mapped_column(Integer, default=0)
+    # Canonical display position (app.utils.criteria_order), follows the name
+    sort_key: Mapped[str] = mapped_column(
+        String(260).with_variant(String(260, collation="C"), "postgresql"), default=_default_sort_key
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -90,3 +117,9 @@ class ReleaseCriteria(Base):
     sign_offs: Mapped[List["SignOff"]] = relationship(
         "SignOff", back_populates="criteria", cascade="all, delete-orphan"
     )
+
+    @validates("name")
+    def _set_sort_key(self, key: str, name: str) -> str:
+        # Created or renamed through the ORM: keep the stored order in step
+        self.sort_key = criteria_sort_key(name)
+        return name
@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlalchemy import String, Text, Integer, ForeignKey, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class ReleaseSnapshot(Base):
+    """
+    Serialized response body for a finished (released or cancelled) release.
+
+    One row per release and view ("release" detail, "matrix"). The body is only
+    valid while `revision` equals Release.revision, so any later write to the
+    release makes it stale without touching this table.
+    """
+    __tablename__ = "release_snapshots"
+
+    release_id: Mapped[int] = mapped_column(
+        ForeignKey("releases.id", ondelete="CASCADE"), primary_key=True
+    )
+    kind: Mapped[str] = mapped_column(String(20), primary_key=True)
+    revision: Mapped[int] = mapped_column(Integer)
+    body: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
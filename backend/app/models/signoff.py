@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 from enum import Enum as PyEnum
-from sqlalchemy import Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Text, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -18,6 +18,18 @@ class SignOffStatus(str, PyEnum):
 
 class SignOff(Base):
     __tablename__ = "sign_offs"
+    __table_args__ = (
+        Index("ix_sign_offs_criteria_signer_status", "criteria_id", "signed_by_id", "status"),
+        # At most one active (non-revoked) sign-off per user and criteria
+        Index(
+            "uq_sign_offs_active_criteria_signer",
+            "criteria_id",
+            "signed_by_id",
+            unique=True,
+            sqlite_where=text("status != 'REVOKED'"),
+            postgresql_where=text("status != 'REVOKED'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     criteria_id: Mapped[int] = mapped_column(ForeignKey("release_criteria.id"), index=True)
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 from typing import List, TYPE_CHECKING
-from sqlalchemy import String, Boolean, DateTime, Enum
+from sqlalchemy import String, Boolean, DateTime, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -25,6 +25,9 @@ if TYPE_CHECKING:
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_name_id", "name", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
@@ -80,6 +83,14 @@ class User(Base):
             else:
                 self.role = UserRole.STAKEHOLDER
 
+        # Role or permissions changed: drop any cached identity for this user
+        # once the change is committed
+        from sqlalchemy.orm import object_session
+        from app.services.user_cache import user_cache
+        session = db if db is not None else object_session(self)
+        if session is not None:
+            user_cache.invalidate_on_commit(session, self.id)
+
     def has_product_permission(self, product_id: int) -> bool:
         """Check if user has product owner permission for a specific product."""
         if self.is_admin:
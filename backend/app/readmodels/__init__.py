@@ -0,0 +1,30 @@
+"""
+Read models for the hot list endpoints.
+
+Each function runs Core queries that select only the columns its response
+shows and returns lightweight rows (or plain dicts where the response nests),
+skipping ORM entity hydration and identity-map bookkeeping. Endpoints encode
+the results with app.utils.fastjson instead of validating them through their
+response_model, which then only documents the shape. Writes keep using the
+ORM models.
+"""
+from app.readmodels.releases import RELEASE_COLUMNS, release_rows
+from app.readmodels.products import product_list
+from app.readmodels.users import user_rows
+from app.readmodels.dashboard import (
+    my_pending_count,
+    my_pending_rows,
+    product_release_count_rows,
+    release_count_totals,
+)
+
+__all__ = [
+    "RELEASE_COLUMNS",
+    "release_rows",
+    "product_list",
+    "user_rows",
+    "my_pending_count",
+    "my_pending_rows",
+    "product_release_count_rows",
+    "release_count_totals",
+]
@@ -0,0 +1,110 @@
+from datetime import date
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import select, func, and_, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from app.models.product import Product
+from app.models.release import Release, ReleaseCriteria, ReleaseStatus
+from app.models.release_stakeholder import ReleaseStakeholder
+from app.models.signoff import SignOff, SignOffStatus
+from app.services.release_counts import STATUS_COLUMNS
+from app.utils.pagination import apply_keyset
+
+# Releases without a target date sort after every dated one
+UNDATED = date.max
+
+
+def _my_pending_query(user_id: int, *columns) -> Select:
+    """
+    Criteria on in-review releases the user is a stakeholder on and has no
+    active (non-revoked) sign-off for, as a single anti-join.
+    """
+    has_active_signoff = (
+        select(SignOff.id)
+        .where(
+            SignOff.criteria_id == ReleaseCriteria.id,
+            SignOff.signed_by_id == user_id,
+            SignOff.status != SignOffStatus.REVOKED,
+        )
+        .exists()
+    )
+    return (
+        select(*columns)
+        .select_from(ReleaseCriteria)
+        .join(Release, Release.id == ReleaseCriteria.release_id)
+        .join(
+            ReleaseStakeholder,
+            and_(
+                ReleaseStakeholder.release_id == Release.id,
+                ReleaseStakeholder.user_id == user_id,
+            ),
+        )
+        .where(
+            Release.is_deleted == False,
+            Release.status == ReleaseStatus.IN_REVIEW,  # Only show for releases in review
+            ~has_active_signoff,
+        )
+    )
+
+
+async def my_pending_rows(
+    db: AsyncSession,
+    user_id: int,
+    limit: Optional[int] = None,
+    cursor_values: Optional[Tuple[Any, ...]] = None,
+) -> List[Row]:
+    """
+    Criteria awaiting the user's sign-off (one page of them if `limit` is
+    given), keyed on (sort_date, release_id, id) where sort_date is the target
+    date or UNDATED.
+    """
+    sort_date = func.coalesce(Release.target_date, UNDATED).label("sort_date")
+    query = _my_pending_query(
+        user_id,
+        ReleaseCriteria.id,
+        ReleaseCriteria.name,
+        ReleaseCriteria.release_id,
+        ReleaseCriteria.is_mandatory,
+        ReleaseCriteria.status,
+        Release.name.label("release_name"),
+        Release.version,
+        sort_date,
+    )
+    query = apply_keyset(query, [sort_date, Release.id, ReleaseCriteria.id], cursor_values)
+    if limit is not None:
+        query = query.limit(limit)
+    result = await db.execute(query)
+    return result.all()
+
+
+async def my_pending_count(db: AsyncSession, user_id: int) -> int:
+    """Number of criteria awaiting the user's sign-off."""
+    result = await db.execute(_my_pending_query(user_id, func.count(ReleaseCriteria.id)))
+    return result.scalar_one()
+
+
+async def release_count_totals(db: AsyncSession) -> Row:
+    """
+    The per-status release counters summed over all products, as one row.
+
+    This is one aggregate over products, so it grows with the number of
+    products rather than being a constant-time read. Products number in the
+    dozens while releases keep accumulating, and keeping the counters per
+    product avoids a single global totals row that every release create,
+    status change and delete would have to lock.
+    """
+    result = await db.execute(
+        select(*(func.coalesce(func.sum(getattr(Product, c)), 0).label(c) for c in STATUS_COLUMNS.values()))
+    )
+    return result.one()
+
+
+async def product_release_count_rows(db: AsyncSession) -> List[Row]:
+    """Id, name and per-status release counters of products with releases, by name."""
+    counters = [getattr(Product, c) for c in STATUS_COLUMNS.values()]
+    result = await db.execute(
+        select(Product.id, Product.name, *counters)
+        .where(sum(counters[1:], counters[0]) > 0)
+        .order_by(Product.name)
+    )
+    return result.all()
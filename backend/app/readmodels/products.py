@@ -0,0 +1,45 @@
+from collections import defaultdict
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.product import Product
+from app.models.product_permission import ProductPermission
+
+# ProductResponse fields, in order (product_owners is added per product)
+PRODUCT_COLUMNS = [
+    Product.name, Product.description, Product.id, Product.default_template_id,
+    Product.created_at, Product.updated_at,
+]
+# ProductOwnerInfo fields, in order
+OWNER_COLUMNS = [
+    ProductPermission.id, ProductPermission.user_id, ProductPermission.permission_type,
+    ProductPermission.granted_at,
+]
+
+
+async def product_list(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[dict]:
+    """
+    One page of products by name, each with its owners, in two queries.
+
+    Owners are selected for the same page through a subquery rather than an
+    IN list of ids, so page size is not bounded by bind-parameter limits. Both
+    queries order by (name, id) so they always agree on which rows form the page.
+    """
+    page = select(Product.id).order_by(Product.name, Product.id).offset(skip).limit(limit)
+    products = (await db.execute(
+        select(*PRODUCT_COLUMNS).order_by(Product.name, Product.id).offset(skip).limit(limit)
+    )).all()
+    if not products:
+        return []
+
+    owners = defaultdict(list)
+    owner_keys = [c.key for c in OWNER_COLUMNS]
+    result = await db.execute(
+        select(ProductPermission.product_id, *OWNER_COLUMNS)
+        .where(ProductPermission.product_id.in_(page.scalar_subquery()))
+        .order_by(ProductPermission.id)
+    )
+    for product_id, *owner in result.all():
+        owners[product_id].append(dict(zip(owner_keys, owner)))
+
+    return [{**p._asdict(), "product_owners": owners[p.id]} for p in products]
@@ -0,0 +1,38 @@
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import select, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.release import Release, ReleaseStatus
+from app.utils.pagination import apply_keyset
+
+# ReleaseResponse fields, in order
+RELEASE_COLUMNS = [
+    Release.version, Release.name, Release.description, Release.target_date, Release.candidate_build,
+    Release.id, Release.product_id, Release.template_id, Release.status, Release.created_by_id,
+    Release.created_at, Release.updated_at, Release.released_at,
+    Release.mandatory_total, Release.mandatory_approved, Release.optional_total, Release.optional_approved,
+]
+
+
+async def release_rows(
+    db: AsyncSession,
+    product_id: Optional[int] = None,
+    status: Optional[ReleaseStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor_values: Optional[Tuple[Any, ...]] = None,
+) -> List[Row]:
+    """
+    One page of non-deleted releases, newest first, keyed on (created_at, id).
+    `skip` is ignored when cursor_values are given.
+    """
+    query = select(*RELEASE_COLUMNS).where(Release.is_deleted == False)
+    if product_id:
+        query = query.where(Release.product_id == product_id)
+    if status:
+        query = query.where(Release.status == status)
+
+    query = apply_keyset(query, [Release.created_at, Release.id], cursor_values, descending=True)
+    if cursor_values is None:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return result.all()
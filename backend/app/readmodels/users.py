@@ -0,0 +1,29 @@
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import select, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.utils.pagination import apply_keyset
+
+# UserResponse fields, in order
+USER_COLUMNS = [User.email, User.name, User.id, User.is_active, User.is_admin, User.created_at]
+
+
+async def user_rows(
+    db: AsyncSession,
+    active_only: bool = True,
+    skip: int = 0,
+    limit: int = 100,
+    cursor_values: Optional[Tuple[Any, ...]] = None,
+) -> List[Row]:
+    """
+    One page of users by name, keyed on (name, id). `skip` is ignored when
+    cursor_values are given.
+    """
+    query = select(*USER_COLUMNS)
+    if active_only:
+        query = query.where(User.is_active == True)
+    query = apply_keyset(query, [User.name, User.id], cursor_values)
+    if cursor_values is None:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return result.all()
@@ -1,5 +1,6 @@
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
@@ -15,6 +16,24 @@ class ProductPermissionCreate(BaseModel):
     permission_type: str = "product_owner"
 
 
+class ProductPermissionBulkAction(str, Enum):
+    GRANT = "grant"
+    REVOKE = "revoke"
+
+
+class ProductPermissionBulkUpdate(BaseModel):
+    """Request to grant or revoke permissions for many users on many products"""
+    action: ProductPermissionBulkAction
+    user_ids: list[int] = Field(min_length=1)
+    product_ids: list[int] = Field(min_length=1)
+    permission_type: str = "product_owner"
+
+
+class ProductPermissionBulkResult(BaseModel):
+    action: ProductPermissionBulkAction
+    changed: int
+
+
 class ProductPermissionResponse(ProductPermissionBase):
     id: int
     granted_by_id: Optional[int]
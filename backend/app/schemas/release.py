@@ -61,6 +61,16 @@ class ReleaseUpdate(BaseModel):
     candidate_build: Optional[str] = None
 
 
+class ReleaseClone(BaseModel):
+    """A new version of an existing release; unset fields are copied from it"""
+    version: str
+    name: str
+    description: Optional[str] = None
+    target_date: Optional[date] = None
+    candidate_build: Optional[str] = None
+    include_stakeholders: bool = True
+
+
 class ReleaseResponse(ReleaseBase):
     id: int
     product_id: int
@@ -70,6 +80,10 @@ class ReleaseResponse(ReleaseBase):
     created_at: datetime
     updated_at: datetime
     released_at: Optional[datetime]
+    mandatory_total: int = 0
+    mandatory_approved: int = 0
+    optional_total: int = 0
+    optional_approved: int = 0
 
     class Config:
         from_attributes = True
@@ -109,3 +123,10 @@ class ReleaseSignOffMatrixResponse(BaseModel):
     release_id: int
     stakeholders: List[StakeholderUser]
     criteria_matrix: List[CriteriaSignOffMatrix]
+
+
+class CriteriaStatusRebuildResponse(BaseModel):
+    """Outcome of recomputing every release's stored criteria statuses"""
+    releases_checked: int
+    releases_changed: int
+    criteria_updated: int
@@ -11,6 +11,10 @@ class ReleaseStakeholderCreate(BaseModel):
     user_ids: List[int]  # Bulk assign multiple stakeholders
 
 
+class ReleaseStakeholderBulkRemove(BaseModel):
+    user_ids: List[int]  # Bulk remove multiple stakeholders
+
+
 class ReleaseStakeholderResponse(BaseModel):
     id: int
     release_id: int
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 from app.models.signoff import SignOffStatus
 
 
@@ -22,3 +22,24 @@ class SignOffResponse(SignOffBase):
 
     class Config:
         from_attributes = True
+
+
+class SignOffBatchItem(SignOffCreate):
+    criteria_id: int
+
+
+class SignOffBatchCreate(BaseModel):
+    """Sign off many criteria, possibly across releases, in one transaction"""
+    items: List[SignOffBatchItem] = Field(min_length=1, max_length=500)
+
+
+class SignOffBatchItemResult(BaseModel):
+    """Outcome of one item: status_code 201 with the sign-off, or the error the single endpoint would give"""
+    criteria_id: int
+    status_code: int
+    detail: Optional[str] = None
+    sign_off: Optional[SignOffResponse] = None
+
+
+class SignOffBatchResponse(BaseModel):
+    results: List[SignOffBatchItemResult]
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TemplateCriteriaBase(BaseModel):
@@ -48,3 +48,13 @@ class TemplateResponse(TemplateBase):
 
     class Config:
         from_attributes = True
+
+
+class TemplateApply(BaseModel):
+    release_ids: List[int] = Field(min_length=1, max_length=500)
+
+
+class TemplateApplyResponse(BaseModel):
+    """Criteria added per release; releases that already had them all are left out"""
+    criteria_added: int
+    releases_updated: List[int]
@@ -1,3 +1,4 @@
 from app.services.audit import AuditService
+from app.services.user_cache import UserCache, user_cache
 
-__all__ = ["AuditService"]
+__all__ = ["AuditService", "UserCache", "user_cache"]
@@ -1,8 +1,24 @@
-from typing import Optional
+from typing import List, Optional
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.audit import AuditLog
 
 
+def resolve_release_id(
+    entity_type: str,
+    entity_id: int,
+    old_value: Optional[dict] = None,
+    new_value: Optional[dict] = None,
+) -> Optional[int]:
+    """Find the release an audit entry belongs to, if any."""
+    if entity_type == "release":
+        return entity_id
+    for value in (new_value, old_value):
+        if value and value.get("release_id") is not None:
+            return value["release_id"]
+    return None
+
+
 class AuditService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -15,7 +31,10 @@ class AuditService:
         actor_id: Optional[int] = None,
         old_value: Optional[dict] = None,
         new_value: Optional[dict] = None,
+        release_id: Optional[int] = None,
     ):
+        if release_id is None:
+            release_id = resolve_release_id(entity_type, entity_id, old_value, new_value)
         audit_entry = AuditLog(
             entity_type=entity_type,
             entity_id=entity_id,
@@ -23,11 +42,30 @@ class AuditService:
             actor_id=actor_id,
             old_value=old_value,
             new_value=new_value,
+            release_id=release_id,
         )
         self.db.add(audit_entry)
         await self.db.flush()
         return audit_entry
 
+    async def log_many(self, entries: List[dict]) -> None:
+        """
+        Insert many audit entries with a single multi-row INSERT.
+
+        Each entry takes the same keyword arguments as log().
+        """
+        if not entries:
+            return
+        rows = []
+        for entry in entries:
+            row = {"actor_id": None, "old_value": None, "new_value": None, "release_id": None, **entry}
+            if row["release_id"] is None:
+                row["release_id"] = resolve_release_id(
+                    row["entity_type"], row["entity_id"], row["old_value"], row["new_value"]
+                )
+            rows.append(row)
+        await self.db.execute(insert(AuditLog), rows)
+
     async def log_create(
         self,
         entity_type: str,
@@ -0,0 +1,162 @@
+"""
+Stored criteria statuses.
+
+ReleaseCriteria.status is derived from the release's stakeholders and their
+active sign-offs (see app.utils.signoff_logic for the rules). Sign-off writes
+keep it current for the criteria they touch, using computed_criteria_status;
+recompute_criteria_statuses refreshes every criteria of whole releases when
+their stakeholder set changes, with one aggregate query and one bulk update,
+and adjusts the progress counters to match. rebuild_criteria_statuses repairs all releases in batches.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import and_, case, func, select, update, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.release import Release, ReleaseCriteria, CriteriaStatus
+from app.models.release_stakeholder import ReleaseStakeholder
+from app.models.signoff import SignOff, SignOffStatus
+from app.services.progress import adjust_progress_many
+from app.services.versions import bump_release
+from app.utils.signoff_logic import status_from_counts
+
+
+def _sign_off_count(status: SignOffStatus):
+    # Active sign-offs with this status by users assigned to the release
+    return func.count(case((and_(ReleaseStakeholder.id.is_not(None), SignOff.status == status), SignOff.id)))
+
+
+async def recompute_criteria_statuses(
+    db: AsyncSession,
+    release_ids: Iterable[int],
+) -> Dict[int, CriteriaStatus]:
+    """
+    Recompute and store the status of every criteria of one or many releases.
+
+    One aggregate query counts each criteria's stakeholders and their approvals
+    and rejections; criteria whose status changed are written with one bulk
+    UPDATE and the progress counters adjusted by their deltas. Manually BLOCKED
+    criteria are left alone. Runs in the caller's transaction; the caller
+    commits.
+
+    Returns:
+        Dict mapping criteria_id to new status, for criteria whose status changed
+    """
+    changed = await _recompute_by_release(db, release_ids)
+    return {criteria_id: new_status for statuses in changed.values() for criteria_id, new_status in statuses.items()}
+
+
+def _status_counts_query() -> Select:
+    # Each criteria with its stakeholder count and their active approvals and rejections
+    stakeholder_count = (
+        select(func.count(ReleaseStakeholder.id))
+        .where(ReleaseStakeholder.release_id == ReleaseCriteria.release_id)
+        .correlate(ReleaseCriteria)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            ReleaseCriteria.id,
+            ReleaseCriteria.release_id,
+            ReleaseCriteria.is_mandatory,
+            ReleaseCriteria.status,
+            stakeholder_count.label("stakeholders"),
+            _sign_off_count(SignOffStatus.APPROVED).label("approved"),
+            _sign_off_count(SignOffStatus.REJECTED).label("rejected"),
+        )
+        .outerjoin(
+            SignOff,
+            and_(SignOff.criteria_id == ReleaseCriteria.id, SignOff.status != SignOffStatus.REVOKED),
+        )
+        .outerjoin(
+            ReleaseStakeholder,
+            and_(
+                ReleaseStakeholder.release_id == ReleaseCriteria.release_id,
+                ReleaseStakeholder.user_id == SignOff.signed_by_id,
+            ),
+        )
+        .group_by(ReleaseCriteria.id)
+    )
+
+
+async def computed_criteria_status(db: AsyncSession, criteria_id: int) -> CriteriaStatus:
+    """
+    The status one criteria's stakeholders and active sign-offs give it, with
+    the same single aggregate query. Does not store it.
+    """
+    result = await db.execute(_status_counts_query().where(ReleaseCriteria.id == criteria_id))
+    row = result.one()
+    return status_from_counts(row.stakeholders, row.approved, row.rejected)
+
+
+async def _recompute_by_release(
+    db: AsyncSession,
+    release_ids: Iterable[int],
+) -> Dict[int, Dict[int, CriteriaStatus]]:
+    # recompute_criteria_statuses, grouped as release_id -> {criteria_id: new status}
+    release_ids = list(dict.fromkeys(release_ids))
+    if not release_ids:
+        return {}
+
+    result = await db.execute(
+        _status_counts_query()
+        .where(ReleaseCriteria.release_id.in_(release_ids), ReleaseCriteria.status != CriteriaStatus.BLOCKED)
+    )
+
+    changed: Dict[int, Dict[int, CriteriaStatus]] = defaultdict(dict)
+    progress_changes = []
+    for row in result.all():
+        new_status = status_from_counts(row.stakeholders, row.approved, row.rejected)
+        if new_status != row.status:
+            changed[row.release_id][row.id] = new_status
+            progress_changes.append(
+                (row.release_id, (row.is_mandatory, row.status), (row.is_mandatory, new_status))
+            )
+    if changed:
+        await db.execute(
+            update(ReleaseCriteria),
+            [
+                {"id": criteria_id, "status": new_status}
+                for statuses in changed.values()
+                for criteria_id, new_status in statuses.items()
+            ],
+        )
+        await adjust_progress_many(db, progress_changes)
+    return dict(changed)
+
+
+async def rebuild_criteria_statuses(
+    db: AsyncSession,
+    batch_size: int = 500,
+) -> Tuple[int, Dict[int, Dict[int, CriteriaStatus]]]:
+    """
+    Recompute the stored criteria statuses of every release, committing one
+    batch of releases at a time. Only releases whose statuses changed get
+    their revision bumped, so everyone else's cached copies stay valid.
+
+    Returns:
+        Number of releases checked, and release_id -> {criteria_id: new status}
+        for the releases that changed
+    """
+    checked = 0
+    changed_by_release: Dict[int, Dict[int, CriteriaStatus]] = {}
+    last_id = 0
+    while True:
+        # Lock the batch's releases, as sign-off writes do, so none changes underneath
+        result = await db.execute(
+            select(Release.id)
+            .where(Release.id > last_id)
+            .order_by(Release.id)
+            .limit(batch_size)
+            .with_for_update()
+        )
+        release_ids: List[int] = result.scalars().all()
+        if not release_ids:
+            break
+        changed = await _recompute_by_release(db, release_ids)
+        if changed:
+            changed_by_release.update(changed)
+            await bump_release(db, *changed)
+        await db.commit()
+        checked += len(release_ids)
+        last_id = release_ids[-1]
+    return checked, changed_by_release
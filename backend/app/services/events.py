@@ -0,0 +1,325 @@
+"""
+Per-release event bus for live sign-off matrix updates.
+
+Write endpoints publish compact deltas after they commit; the SSE endpoint
+subscribes to one release and forwards them. Delivery goes through a pluggable
+backend so every worker process sees every event:
+
+- LocalEventBackend: in-process only, for a single worker and tests
+- PostgresEventBackend: LISTEN/NOTIFY on a dedicated asyncpg connection
+
+Events are best effort. A subscriber that falls behind gets a single
+"resync" event and should re-fetch the matrix.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Event types pushed to clients
+SIGN_OFF_CREATED = "sign_off.created"
+SIGN_OFF_REVOKED = "sign_off.revoked"
+CRITERIA_STATUS_CHANGED = "criteria.status_changed"
+CRITERIA_ADDED = "criteria.added"
+STAKEHOLDER_ADDED = "stakeholder.added"
+STAKEHOLDER_REMOVED = "stakeholder.removed"
+RESYNC = "resync"
+
+Deliver = Callable[[str], None]
+
+# Keep each message under Postgres' 8000-byte NOTIFY payload limit
+MAX_MESSAGE_BYTES = 7500
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def format_sse(event_type: str, data: dict) -> str:
+    """Encode one Server-Sent Events frame."""
+    payload = json.dumps(data, default=_json_default, separators=(",", ":"))
+    return f"event: {event_type}\ndata: {payload}\n\n"
+
+
+def encode_messages(release_id: int, events: List[dict]) -> List[str]:
+    """Encode events into as few messages as fit under MAX_MESSAGE_BYTES."""
+    prefix = f'{{"release_id":{json.dumps(release_id)},"events":['
+    suffix = "]}"
+    messages: List[str] = []
+    batch: List[str] = []
+    size = len(prefix) + len(suffix)
+    for event in events:
+        encoded = json.dumps(event, default=_json_default, separators=(",", ":"))
+        added = len(encoded.encode()) + (1 if batch else 0)
+        if batch and size + added > MAX_MESSAGE_BYTES:
+            messages.append(prefix + ",".join(batch) + suffix)
+            batch, size = [], len(prefix) + len(suffix)
+            added = len(encoded.encode())
+        batch.append(encoded)
+        size += added
+    if batch:
+        messages.append(prefix + ",".join(batch) + suffix)
+    return messages
+
+
+def sign_off_created(sign_off) -> dict:
+    return {
+        "type": SIGN_OFF_CREATED,
+        "criteria_id": sign_off.criteria_id,
+        "sign_off_id": sign_off.id,
+        "user_id": sign_off.signed_by_id,
+        "status": sign_off.status,
+        "comment": sign_off.comment,
+        "link": sign_off.link,
+        "signed_at": sign_off.signed_at,
+    }
+
+
+def sign_off_revoked(sign_off) -> dict:
+    return {
+        "type": SIGN_OFF_REVOKED,
+        "criteria_id": sign_off.criteria_id,
+        "sign_off_id": sign_off.id,
+        "user_id": sign_off.signed_by_id,
+    }
+
+
+def criteria_status_changed(criteria_id: int, status) -> dict:
+    return {"type": CRITERIA_STATUS_CHANGED, "criteria_id": criteria_id, "status": status}
+
+
+def criteria_added(criteria, status) -> dict:
+    return {
+        "type": CRITERIA_ADDED,
+        "criteria": {
+            "id": criteria.id,
+            "name": criteria.name,
+            "is_mandatory": criteria.is_mandatory,
+            "owner_id": criteria.owner_id,
+            "status": status,
+        },
+    }
+
+
+def stakeholder_added(user) -> dict:
+    return {
+        "type": STAKEHOLDER_ADDED,
+        "user": {"id": user.id, "name": user.name, "email": user.email, "role": user.role},
+    }
+
+
+def stakeholder_removed(user_id: int) -> dict:
+    return {"type": STAKEHOLDER_REMOVED, "user_id": user_id}
+
+
+class EventBackend:
+    """Transport that carries published messages to every worker's bus."""
+
+    async def start(self, deliver: Deliver) -> None:
+        raise NotImplementedError
+
+    async def publish(self, message: str) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        pass
+
+
+class LocalEventBackend(EventBackend):
+    """Delivers straight to this process's subscribers (single worker only)."""
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, message: str) -> None:
+        if self._deliver is not None:
+            self._deliver(message)
+
+
+class PostgresEventBackend(EventBackend):
+    """
+    Fans events out across workers with Postgres LISTEN/NOTIFY.
+
+    Each worker keeps one asyncpg connection that listens on `channel` and is
+    also used, under a lock, to send NOTIFY.
+    """
+
+    def __init__(self, dsn: str, channel: str = "release_events"):
+        self.dsn = dsn
+        self.channel = channel
+        self._conn = None
+        self._deliver: Optional[Deliver] = None
+        self._lock = asyncio.Lock()
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        self._conn = await asyncpg.connect(self.dsn)
+        await self._conn.add_listener(self.channel, self._on_notify)
+        self._conn.add_termination_listener(self._on_terminate)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        if self._deliver is not None:
+            self._deliver(payload)
+
+    def _on_terminate(self, connection) -> None:
+        # Keep listening even on workers that never publish
+        if self._deliver is not None and (self._reconnect_task is None or self._reconnect_task.done()):
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 1.0
+        while self._deliver is not None:
+            try:
+                async with self._lock:
+                    if self._conn is None or self._conn.is_closed():
+                        await self._connect()
+                return
+            except Exception:
+                logger.warning("Event bus listener reconnect failed; retrying in %.0fs", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        async with self._lock:
+            await self._connect()
+
+    async def publish(self, message: str) -> None:
+        async with self._lock:
+            if self._conn is None or self._conn.is_closed():
+                # The listening connection dropped; reconnect and re-LISTEN
+                await self._connect()
+            await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, message)
+
+    async def stop(self) -> None:
+        self._deliver = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        async with self._lock:
+            if self._conn is not None and not self._conn.is_closed():
+                await self._conn.close()
+            self._conn = None
+
+
+class Subscription:
+    """One client's bounded queue of events for a release."""
+
+    def __init__(self, release_id: int, max_queue: int):
+        self.release_id = release_id
+        self._queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=max_queue)
+
+    def push(self, event: dict) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind to replay: drop the backlog and ask for a re-fetch
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait({"type": RESYNC, "release_id": self.release_id})
+
+    async def get(self) -> dict:
+        return await self._queue.get()
+
+
+class EventBus:
+    """In-process fan-out of release events, fed by a cross-worker backend."""
+
+    def __init__(self, backend: EventBackend, max_queue: int = 100):
+        self.backend = backend
+        self.max_queue = max_queue
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._started = False
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    async def _ensure_started(self) -> None:
+        if self._started:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if not self._started:
+                await self.backend.start(self._dispatch)
+                self._started = True
+
+    def _dispatch(self, message: str) -> None:
+        try:
+            payload = json.loads(message)
+            release_id = payload["release_id"]
+            events = payload["events"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed release event message")
+            return
+        for subscription in list(self._subscribers.get(release_id, ())):
+            for event in events:
+                subscription.push(event)
+
+    async def subscribe(self, release_id: int) -> Subscription:
+        await self._ensure_started()
+        subscription = Subscription(release_id, self.max_queue)
+        self._subscribers[release_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.release_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.release_id]
+
+    def subscriber_count(self, release_id: int) -> int:
+        return len(self._subscribers.get(release_id, ()))
+
+    async def publish(self, release_id: int, events: Iterable[dict]) -> None:
+        """
+        Publish deltas for a release. Call after the transaction commits.
+
+        Failures are logged rather than raised: the write has already
+        succeeded and clients recover on their next resync.
+        """
+        events = [{**event, "release_id": release_id} for event in events]
+        if not events:
+            return
+        try:
+            await self._ensure_started()
+            for message in encode_messages(release_id, events):
+                await self.backend.publish(message)
+        except Exception:
+            logger.exception("Failed to publish events for release %s", release_id)
+
+    async def stop(self) -> None:
+        if self._started:
+            await self.backend.stop()
+            self._started = False
+        self._start_lock = None
+
+
+def create_backend(name: str, database_url: str) -> EventBackend:
+    """Build the backend selected by the EVENT_BUS_BACKEND setting."""
+    if name == "local":
+        return LocalEventBackend()
+    if name == "postgres":
+        # asyncpg wants a plain postgresql:// DSN without the SQLAlchemy driver suffix
+        dsn = database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        return PostgresEventBackend(dsn)
+    raise ValueError(f"Unknown event bus backend: {name!r}")
+
+
+_settings = get_settings()
+event_bus = EventBus(
+    create_backend(_settings.event_bus_backend, _settings.database_url),
+    max_queue=_settings.event_queue_size,
+)
@@ -0,0 +1,197 @@
+"""
+Prometheus metrics for HTTP requests and database access.
+
+Request metrics are recorded by app.middleware.metrics.MetricsMiddleware.
+Database metrics come from SQLAlchemy engine hooks installed by
+instrument_engine(), and are also attributed to the request being served
+through a context variable.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty,
+writable directory before the workers start. Each worker then writes its
+samples there and /metrics aggregates all of them.
+"""
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233)
+DB_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "http_request_db_statements",
+    "SQL statements issued while serving a request.",
+    ["method", "route"],
+    buckets=STATEMENT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL while serving a request.",
+    ["method", "route"],
+    buckets=DB_TIME_BUCKETS,
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Duration of individual SQL statements by operation.",
+    ["operation"],
+    buckets=DB_TIME_BUCKETS,
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    buckets=DB_TIME_BUCKETS,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Pooled connections currently in use.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_connections_max",
+    "Most connections the pool hands out at once (pool size plus overflow).",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up because no connection became free in time.",
+)
+DB_WRITE_QUEUE_WAIT = Histogram(
+    "db_write_queue_wait_seconds",
+    "Time write requests spent queued for the single SQLite writer.",
+    buckets=DB_TIME_BUCKETS,
+)
+
+
+@dataclass
+class RequestDbStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# DB usage of the request being served in the current task, if any
+current_request_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("current_request_stats", default=None)
+
+# Set on each statement's execution context, so a statement that raises
+# leaves nothing behind on the connection
+_QUERY_START_ATTR = "_metrics_query_start"
+
+
+def statement_operation(statement: str) -> str:
+    """Low-cardinality label for a statement: its leading keyword."""
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        setattr(context, _QUERY_START_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, _QUERY_START_ATTR, None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    DB_STATEMENT_DURATION.labels(statement_operation(statement)).observe(elapsed)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def instrument_engine(engine: AsyncEngine, pool_capacity: Optional[int] = None) -> None:
+    """
+    Install statement timing and pool checkout hooks on an engine (idempotent).
+    Saturation is db_pool_connections_checked_out / db_pool_connections_max;
+    each instrumented engine adds its `pool_capacity` (if bounded) to the latter.
+    """
+    sync_engine = engine.sync_engine
+    if getattr(sync_engine, "_metrics_instrumented", False):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    # Pool events registered on the engine carry over to pools made by dispose()
+    event.listen(sync_engine, "checkout", _on_checkout)
+    event.listen(sync_engine, "checkin", _on_checkin)
+    if pool_capacity is not None:
+        DB_POOL_CAPACITY.inc(pool_capacity)
+
+    # Every Connection checks out through Engine.raw_connection(); wrapping the
+    # engine (rather than the pool) survives engine.dispose() replacing the pool
+    raw_connection = sync_engine.raw_connection
+
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+    sync_engine.raw_connection = timed_raw_connection
+    sync_engine._metrics_instrumented = True
+
+
+def instrument_writer_queue(queue) -> None:
+    """Record how long writers wait for their turn in an app.database.WriterQueue."""
+    queue.on_wait = DB_WRITE_QUEUE_WAIT.observe
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Current metrics in Prometheus text format, aggregated across workers if configured."""
+    if os.environ.get(MULTIPROC_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: Optional[int] = None) -> None:
+    """Drop a finished worker's live gauges from the multiprocess directory."""
+    if os.environ.get(MULTIPROC_ENV):
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,119 @@
+"""
+Set-based product permission changes.
+
+Grants and revokes are single INSERT ... SELECT ... WHERE NOT EXISTS / DELETE
+statements over the product x user cross product, and the deprecated
+User.role field is recomputed for every affected user in one UPDATE.
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import select, insert, delete, update, case, exists, literal, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.product import Product
+from app.models.product_permission import ProductPermission
+from app.models.user import User, UserRole
+from app.services.user_cache import user_cache
+from app.services.versions import PRODUCTS, bump_collection, bump_user_releases
+
+
+async def grant_permissions(
+    db: AsyncSession,
+    user_ids: Sequence[int],
+    granted_by_id: int,
+    product_ids: Optional[Sequence[int]] = None,
+    permission_type: str = "product_owner",
+) -> List[ProductPermission]:
+    """
+    Grant every user in `user_ids` a permission on every product in
+    `product_ids` (all products if None), skipping pairs that already exist.
+
+    Returns the created permissions. Does not sync roles or commit.
+    """
+    if not user_ids or (product_ids is not None and not product_ids):
+        return []
+    already_granted = exists().where(
+        ProductPermission.product_id == Product.id,
+        ProductPermission.user_id == User.id,
+    )
+    pairs = (
+        select(
+            Product.id,
+            User.id,
+            literal(permission_type, ProductPermission.permission_type.type),
+            literal(granted_by_id, ProductPermission.granted_by_id.type),
+            literal(datetime.utcnow(), ProductPermission.granted_at.type),
+        )
+        # Every product x user pair, minus those already granted
+        .select_from(Product)
+        .join(User, true())
+        .where(User.id.in_(user_ids), ~already_granted)
+    )
+    if product_ids is not None:
+        pairs = pairs.where(Product.id.in_(product_ids))
+    result = await db.scalars(
+        insert(ProductPermission)
+        .from_select(
+            ["product_id", "user_id", "permission_type", "granted_by_id", "granted_at"],
+            pairs,
+        )
+        .returning(ProductPermission)
+    )
+    created = result.all()
+    if created:
+        await bump_collection(db, PRODUCTS)
+    return created
+
+
+async def revoke_permissions(
+    db: AsyncSession,
+    user_ids: Sequence[int],
+    product_ids: Optional[Sequence[int]] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Delete the permissions of `user_ids` on `product_ids` (all products if None).
+
+    Returns the deleted (product_id, user_id) pairs. Does not sync roles or commit.
+    """
+    if not user_ids or (product_ids is not None and not product_ids):
+        return []
+    stmt = delete(ProductPermission).where(ProductPermission.user_id.in_(user_ids))
+    if product_ids is not None:
+        stmt = stmt.where(ProductPermission.product_id.in_(product_ids))
+    result = await db.execute(
+        stmt.returning(ProductPermission.product_id, ProductPermission.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = [tuple(row) for row in result.all()]
+    if deleted:
+        await bump_collection(db, PRODUCTS)
+    return deleted
+
+
+async def sync_roles(db: AsyncSession, user_ids: Iterable[int]) -> None:
+    """
+    Recompute the deprecated role field for many users in one UPDATE.
+
+    Same rules as User.sync_role_from_permissions: admins are ADMIN, users with
+    any product permission PRODUCT_OWNER, everyone else STAKEHOLDER. Cached
+    identities of the users are dropped once the caller commits.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return
+    role_type = User.role.type
+    has_permission = exists().where(ProductPermission.user_id == User.id)
+    await db.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(
+            role=case(
+                (User.is_admin == True, literal(UserRole.ADMIN, role_type)),
+                (has_permission, literal(UserRole.PRODUCT_OWNER, role_type)),
+                else_=literal(UserRole.STAKEHOLDER, role_type),
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+    # Stakeholder roles are shown on the release detail and sign-off matrix
+    await bump_user_releases(db, user_ids)
+    user_cache.invalidate_on_commit(db, *user_ids)
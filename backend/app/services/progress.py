@@ -0,0 +1,139 @@
+"""
+Materialized per-release progress counters.
+
+Release.mandatory_total / mandatory_approved / optional_total / optional_approved
+mirror the release's criteria and their stored status. Write paths adjust them
+in the same transaction with a single atomic UPDATE; recompute_progress rebuilds
+them from release_criteria for consistency repair.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import bindparam, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.release import Release, ReleaseCriteria, CriteriaStatus
+
+# (is_mandatory, status) of a criteria, or None if it doesn't exist
+CriteriaState = Optional[Tuple[bool, CriteriaStatus]]
+
+
+def _counts(state: CriteriaState) -> Dict[str, int]:
+    counts = {
+        "mandatory_total": 0,
+        "mandatory_approved": 0,
+        "optional_total": 0,
+        "optional_approved": 0,
+    }
+    if state is not None:
+        is_mandatory, status = state
+        prefix = "mandatory" if is_mandatory else "optional"
+        counts[f"{prefix}_total"] = 1
+        counts[f"{prefix}_approved"] = 1 if status == CriteriaStatus.APPROVED else 0
+    return counts
+
+
+async def adjust_progress(
+    db: AsyncSession,
+    release_id: int,
+    before: CriteriaState,
+    after: CriteriaState,
+) -> None:
+    """
+    Apply the counter change for one criteria going from `before` to `after`.
+
+    Use before=None for an added criteria and after=None for a deleted one.
+    Issues nothing if the counters are unaffected.
+    """
+    old, new = _counts(before), _counts(after)
+    deltas = {name: new[name] - old[name] for name in old if new[name] != old[name]}
+    if not deltas:
+        return
+    await db.execute(
+        update(Release)
+        .where(Release.id == release_id)
+        .values({getattr(Release, name): getattr(Release, name) + delta for name, delta in deltas.items()})
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def adjust_progress_many(
+    db: AsyncSession,
+    changes: Iterable[Tuple[int, CriteriaState, CriteriaState]],
+) -> None:
+    """
+    Apply adjust_progress() for many (release_id, before, after) changes,
+    possibly across releases, with one executemany UPDATE.
+    """
+    deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(_counts(None), 0))
+    for release_id, before, after in changes:
+        old, new = _counts(before), _counts(after)
+        for name in old:
+            deltas[release_id][name] += new[name] - old[name]
+    rows = [
+        {"release_id": release_id, **{f"d_{name}": delta for name, delta in release_deltas.items()}}
+        for release_id, release_deltas in deltas.items()
+        if any(release_deltas.values())
+    ]
+    if not rows:
+        return
+    table = Release.__table__
+    await db.execute(
+        update(table)
+        .where(table.c.id == bindparam("release_id"))
+        .values({name: table.c[name] + bindparam(f"d_{name}") for name in _counts(None)}),
+        rows,
+    )
+
+
+def progress_from_counters(release: Release) -> dict:
+    """Build the progress payload from a release's stored counters."""
+    mandatory_total = release.mandatory_total or 0
+    mandatory_approved = release.mandatory_approved or 0
+    optional_total = release.optional_total or 0
+    optional_approved = release.optional_approved or 0
+    return {
+        "mandatory_total": mandatory_total,
+        "mandatory_approved": mandatory_approved,
+        "mandatory_percent": (mandatory_approved / mandatory_total * 100) if mandatory_total else 100,
+        "optional_total": optional_total,
+        "optional_approved": optional_approved,
+        "optional_percent": (optional_approved / optional_total * 100) if optional_total else 100,
+        "all_mandatory_approved": mandatory_approved == mandatory_total,
+    }
+
+
+def _count_where(*conditions):
+    return (
+        select(func.count(ReleaseCriteria.id))
+        .where(ReleaseCriteria.release_id == Release.id, *conditions)
+        .correlate(Release)
+        .scalar_subquery()
+    )
+
+
+async def recompute_progress(
+    db: AsyncSession,
+    release_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Rebuild the counters from release_criteria in one UPDATE.
+
+    Args:
+        release_ids: Releases to repair; all releases if None
+
+    Returns:
+        Number of releases updated
+    """
+    approved = ReleaseCriteria.status == CriteriaStatus.APPROVED
+    stmt = update(Release).values(
+        mandatory_total=_count_where(ReleaseCriteria.is_mandatory == True),
+        mandatory_approved=_count_where(ReleaseCriteria.is_mandatory == True, approved),
+        optional_total=_count_where(ReleaseCriteria.is_mandatory == False),
+        optional_approved=_count_where(ReleaseCriteria.is_mandatory == False, approved),
+    )
+    if release_ids is not None:
+        release_ids = list(release_ids)
+        if not release_ids:
+            return 0
+        stmt = stmt.where(Release.id.in_(release_ids))
+    result = await db.execute(stmt.execution_options(synchronize_session=False))
+    return result.rowcount
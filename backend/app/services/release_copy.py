@@ -0,0 +1,150 @@
+"""
+Set-based copying into releases.
+
+Instantiating a template (creating a release from it, or applying it to many
+releases at once) and cloning a release copy their criteria and stakeholders
+with INSERT ... SELECT, so the rows never travel through Python and each copy
+is one statement however many criteria, stakeholders or target releases are
+involved. Copied criteria start PENDING; the inserted rows come back through
+RETURNING for the caller's progress counters and audit entries.
+"""
+from datetime import datetime
+from typing import Iterable, List
+from sqlalchemy import Row, Select, exists, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.models.release import Release, ReleaseCriteria, CriteriaStatus
+from app.models.release_stakeholder import ReleaseStakeholder
+from app.models.template import TemplateCriteria
+from app.utils.criteria_order import criteria_sort_key_sql
+
+# Columns filled by the criteria copies, in the order of their SELECTs
+_CRITERIA_COLUMNS = [
+    "release_id", "name", "description", "is_mandatory", "owner_id", "order",
+    "status", "sort_key", "created_at", "updated_at",
+]
+# What the copies return for each inserted criteria
+CRITERIA_RETURNING = (
+    ReleaseCriteria.id,
+    ReleaseCriteria.release_id,
+    ReleaseCriteria.name,
+    ReleaseCriteria.is_mandatory,
+    ReleaseCriteria.owner_id,
+)
+
+
+async def _insert_criteria(db: AsyncSession, rows: Select) -> List[Row]:
+    result = await db.execute(
+        insert(ReleaseCriteria)
+        .from_select(_CRITERIA_COLUMNS, rows, include_defaults=False)
+        .returning(*CRITERIA_RETURNING)
+    )
+    return result.all()
+
+
+def _pending(now: datetime) -> tuple:
+    return (
+        literal(CriteriaStatus.PENDING, ReleaseCriteria.status.type),
+        literal(now, ReleaseCriteria.created_at.type),
+        literal(now, ReleaseCriteria.updated_at.type),
+    )
+
+
+async def instantiate_template(
+    db: AsyncSession,
+    template_id: int,
+    release_ids: Iterable[int],
+    skip_existing: bool = False,
+) -> List[Row]:
+    """
+    Copy a template's criteria into one or many releases in one statement.
+
+    Args:
+        skip_existing: Leave out criteria a release already has by name, so
+            applying a template again adds only what is missing
+
+    Returns:
+        The inserted criteria (CRITERIA_RETURNING columns)
+    """
+    release_ids = list(dict.fromkeys(release_ids))
+    if not release_ids:
+        return []
+    status, created_at, updated_at = _pending(datetime.utcnow())
+    rows = (
+        select(
+            Release.id,
+            TemplateCriteria.name,
+            TemplateCriteria.description,
+            TemplateCriteria.is_mandatory,
+            TemplateCriteria.default_owner_id,
+            TemplateCriteria.order,
+            status,
+            criteria_sort_key_sql(TemplateCriteria.name),
+            created_at,
+            updated_at,
+        )
+        .select_from(TemplateCriteria)
+        .join(Release, Release.id.in_(release_ids))
+        .where(TemplateCriteria.template_id == template_id)
+        .order_by(Release.id, TemplateCriteria.order, TemplateCriteria.id)
+    )
+    if skip_existing:
+        existing = aliased(ReleaseCriteria)
+        rows = rows.where(
+            ~exists().where(existing.release_id == Release.id, existing.name == TemplateCriteria.name)
+        )
+    return await _insert_criteria(db, rows)
+
+
+async def clone_criteria(db: AsyncSession, source_release_id: int, release_id: int) -> List[Row]:
+    """
+    Copy a release's criteria, with their owners and order, into another
+    release in one statement. Sign-offs are not copied.
+
+    Returns:
+        The inserted criteria (CRITERIA_RETURNING columns)
+    """
+    status, created_at, updated_at = _pending(datetime.utcnow())
+    rows = (
+        select(
+            literal(release_id, ReleaseCriteria.release_id.type),
+            ReleaseCriteria.name,
+            ReleaseCriteria.description,
+            ReleaseCriteria.is_mandatory,
+            ReleaseCriteria.owner_id,
+            ReleaseCriteria.order,
+            status,
+            ReleaseCriteria.sort_key,
+            created_at,
+            updated_at,
+        )
+        .where(ReleaseCriteria.release_id == source_release_id)
+        .order_by(ReleaseCriteria.sort_key, ReleaseCriteria.id)
+    )
+    return await _insert_criteria(db, rows)
+
+
+async def clone_stakeholders(db: AsyncSession, source_release_id: int, release_id: int) -> List[int]:
+    """
+    Assign a release's stakeholders to another release in one statement.
+    Assignment times are carried over, so they list in the same order.
+
+    Returns:
+        The user ids assigned
+    """
+    result = await db.execute(
+        insert(ReleaseStakeholder)
+        .from_select(
+            ["release_id", "user_id", "assigned_at"],
+            select(
+                literal(release_id, ReleaseStakeholder.release_id.type),
+                ReleaseStakeholder.user_id,
+                ReleaseStakeholder.assigned_at,
+            )
+            .where(ReleaseStakeholder.release_id == source_release_id)
+            .order_by(ReleaseStakeholder.id),
+            include_defaults=False,
+        )
+        .returning(ReleaseStakeholder.user_id)
+    )
+    return result.scalars().all()
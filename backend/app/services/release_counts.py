@@ -0,0 +1,98 @@
+"""
+Materialized per-product release counts by status.
+
+Product.draft_releases / in_review_releases / approved_releases /
+released_releases / cancelled_releases count the product's non-deleted releases
+in each status. Release create, status change and delete adjust them in the same
+transaction with a single atomic UPDATE, so the dashboard summary totals are one
+aggregate over the counter columns: O(products) rather than O(releases), and
+without a global totals row that concurrent release writes would contend on. recompute_release_counts rebuilds them for
+consistency repair.
+"""
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.product import Product
+from app.models.release import Release, ReleaseStatus
+
+# Counter column on products for each release status
+STATUS_COLUMNS: Dict[ReleaseStatus, str] = {
+    ReleaseStatus.DRAFT: "draft_releases",
+    ReleaseStatus.IN_REVIEW: "in_review_releases",
+    ReleaseStatus.APPROVED: "approved_releases",
+    ReleaseStatus.RELEASED: "released_releases",
+    ReleaseStatus.CANCELLED: "cancelled_releases",
+}
+
+
+async def adjust_release_counts(
+    db: AsyncSession,
+    product_id: int,
+    before: Optional[ReleaseStatus],
+    after: Optional[ReleaseStatus],
+) -> None:
+    """
+    Apply the counter change for one release going from `before` to `after`.
+
+    Use before=None for a created release and after=None for a deleted one.
+    Issues nothing if the status is unchanged.
+    """
+    if before == after:
+        return
+    # Counts are bookkeeping, not an edit of the product
+    values = {Product.updated_at: Product.updated_at}
+    if before is not None:
+        column = getattr(Product, STATUS_COLUMNS[before])
+        values[column] = column - 1
+    if after is not None:
+        column = getattr(Product, STATUS_COLUMNS[after])
+        values[column] = column + 1
+    await db.execute(
+        update(Product)
+        .where(Product.id == product_id)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def counts_from_product(product) -> Dict[str, int]:
+    """Status -> release count from a product row (ORM object or Core row)."""
+    return {status.value: getattr(product, column) or 0 for status, column in STATUS_COLUMNS.items()}
+
+
+def _count_where(release_status: ReleaseStatus):
+    return (
+        select(func.count(Release.id))
+        .where(
+            Release.product_id == Product.id,
+            Release.is_deleted == False,
+            Release.status == release_status,
+        )
+        .correlate(Product)
+        .scalar_subquery()
+    )
+
+
+async def recompute_release_counts(
+    db: AsyncSession,
+    product_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Rebuild the counters from releases in one UPDATE.
+
+    Args:
+        product_ids: Products to repair; all products if None
+
+    Returns:
+        Number of products updated
+    """
+    values = {getattr(Product, column): _count_where(status) for status, column in STATUS_COLUMNS.items()}
+    values[Product.updated_at] = Product.updated_at
+    stmt = update(Product).values(values)
+    if product_ids is not None:
+        product_ids = list(product_ids)
+        if not product_ids:
+            return 0
+        stmt = stmt.where(Product.id.in_(product_ids))
+    result = await db.execute(stmt.execution_options(synchronize_session=False))
+    return result.rowcount
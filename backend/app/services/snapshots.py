@@ -0,0 +1,85 @@
+"""
+Frozen response bodies for finished releases.
+
+Once a release is RELEASED or CANCELLED its detail and sign-off matrix stop
+changing in practice, so their serialized JSON is stored in release_snapshots
+and served as-is instead of being rebuilt from four tables on every view.
+Snapshots are written when update_release moves a release into a final status,
+and filled on first view for releases that got there before snapshots existed.
+
+A snapshot is tagged with the Release.revision it was built from and only
+served while that still matches. Any later write bumps the revision (see
+app.services.versions), so stale bodies are never sent and the next view of a
+finished release rebuilds them. For the same reason the bodies are sent with
+the usual revalidating Cache-Control rather than a long max-age: finished
+releases can still be edited (target date, criteria), and a browser holding a
+copy that is fresh for a year would never see it.
+"""
+from typing import Dict
+from sqlalchemy import select, delete, insert, and_, Select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import writer_queue
+from app.models.release import Release, ReleaseStatus
+from app.models.release_snapshot import ReleaseSnapshot
+
+# Views that get snapshots (also the ETag kinds of their endpoints)
+RELEASE = "release"
+MATRIX = "matrix"
+
+FROZEN_STATUSES = frozenset({ReleaseStatus.RELEASED, ReleaseStatus.CANCELLED})
+
+
+def snapshot_query(release_id: int, kind: str) -> Select:
+    """
+    Release revision and status plus the body of its current `kind` snapshot
+    (None if there is none for this revision), in one query.
+    """
+    return (
+        select(Release.revision, Release.status, ReleaseSnapshot.body)
+        .outerjoin(
+            ReleaseSnapshot,
+            and_(
+                ReleaseSnapshot.release_id == Release.id,
+                ReleaseSnapshot.kind == kind,
+                ReleaseSnapshot.revision == Release.revision,
+            ),
+        )
+        .where(Release.id == release_id)
+    )
+
+
+async def store_snapshots(
+    db: AsyncSession,
+    release_id: int,
+    revision: int,
+    bodies: Dict[str, bytes],
+) -> None:
+    """Replace the release's snapshots of the given kinds with encoded JSON bodies. Does not commit."""
+    await db.execute(
+        delete(ReleaseSnapshot)
+        .where(ReleaseSnapshot.release_id == release_id, ReleaseSnapshot.kind.in_(list(bodies)))
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        insert(ReleaseSnapshot),
+        [
+            {"release_id": release_id, "kind": kind, "revision": revision, "body": body.decode()}
+            for kind, body in bodies.items()
+        ],
+    )
+
+
+async def fill_snapshot(db: AsyncSession, release_id: int, kind: str, revision: int, body: bytes) -> None:
+    """
+    Store a snapshot built by a read and commit it, taking a turn in the writer
+    queue like write requests do. The snapshot is only a shortcut: a concurrent
+    reader filling it first, or a database too busy to take the write, is not
+    an error for the read.
+    """
+    try:
+        async with writer_queue.turn():
+            await store_snapshots(db, release_id, revision, {kind: body})
+            await db.commit()
+    except (IntegrityError, OperationalError):
+        await db.rollback()
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.user import User
+from app.models.product_permission import ProductPermission
+
+
+class UserCache:
+    """
+    Bounded TTL/LRU cache of resolved user identities, per process.
+
+    Stores each user's column values and the product ids they own, so
+    get_current_user can skip the users/product_permissions queries on hot
+    paths. Write paths that change a user or their permissions must call
+    invalidate() after their commit, or invalidate_on_commit() from inside
+    the transaction; dropping an entry before the commit lets a concurrent
+    request cache the old row again. The TTL bounds staleness across worker
+    processes, which each keep their own cache.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, Dict[str, Any], Tuple[int, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, user_id: int) -> Optional[User]:
+        """Return a detached User built from the cache, or None on a miss."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, columns, product_ids = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+
+        user = User(**columns)
+        user.product_permissions = [
+            ProductPermission(product_id=product_id, user_id=user_id)
+            for product_id in product_ids
+        ]
+        return user
+
+    def put(self, user: User) -> None:
+        """Cache a user whose product_permissions relationship is loaded."""
+        if not self.enabled:
+            return
+        columns = {c.key: getattr(user, c.key) for c in User.__mapper__.column_attrs}
+        product_ids = tuple(p.product_id for p in user.product_permissions)
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, columns, product_ids)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids: int) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def invalidate_on_commit(self, session, *user_ids: int) -> None:
+        """Invalidate the users once `session` commits; a rollback discards the request."""
+        sync_session = getattr(session, "sync_session", session)
+        pending = sync_session.info.setdefault(_PENDING_INVALIDATIONS, {})
+        pending.setdefault(self, set()).update(user_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_PENDING_INVALIDATIONS = "user_cache_pending_invalidations"
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for cache, user_ids in session.info.pop(_PENDING_INVALIDATIONS, {}).items():
+        cache.invalidate(*user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+_settings = get_settings()
+user_cache = UserCache(
+    max_entries=_settings.user_cache_max_entries,
+    ttl_seconds=_settings.user_cache_ttl_seconds,
+)
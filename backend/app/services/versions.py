@@ -0,0 +1,69 @@
+"""
+Change counters backing conditional GETs.
+
+Release.revision changes whenever anything shown by the release detail or
+sign-off matrix changes: the release itself, its criteria, sign-offs and
+stakeholders, and the names and roles of those stakeholders. Collection
+counters do the same for whole lists (products, templates). Write paths bump
+them in the same transaction, so a reader can compare one integer instead of
+loading the object graph.
+"""
+from typing import Iterable
+from sqlalchemy import select, update, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.collection_version import CollectionVersion
+from app.models.release import Release
+from app.models.release_stakeholder import ReleaseStakeholder
+
+# Collection names
+PRODUCTS = "products"
+TEMPLATES = "templates"
+
+
+async def bump_release(db: AsyncSession, *release_ids: int) -> None:
+    """Mark releases as changed (leaves updated_at alone)."""
+    release_ids = list(dict.fromkeys(release_ids))
+    if not release_ids:
+        return
+    await db.execute(
+        update(Release)
+        .where(Release.id.in_(release_ids))
+        .values(revision=Release.revision + 1, updated_at=Release.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def bump_user_releases(db: AsyncSession, user_ids: Iterable[int]) -> None:
+    """Mark every release the users are stakeholders on as changed."""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return
+    await db.execute(
+        update(Release)
+        .where(
+            Release.id.in_(
+                select(ReleaseStakeholder.release_id).where(ReleaseStakeholder.user_id.in_(user_ids))
+            )
+        )
+        .values(revision=Release.revision + 1, updated_at=Release.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def bump_collection(db: AsyncSession, name: str) -> None:
+    """Mark a collection as changed, creating its counter on first use."""
+    result = await db.execute(
+        update(CollectionVersion)
+        .where(CollectionVersion.name == name)
+        .values(revision=CollectionVersion.revision + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        await db.execute(insert(CollectionVersion).values(name=name, revision=1))
+
+
+async def collection_version(db: AsyncSession, name: str) -> int:
+    result = await db.execute(
+        select(CollectionVersion.revision).where(CollectionVersion.name == name)
+    )
+    return result.scalar_one_or_none() or 0
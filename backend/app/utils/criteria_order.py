@@ -0,0 +1,71 @@
+"""
+Canonical display order of release criteria.
+
+Predefined criteria come first, in PREDEFINED_CRITERIA_ORDER; custom criteria
+follow, alphabetically. The order is stored as ReleaseCriteria.sort_key (kept
+in step with the name by the model), so readers can ORDER BY (sort_key, id)
+and the (release_id, sort_key) index returns a release's criteria already
+sorted.
+"""
+from sqlalchemy import String, case, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+
+PREDEFINED_CRITERIA_ORDER = [
+    "Content Review",
+    "Bug Verification",
+    "Smoke & Extended Smoke Regression",
+    "Full Regression",
+    "CPT Sign-off",
+    "Pre-Prod Monitoring incl. Crash Analysis",
+    "Production Monitoring",
+    "Security Audit",
+]
+
+_PREDEFINED_KEYS = {name: f"0:{index:02d}" for index, name in enumerate(PREDEFINED_CRITERIA_ORDER)}
+_CUSTOM_PREFIX = "1:"
+
+# Python's str.lower, registered on SQLite connections under this name by
+# app.database.register_sqlite_functions; SQLite's own lower() folds ASCII only
+SQLITE_LOWER_FUNCTION = "py_lower"
+# PostgreSQL folds case by the collation's rules; ICU's root locale folds all
+# of Unicode like str.lower (bar a few full case mappings such as "İ"),
+# whatever the database's default collation is
+POSTGRESQL_LOWER_COLLATION = "und-x-icu"
+
+
+class unicode_lower(FunctionElement):
+    """lower() that folds non-ASCII letters the way str.lower() does, on SQLite and PostgreSQL."""
+    type = String()
+    name = "unicode_lower"
+    inherit_cache = True
+
+
+@compiles(unicode_lower)
+def _compile_unicode_lower(element, compiler, **kw):
+    return f"lower({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(unicode_lower, "sqlite")
+def _compile_unicode_lower_sqlite(element, compiler, **kw):
+    return f"{SQLITE_LOWER_FUNCTION}({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(unicode_lower, "postgresql")
+def _compile_unicode_lower_postgresql(element, compiler, **kw):
+    return f'lower(({compiler.process(element.clauses, **kw)}) COLLATE "{POSTGRESQL_LOWER_COLLATION}")'
+
+
+def criteria_sort_key(name: str) -> str:
+    """The sort_key of a criteria named `name`."""
+    return _PREDEFINED_KEYS.get(name) or _CUSTOM_PREFIX + name.lower()
+
+
+def criteria_sort_key_sql(name: ColumnElement) -> ColumnElement:
+    """
+    criteria_sort_key() as a SQL expression, for INSERT ... SELECT and backfills.
+
+    Matches the Python key for non-ASCII names too, through unicode_lower.
+    """
+    return case(_PREDEFINED_KEYS, value=name, else_=literal(_CUSTOM_PREFIX) + unicode_lower(name))
@@ -0,0 +1,43 @@
+# Conditional GET helpers (ETag / If-None-Match)
+from typing import Optional
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """Weak entity tag from a resource kind and its version numbers."""
+    return 'W/"' + "-".join(str(p) for p in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match lists `etag` (compared weakly) or is "*"."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """
+    Tag a response. Cache-Control: no-cache lets browsers keep the payload but
+    revalidate it on every use, which turns polling into cheap conditional requests.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Set the ETag header on `response` and, if the client already has this
+    version, return the 304 response the endpoint should send instead.
+    """
+    set_etag(response, etag)
+    if etag_matches(request, etag):
+        cached = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        set_etag(cached, etag)
+        return cached
+    return None
@@ -0,0 +1,24 @@
+# Fast JSON encoding for read endpoints that build plain dicts
+from typing import Any, Optional, Union
+import orjson
+from fastapi import Response
+from app.utils.etag import set_etag
+
+
+def dumps(payload: Any) -> bytes:
+    """
+    Encode plain dicts and lists with orjson. Datetimes, dates and enums come
+    out the same as from the pydantic response models (ISO 8601, enum values).
+    """
+    return orjson.dumps(payload)
+
+
+def json_response(content: Union[bytes, str], etag: Optional[str] = None, status_code: int = 200) -> Response:
+    """
+    Send an already encoded body. Returning a Response skips the endpoint's
+    response_model and status_code, which then only document the response.
+    """
+    response = Response(content=content, status_code=status_code, media_type="application/json")
+    if etag:
+        set_etag(response, etag)
+    return response
@@ -0,0 +1,136 @@
+# Google ID token verification without blocking the event loop
+import asyncio
+import re
+import time
+from typing import Dict, Optional
+import httpx
+from google.auth import jwt as google_jwt
+from app.config import get_settings
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleCertsUnavailableError(Exception):
+    """Raised when Google's signing certificates cannot be fetched and none are cached."""
+
+
+def cache_lifetime(headers: httpx.Headers, default: float) -> float:
+    """Seconds a certs response may be cached, from Cache-Control max-age minus Age."""
+    match = _MAX_AGE_RE.search(headers.get("cache-control", ""))
+    if not match:
+        return default
+    try:
+        age = int(headers.get("age", "0"))
+    except ValueError:
+        age = 0
+    return max(int(match.group(1)) - age, 0)
+
+
+class GoogleTokenVerifier:
+    """
+    Verifies Google ID tokens against an in-memory copy of Google's signing certs.
+
+    Certs are cached for as long as their Cache-Control headers allow and are
+    refreshed in the background shortly before they expire, so logins only wait
+    on the network when the cache is empty or fully expired. Concurrent logins
+    share a single fetch. The signature check itself runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        certs_url: str,
+        default_ttl: float = 300.0,
+        refresh_margin: float = 60.0,
+        timeout: float = 5.0,
+        min_refetch_interval: float = 30.0,
+    ):
+        self.certs_url = certs_url
+        self.default_ttl = default_ttl
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.min_refetch_interval = min_refetch_interval
+        self._certs: Optional[Dict[str, str]] = None
+        self._expires_at = 0.0
+        self._fetched_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def _fetch(self) -> None:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(self.certs_url)
+            response.raise_for_status()
+        self._certs = response.json()
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + cache_lifetime(response.headers, self.default_ttl)
+
+    async def _refresh(self, force: bool = False) -> None:
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            now = time.monotonic()
+            if force:
+                if now - self._fetched_at < self.min_refetch_interval:
+                    return
+            elif self._certs is not None and now < self._expires_at - self.refresh_margin:
+                return
+            await self._fetch()
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self._refresh()
+        except (httpx.HTTPError, ValueError):
+            # Keep serving the cached certs; the next request retries
+            pass
+
+    async def get_certs(self) -> Dict[str, str]:
+        now = time.monotonic()
+        if self._certs is None or now >= self._expires_at:
+            try:
+                await self._refresh()
+            except (httpx.HTTPError, ValueError) as e:
+                raise GoogleCertsUnavailableError(str(e)) from e
+        elif now >= self._expires_at - self.refresh_margin:
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._background_refresh())
+        return self._certs
+
+    async def verify(self, token: str, audience: str) -> dict:
+        """
+        Verify a Google ID token and return its claims.
+
+        Raises:
+            ValueError: If the token is invalid, expired, for another audience,
+                or signed with an unknown key
+            GoogleCertsUnavailableError: If no signing certs are available
+        """
+        certs = await self.get_certs()
+        try:
+            idinfo = await asyncio.to_thread(google_jwt.decode, token, certs=certs, audience=audience)
+        except ValueError as e:
+            # Google may have rotated keys since our copy; retry once with fresh
+            # certs, but don't let a stream of bogus key ids hammer the endpoint
+            if "Certificate for key id" not in str(e):
+                raise
+            if time.monotonic() - self._fetched_at < self.min_refetch_interval:
+                raise
+            try:
+                await self._refresh(force=True)
+            except (httpx.HTTPError, ValueError):
+                raise e
+            idinfo = await asyncio.to_thread(google_jwt.decode, token, certs=self._certs, audience=audience)
+
+        if idinfo.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer. 'iss' should be one of the following: {list(GOOGLE_ISSUERS)}")
+        return idinfo
+
+
+_verifier: Optional[GoogleTokenVerifier] = None
+
+
+def get_google_token_verifier() -> GoogleTokenVerifier:
+    """Process-wide verifier, so every login shares one certs cache."""
+    global _verifier
+    if _verifier is None:
+        _verifier = GoogleTokenVerifier(get_settings().google_certs_url)
+    return _verifier
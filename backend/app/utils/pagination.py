@@ -0,0 +1,83 @@
+# Keyset (cursor) pagination helpers
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Optional, Sequence, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+# Response header carrying the opaque token for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page as an opaque token."""
+    payload = [v.isoformat() if isinstance(v, date) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, *types: type) -> Optional[Tuple[Any, ...]]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Each value is converted to the matching entry of `types` (datetime, date, int or str).
+    Returns None if the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            return None
+        values = []
+        for value, value_type in zip(payload, types):
+            if value_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif value_type is date:
+                values.append(date.fromisoformat(value))
+            else:
+                values.append(value_type(value))
+        return tuple(values)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_cursor(token: Optional[str], *types: type) -> Optional[Tuple[Any, ...]]:
+    """Decode an optional cursor query parameter, rejecting malformed tokens with 400."""
+    if token is None:
+        return None
+    values = decode_cursor(token, *types)
+    if values is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+    return values
+
+
+def apply_keyset(
+    query: Select,
+    columns: Sequence[ColumnElement],
+    cursor_values: Optional[Tuple[Any, ...]],
+    descending: bool = False,
+) -> Select:
+    """
+    Order a query by `columns` and, if a cursor is given, start after it.
+
+    The last column must be unique (normally the primary key) so rows with
+    equal sort values are neither skipped nor repeated.
+    """
+    if cursor_values is not None:
+        key = tuple_(*columns)
+        query = query.where(key < tuple(cursor_values) if descending else key > tuple(cursor_values))
+    order = [c.desc() if descending else c.asc() for c in columns]
+    return query.order_by(*order)
+
+
+def set_next_cursor(response: Response, rows: Sequence[Any], limit: int, *key_attrs: str) -> None:
+    """Set the next-page cursor header when the page is full."""
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*(getattr(last, a) for a in key_attrs))
@@ -1,7 +1,8 @@
 """
 Utilities for computing criteria status based on multi-user sign-offs
 """
-from typing import List, Dict, Optional
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.release import ReleaseCriteria, CriteriaStatus
@@ -44,10 +45,6 @@ async def compute_criteria_status(
     stakeholders = stakeholders_result.scalars().all()
     stakeholder_ids = {s.user_id for s in stakeholders}
 
-    # If no stakeholders assigned, keep as pending
-    if not stakeholder_ids:
-        return CriteriaStatus.PENDING
-
     # Get all non-revoked sign-offs for this criteria
     signoffs_result = await db.execute(
         select(SignOff).where(
@@ -57,26 +54,86 @@ async def compute_criteria_status(
     )
     signoffs = signoffs_result.scalars().all()
 
+    return status_from_signoffs(stakeholder_ids, signoffs)
+
+
+def status_from_signoffs(
+    stakeholder_ids: Set[int],
+    signoffs: Iterable[SignOff],
+) -> CriteriaStatus:
+    """
+    Apply the sign-off rules to one criteria's non-revoked sign-offs.
+
+    Pure function shared by the single-criteria and bulk code paths, so the
+    rules described in compute_criteria_status live in exactly one place.
+    """
     # Build map of user_id -> latest sign-off status
     user_signoff_status: Dict[int, SignOffStatus] = {}
     for signoff in signoffs:
-        # Only consider sign-offs from assigned stakeholders
+        # Only consider active sign-offs from assigned stakeholders
+        if signoff.status == SignOffStatus.REVOKED:
+            continue
         if signoff.signed_by_id in stakeholder_ids:
             user_signoff_status[signoff.signed_by_id] = signoff.status
 
+    statuses = list(user_signoff_status.values())
+    return status_from_counts(
+        len(stakeholder_ids),
+        statuses.count(SignOffStatus.APPROVED),
+        statuses.count(SignOffStatus.REJECTED),
+    )
+
+
+def status_from_counts(stakeholders: int, approved: int, rejected: int) -> CriteriaStatus:
+    """
+    Apply the sign-off rules to a criteria's number of assigned stakeholders
+    and how many of them currently approve and reject it.
+    """
+    # If no stakeholders assigned, keep as pending
+    if not stakeholders:
+        return CriteriaStatus.PENDING
+
     # Check if any stakeholder rejected
-    if SignOffStatus.REJECTED in user_signoff_status.values():
+    if rejected:
         return CriteriaStatus.REJECTED
 
     # Check if all stakeholders approved
-    approved_count = sum(1 for status in user_signoff_status.values() if status == SignOffStatus.APPROVED)
-    if approved_count == len(stakeholder_ids):
+    if approved == stakeholders:
         return CriteriaStatus.APPROVED
 
     # Otherwise, still pending
     return CriteriaStatus.PENDING
 
 
+def compute_criteria_statuses(
+    criteria: Iterable[ReleaseCriteria],
+    stakeholder_ids_by_release: Dict[int, Set[int]],
+    signoffs: Iterable[SignOff],
+) -> Dict[int, CriteriaStatus]:
+    """
+    Compute statuses for many criteria from preloaded data, without any queries.
+
+    Args:
+        criteria: Criteria to compute (may span several releases)
+        stakeholder_ids_by_release: release_id -> set of assigned user ids
+        signoffs: Sign-offs for those criteria; revoked ones are ignored
+
+    Returns:
+        Dict mapping criteria_id to computed CriteriaStatus
+    """
+    signoffs_by_criteria: Dict[int, List[SignOff]] = defaultdict(list)
+    for signoff in signoffs:
+        signoffs_by_criteria[signoff.criteria_id].append(signoff)
+
+    return {
+        c.id: status_from_signoffs(
+            stakeholder_ids_by_release.get(c.release_id, set()),
+            signoffs_by_criteria.get(c.id, []),
+        )
+        for c in criteria
+    }
+
+
 async def get_stakeholder_signoff_summary(
     db: AsyncSession,
     criteria_id: int,
@@ -0,0 +1,297 @@
+"""
+Seeded synthetic data generator for benchmarks.
+
+Produces a consistent dataset: criteria statuses follow the sign-off rules,
+release progress counters match their criteria and product release counts
+match their releases. The same scale and seed always
+produce the same rows and ids.
+
+Usage:
+    python -m benchmarks.datagen --scale medium --db /tmp/bench.db
+"""
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List
+from sqlalchemy import bindparam, create_engine, insert, update
+from sqlalchemy.engine import Connection
+import app.models  # noqa: F401  (register every table on Base.metadata)
+from app.database import Base
+from app.models.audit import AuditLog
+from app.models.collection_version import CollectionVersion
+from app.models.product import Product
+from app.models.product_permission import ProductPermission
+from app.models.release import Release, ReleaseCriteria, ReleaseStatus, CriteriaStatus
+from app.models.release_stakeholder import ReleaseStakeholder
+from app.models.signoff import SignOff, SignOffStatus
+from app.models.template import Template, TemplateCriteria
+from app.models.user import User, UserRole
+from app.services.release_counts import STATUS_COLUMNS
+from app.services.versions import PRODUCTS, TEMPLATES
+
+CRITERIA_NAMES = [
+    "Content Review",
+    "Bug Verification",
+    "Smoke & Extended Smoke Regression",
+    "Full Regression",
+    "CPT Sign-off",
+    "Pre-Prod Monitoring incl. Crash Analysis",
+    "Production Monitoring",
+    "Security Audit",
+]
+
+RELEASE_STATUS_WEIGHTS = {
+    ReleaseStatus.RELEASED: 60,
+    ReleaseStatus.IN_REVIEW: 15,
+    ReleaseStatus.APPROVED: 10,
+    ReleaseStatus.DRAFT: 10,
+    ReleaseStatus.CANCELLED: 5,
+}
+
+BATCH_SIZE = 20_000
+EPOCH = datetime(2023, 1, 1)
+
+
+@dataclass(frozen=True)
+class Scale:
+    products: int
+    releases_per_product: int
+    criteria_per_release: int
+    stakeholders_per_release: int
+    users: int
+    owners_per_product: int
+    audit_rows_per_release: int
+    templates: int = 5
+
+    @property
+    def releases(self) -> int:
+        return self.products * self.releases_per_product
+
+    def dataset(self) -> dict:
+        """Id ranges the benchmark scenarios pick from."""
+        return {
+            "releases": self.releases,
+            "products": self.products,
+            "users": self.users,
+            "templates": self.templates,
+        }
+
+
+SCALES: Dict[str, Scale] = {
+    # Small enough for the pytest query-budget check
+    "ci": Scale(products=10, releases_per_product=8, criteria_per_release=6,
+                stakeholders_per_release=4, users=40, owners_per_product=2, audit_rows_per_release=5),
+    # ~20k releases, ~160k criteria, ~500k sign-offs, ~400k audit rows
+    "medium": Scale(products=1_000, releases_per_product=20, criteria_per_release=8,
+                    stakeholders_per_release=4, users=2_000, owners_per_product=2, audit_rows_per_release=20),
+    # ~200k releases, ~1.6M criteria, ~5M sign-offs, ~3M audit rows
+    "large": Scale(products=5_000, releases_per_product=40, criteria_per_release=8,
+                   stakeholders_per_release=4, users=10_000, owners_per_product=3, audit_rows_per_release=15),
+}
+
+
+class _Writer:
+    """Buffers rows per table and flushes them with executemany, parents first."""
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self.buffers: Dict[object, List[dict]] = {t: [] for t in Base.metadata.sorted_tables}
+        self.buffered = 0
+        self.counts: Dict[str, int] = {}
+
+    def add(self, table, row: dict) -> None:
+        self.buffers[table].append(row)
+        self.buffered += 1
+        if self.buffered >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        for table, rows in self.buffers.items():
+            if rows:
+                self.conn.execute(insert(table), rows)
+                self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+                self.buffers[table] = []
+        self.buffered = 0
+
+
+def _criteria_status(stakeholder_ids: List[int], latest: Dict[int, SignOffStatus]) -> CriteriaStatus:
+    # Same rules as app.utils.signoff_logic.status_from_signoffs
+    if not stakeholder_ids:
+        return CriteriaStatus.PENDING
+    if SignOffStatus.REJECTED in latest.values():
+        return CriteriaStatus.REJECTED
+    if sum(1 for s in latest.values() if s == SignOffStatus.APPROVED) == len(stakeholder_ids):
+        return CriteriaStatus.APPROVED
+    return CriteriaStatus.PENDING
+
+
+def generate(conn: Connection, scale: Scale, seed: int = 42) -> Dict[str, int]:
+    """
+    Insert a synthetic dataset through `conn` (tables must already exist).
+
+    User 1 is an admin. Returns the number of rows written per table.
+    """
+    rng = random.Random(seed)
+    w = _Writer(conn)
+
+    # Users: #1 is admin, the rest stakeholders
+    for user_id in range(1, scale.users + 1):
+        w.add(User.__table__, {
+            "id": user_id,
+            "email": f"user{user_id}@example.com",
+            "name": f"User {user_id:06d}",
+            "is_active": True,
+            "is_admin": user_id == 1,
+            "role": UserRole.ADMIN if user_id == 1 else UserRole.STAKEHOLDER,
+            "created_at": EPOCH,
+            "updated_at": EPOCH,
+        })
+
+    for name in (PRODUCTS, TEMPLATES):
+        w.add(CollectionVersion.__table__, {"name": name, "revision": 0})
+
+    # Templates with the predefined criteria
+    template_criteria_id = 0
+    for template_id in range(1, scale.templates + 1):
+        w.add(Template.__table__, {
+            "id": template_id, "name": f"Template {template_id}", "is_active": True,
+            "created_at": EPOCH, "updated_at": EPOCH,
+        })
+        for order, name in enumerate(CRITERIA_NAMES):
+            template_criteria_id += 1
+            w.add(TemplateCriteria.__table__, {
+                "id": template_criteria_id, "template_id": template_id, "name": name,
+                "is_mandatory": order < 6, "order": order, "created_at": EPOCH,
+            })
+
+    # Products and their owners
+    permission_id = 0
+    for product_id in range(1, scale.products + 1):
+        w.add(Product.__table__, {
+            "id": product_id, "name": f"Product {product_id:05d}",
+            "default_template_id": rng.randint(1, scale.templates),
+            "created_at": EPOCH, "updated_at": EPOCH,
+        })
+        for user_id in rng.sample(range(2, scale.users + 1), scale.owners_per_product):
+            permission_id += 1
+            w.add(ProductPermission.__table__, {
+                "id": permission_id, "product_id": product_id, "user_id": user_id,
+                "permission_type": "product_owner", "granted_by_id": 1, "granted_at": EPOCH,
+            })
+
+    statuses = list(RELEASE_STATUS_WEIGHTS)
+    weights = list(RELEASE_STATUS_WEIGHTS.values())
+    criteria_id = signoff_id = stakeholder_row_id = audit_id = 0
+    release_id = 0
+    release_counts: List[dict] = []
+    span_minutes = 2 * 365 * 24 * 60
+
+    for product_id in range(1, scale.products + 1):
+        counts = {"product_id": product_id, **{column: 0 for column in STATUS_COLUMNS.values()}}
+        release_counts.append(counts)
+        for n in range(scale.releases_per_product):
+            release_id += 1
+            created_at = EPOCH + timedelta(minutes=rng.randrange(span_minutes))
+            release_status = rng.choices(statuses, weights)[0]
+            counts[STATUS_COLUMNS[release_status]] += 1
+            stakeholder_ids = rng.sample(range(2, scale.users + 1), scale.stakeholders_per_release)
+            for user_id in stakeholder_ids:
+                stakeholder_row_id += 1
+                w.add(ReleaseStakeholder.__table__, {
+                    "id": stakeholder_row_id, "release_id": release_id,
+                    "user_id": user_id, "assigned_at": created_at,
+                })
+
+            # Finished releases are mostly signed off; open ones only partly
+            sign_probability = 0.95 if release_status in (ReleaseStatus.RELEASED, ReleaseStatus.APPROVED) else 0.5
+            criteria_rows: List[dict] = []
+            counters = {"mandatory_total": 0, "mandatory_approved": 0, "optional_total": 0, "optional_approved": 0}
+            for order in range(scale.criteria_per_release):
+                criteria_id += 1
+                is_mandatory = order < max(scale.criteria_per_release - 2, 1)
+                latest: Dict[int, SignOffStatus] = {}
+                for user_id in stakeholder_ids:
+                    if rng.random() >= sign_probability:
+                        continue
+                    signed_at = created_at + timedelta(hours=rng.randint(1, 240))
+                    if rng.random() < 0.1:
+                        # Superseded sign-off left behind as history
+                        signoff_id += 1
+                        w.add(SignOff.__table__, {
+                            "id": signoff_id, "criteria_id": criteria_id, "signed_by_id": user_id,
+                            "status": SignOffStatus.REVOKED, "comment": None, "link": None,
+                            "signed_at": signed_at - timedelta(hours=1),
+                        })
+                    status = SignOffStatus.REJECTED if rng.random() < 0.03 else SignOffStatus.APPROVED
+                    signoff_id += 1
+                    w.add(SignOff.__table__, {
+                        "id": signoff_id, "criteria_id": criteria_id, "signed_by_id": user_id,
+                        "status": status, "comment": "Looks good" if status == SignOffStatus.APPROVED else "Issues found",
+                        "link": f"https://ci.example.com/run/{signoff_id}", "signed_at": signed_at,
+                    })
+                    latest[user_id] = status
+
+                criteria_status = _criteria_status(stakeholder_ids, latest)
+                prefix = "mandatory" if is_mandatory else "optional"
+                counters[f"{prefix}_total"] += 1
+                if criteria_status == CriteriaStatus.APPROVED:
+                    counters[f"{prefix}_approved"] += 1
+                name = CRITERIA_NAMES[order] if order < len(CRITERIA_NAMES) else f"Custom check {order}"
+                criteria_rows.append({
+                    "id": criteria_id, "release_id": release_id, "name": name,
+                    "is_mandatory": is_mandatory, "status": criteria_status, "order": order,
+                    "created_at": created_at, "updated_at": created_at,
+                })
+
+            w.add(Release.__table__, {
+                "id": release_id, "product_id": product_id, "template_id": rng.randint(1, scale.templates),
+                "version": f"{n // 10 + 1}.{n % 10}.0", "name": f"Product {product_id:05d} release {n + 1}",
+                "status": release_status, "target_date": (created_at + timedelta(days=30)).date(),
+                "created_by_id": 1, "is_deleted": False, "created_at": created_at, "updated_at": created_at,
+                **counters,
+            })
+            for row in criteria_rows:
+                w.add(ReleaseCriteria.__table__, row)
+
+            for i in range(scale.audit_rows_per_release):
+                audit_id += 1
+                w.add(AuditLog.__table__, {
+                    "id": audit_id, "entity_type": "release", "entity_id": release_id,
+                    "action": "create" if i == 0 else "update", "actor_id": rng.choice(stakeholder_ids),
+                    "new_value": {"id": release_id, "status": release_status.value},
+                    "release_id": release_id, "timestamp": created_at + timedelta(minutes=i),
+                })
+
+    w.flush()
+    # Per-product release counts are only known once every release is drawn
+    conn.execute(
+        update(Product.__table__)
+        .where(Product.__table__.c.id == bindparam("product_id"))
+        .values({column: bindparam(column) for column in STATUS_COLUMNS.values()}),
+        release_counts,
+    )
+    return w.counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic benchmark database")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="ci")
+    parser.add_argument("--db", required=True, help="SQLite file to create (must not exist)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    Base.metadata.create_all(engine)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        counts = generate(conn, SCALES[args.scale], args.seed)
+    engine.dispose()
+    for table, count in sorted(counts.items()):
+        print(f"{table:24} {count:>10,}")
+    print(f"Generated in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Compare the list endpoints' ORM path with the read-model path at scale.
+
+Usage:
+    python -m benchmarks.readmodels                   # 100k rows per list
+    python -m benchmarks.readmodels --rows 20000 --iterations 5
+
+Seeds `--rows` releases, users and products (two owners each) in a temporary
+SQLite database, then builds one full-size page of each list both ways:
+
+- orm: select entities (products with selectinload of their permissions),
+  validate them against the response model like FastAPI does and encode JSON
+- readmodel: the app.readmodels query plus app.utils.fastjson, as served
+
+Reports median wall time and peak Python memory (tracemalloc, measured in a
+separate pass because tracing slows everything down). Both paths must
+produce the same JSON.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="List endpoint ORM vs read-model benchmark")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per list")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed builds per path")
+    return parser.parse_args(argv)
+
+
+def seed(conn, rows: int) -> None:
+    from sqlalchemy import insert
+    from app.models.product import Product
+    from app.models.product_permission import ProductPermission
+    from app.models.release import Release, ReleaseStatus
+    from app.models.user import User, UserRole
+
+    epoch = datetime(2024, 1, 1)
+    conn.execute(insert(User.__table__), [
+        {
+            "id": i, "email": f"user{i}@example.com", "name": f"User {i:06d}", "is_active": True,
+            "is_admin": i == 1, "role": UserRole.ADMIN if i == 1 else UserRole.STAKEHOLDER,
+            "created_at": epoch, "updated_at": epoch,
+        }
+        for i in range(1, rows + 1)
+    ])
+    conn.execute(insert(Product.__table__), [
+        {"id": i, "name": f"Product {i:06d}", "description": "Synthetic product", "created_at": epoch, "updated_at": epoch}
+        for i in range(1, rows + 1)
+    ])
+    conn.execute(insert(ProductPermission.__table__), [
+        {
+            "product_id": i, "user_id": 2 + (i * 7 + k) % (rows - 1), "permission_type": "product_owner",
+            "granted_by_id": 1, "granted_at": epoch,
+        }
+        for i in range(1, rows + 1)
+        for k in range(2)
+    ])
+    statuses = list(ReleaseStatus)
+    conn.execute(insert(Release.__table__), [
+        {
+            "id": i, "product_id": 1 + i % rows, "version": f"{i // 100}.{i % 100}", "name": f"Release {i}",
+            "status": statuses[i % len(statuses)], "created_by_id": 1,
+            "created_at": epoch + timedelta(minutes=i), "updated_at": epoch + timedelta(minutes=i),
+            "target_date": (epoch + timedelta(days=i % 400)).date(), "mandatory_total": 6, "mandatory_approved": i % 7,
+        }
+        for i in range(1, rows + 1)
+    ])
+
+
+def fastapi_encode(items, model) -> bytes:
+    """What FastAPI does with a returned list: validate against List[model] and encode."""
+    from pydantic import TypeAdapter
+    adapter = TypeAdapter(List[model])
+    validated = adapter.validate_python(items, from_attributes=True)
+    return json.dumps(
+        adapter.dump_python(validated, mode="json"), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+# ORM paths, as the endpoints were before app.readmodels
+
+async def orm_releases(db, rows: int) -> bytes:
+    from sqlalchemy import select
+    from app.models.release import Release
+    from app.schemas.release import ReleaseResponse
+    result = await db.execute(
+        select(Release).where(Release.is_deleted == False)
+        .order_by(Release.created_at.desc(), Release.id.desc()).limit(rows)
+    )
+    return fastapi_encode(result.scalars().all(), ReleaseResponse)
+
+
+async def orm_users(db, rows: int) -> bytes:
+    from sqlalchemy import select
+    from app.models.user import User
+    from app.schemas.user import UserResponse
+    result = await db.execute(
+        select(User).where(User.is_active == True).order_by(User.name, User.id).limit(rows)
+    )
+    return fastapi_encode(result.scalars().all(), UserResponse)
+
+
+async def orm_products(db, rows: int) -> bytes:
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+    from app.models.product import Product
+    from app.schemas.product import ProductResponse
+    result = await db.execute(
+        select(Product).options(selectinload(Product.permissions)).order_by(Product.name).limit(rows)
+    )
+    products = [
+        {
+            "id": p.id, "name": p.name, "description": p.description, "default_template_id": p.default_template_id,
+            "created_at": p.created_at, "updated_at": p.updated_at,
+            "product_owners": [
+                {"id": o.id, "user_id": o.user_id, "permission_type": o.permission_type, "granted_at": o.granted_at}
+                for o in sorted(p.permissions, key=lambda o: o.id)
+            ],
+        }
+        for p in result.scalars().all()
+    ]
+    return fastapi_encode(products, ProductResponse)
+
+
+# Read-model paths, as served
+
+async def readmodel_releases(db, rows: int) -> bytes:
+    from app.readmodels import release_rows
+    from app.utils import fastjson
+    return fastjson.dumps([row._asdict() for row in await release_rows(db, limit=rows)])
+
+
+async def readmodel_users(db, rows: int) -> bytes:
+    from app.readmodels import user_rows
+    from app.utils import fastjson
+    return fastjson.dumps([row._asdict() for row in await user_rows(db, limit=rows)])
+
+
+async def readmodel_products(db, rows: int) -> bytes:
+    from app.readmodels import product_list
+    from app.utils import fastjson
+    return fastjson.dumps(await product_list(db, limit=rows))
+
+
+async def build(path, rows: int) -> bytes:
+    from app.database import async_session_maker
+    async with async_session_maker() as db:
+        return await path(db, rows)
+
+
+async def measure(path, rows: int, iterations: int):
+    """Median wall ms, peak traced MB and the body of one build."""
+    body = await build(path, rows)  # warm-up
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await build(path, rows)
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    await build(path, rows)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return statistics.median(timings), peak, body
+
+
+async def run(rows: int, iterations: int) -> bool:
+    lists = {
+        "GET /api/releases": (orm_releases, readmodel_releases),
+        "GET /api/users": (orm_users, readmodel_users),
+        "GET /api/products": (orm_products, readmodel_products),
+    }
+    identical = True
+    print(f"\n{'route':20} {'orm ms':>9} {'read ms':>9} {'orm MB':>9} {'read MB':>9}")
+    for route, (orm_path, readmodel_path) in lists.items():
+        orm_ms, orm_mb, orm_body = await measure(orm_path, rows, iterations)
+        read_ms, read_mb, read_body = await measure(readmodel_path, rows, iterations)
+        if json.loads(orm_body) != json.loads(read_body):
+            print(f"{route}: bodies differ", file=sys.stderr)
+            identical = False
+        print(f"{route:20} {orm_ms:>9.0f} {read_ms:>9.0f} {orm_mb:>9.1f} {read_mb:>9.1f}")
+    return identical
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    db_path = Path(tempfile.mkdtemp(prefix="release-tracker-readmodels-")) / "bench.db"
+
+    # The app reads its database URL at import time
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["DATABASE_URL_SYNC"] = f"sqlite:///{db_path}"
+
+    from sqlalchemy import create_engine
+    import app.models  # noqa: F401  (register every table on Base.metadata)
+    from app.database import Base
+
+    print(f"Seeding {args.rows} releases, users and products in {db_path} ...")
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        seed(conn, args.rows)
+    sync_engine.dispose()
+
+    return 0 if asyncio.run(run(args.rows, args.iterations)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
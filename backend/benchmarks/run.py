@@ -0,0 +1,117 @@
+"""
+Run the API benchmark and check it against a committed baseline.
+
+Usage:
+    python -m benchmarks.run                          # ci scale, compare with baselines/ci.json
+    python -m benchmarks.run --scale medium --iterations 50
+    python -m benchmarks.run --update-baseline        # record a new baseline
+
+Generates a fresh seeded SQLite database (or reuses --db), drives every API
+route in-process and reports SQL statement counts and p50/p95/p99 latency.
+Exits non-zero if a route issues more statements than its baseline, gets
+slower than the latency tolerance allows, or has no scenario.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="API query-count and latency benchmark")
+    parser.add_argument("--scale", default="ci", help="Dataset size: ci, medium or large")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="SQLite file to use; generated if it does not exist")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed requests per route")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per route")
+    parser.add_argument("--route", action="append", help="Only run this route (repeatable)")
+    parser.add_argument("--baseline", type=Path, help="Baseline JSON (default: baselines/<scale>.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--no-latency", action="store_true", help="Only check SQL statement counts")
+    parser.add_argument("--latency-tolerance", type=float, default=2.0, help="Allowed slowdown factor")
+    parser.add_argument("--latency-slack-ms", type=float, default=10.0, help="Allowed extra milliseconds")
+    parser.add_argument("--report", type=Path, help="Also write the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    db_path = Path(args.db) if args.db else Path(tempfile.mkdtemp(prefix="release-tracker-bench-")) / "bench.db"
+
+    # The app reads its database URL at import time
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["DATABASE_URL_SYNC"] = f"sqlite:///{db_path}"
+
+    from sqlalchemy import create_engine
+    from app.database import Base
+    from benchmarks.datagen import SCALES, generate
+    from benchmarks.runner import compare, run_scenarios, uncovered_routes
+    from benchmarks.scenarios import SCENARIOS
+
+    if args.scale not in SCALES:
+        print(f"Unknown scale {args.scale!r}; choose from {', '.join(sorted(SCALES))}", file=sys.stderr)
+        return 2
+    scale = SCALES[args.scale]
+
+    if not db_path.exists():
+        print(f"Generating {args.scale} dataset in {db_path} ...")
+        sync_engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(sync_engine)
+        with sync_engine.begin() as conn:
+            generate(conn, scale, args.seed)
+        sync_engine.dispose()
+
+    results = asyncio.run(
+        run_scenarios(SCENARIOS, scale.dataset(), args.iterations, args.warmup, args.seed, args.route)
+    )
+    summaries = {route: result.summary() for route, result in results.items()}
+
+    print(f"\n{'route':62} {'sql':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'db p50':>8}")
+    for route, s in summaries.items():
+        print(
+            f"{route:62} {s['statements']:>4} {s['p50_ms']:>7.1f}ms {s['p95_ms']:>7.1f}ms "
+            f"{s['p99_ms']:>7.1f}ms {s['db_p50_ms']:>7.1f}ms"
+        )
+
+    if args.report:
+        args.report.write_text(json.dumps(summaries, indent=2, sort_keys=True) + "\n")
+
+    baseline_path = args.baseline or BASELINE_DIR / f"{args.scale}.json"
+    if args.update_baseline:
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() and args.route else {}
+        baseline.update(summaries)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline written to {baseline_path}")
+        return 0
+
+    failures = []
+    if not args.route:
+        failures += [f"{route}: no benchmark scenario" for route in uncovered_routes(SCENARIOS)]
+    if baseline_path.exists():
+        failures += compare(
+            summaries,
+            json.loads(baseline_path.read_text()),
+            latency_tolerance=args.latency_tolerance,
+            latency_slack_ms=args.latency_slack_ms,
+            check_latency=not args.no_latency,
+        )
+    else:
+        failures.append(f"No baseline at {baseline_path} (run with --update-baseline)")
+
+    if failures:
+        print("\nRegressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("\nAll routes within baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
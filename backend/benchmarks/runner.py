@@ -0,0 +1,205 @@
+"""
+Drives the FastAPI app in-process and records per-route SQL counts and latency.
+
+Importing this module imports the app, so DATABASE_URL must already point at
+the benchmark database (see benchmarks.run).
+"""
+import gc
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+import httpx
+from sqlalchemy import event
+from app.database import engine
+from app.main import app
+from app.services.user_cache import user_cache
+
+# Routes deliberately left out of the benchmark, with the reason
+EXCLUDED_ROUTES = {
+    "POST /api/auth/google": "verifies tokens against Google",
+    "GET /api/releases/{release_id}/events": "long-lived SSE stream",
+}
+
+
+class StatementRecorder:
+    """Counts SQL statements and time spent in the database while active."""
+
+    def __init__(self):
+        self.sync_engine = engine.sync_engine
+        self.active = False
+        self.count = 0
+        self._started: List[float] = []
+        self.db_seconds = 0.0
+        event.listen(self.sync_engine, "before_cursor_execute", self._before)
+        event.listen(self.sync_engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.count += 1
+            self._started.append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active and self._started:
+            self.db_seconds += time.perf_counter() - self._started.pop()
+
+    def start(self) -> None:
+        self.count = 0
+        self.db_seconds = 0.0
+        self._started = []
+        self.active = True
+
+    def stop(self) -> None:
+        self.active = False
+
+    def close(self) -> None:
+        event.remove(self.sync_engine, "before_cursor_execute", self._before)
+        event.remove(self.sync_engine, "after_cursor_execute", self._after)
+
+
+@dataclass
+class RouteResult:
+    route: str
+    statements: List[int] = field(default_factory=list)
+    latencies_ms: List[float] = field(default_factory=list)
+    db_ms: List[float] = field(default_factory=list)
+    statuses: List[int] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "statements": max(self.statements),
+            "p50_ms": round(percentile(self.latencies_ms, 50), 2),
+            "p95_ms": round(percentile(self.latencies_ms, 95), 2),
+            "p99_ms": round(percentile(self.latencies_ms, 99), 2),
+            "db_p50_ms": round(percentile(self.db_ms, 50), 2),
+            "samples": len(self.latencies_ms),
+        }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class Bench:
+    """
+    Handed to each scenario. Scenarios may make untimed setup calls with
+    `client` and must make exactly one timed call with `measure`.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, recorder: StatementRecorder, rng: random.Random, dataset: dict):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.dataset = dataset
+        self.counter = 0
+        self._result: Optional[RouteResult] = None
+
+    def unique(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix} bench {self.counter} {self.rng.randrange(10**9)}"
+
+    async def measure(self, method: str, url: str, expect: int = 200, **kwargs) -> httpx.Response:
+        self.recorder.start()
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.recorder.stop()
+        if response.status_code != expect:
+            raise AssertionError(
+                f"{method} {url} returned {response.status_code}, expected {expect}: {response.text[:300]}"
+            )
+        self._result.statements.append(self.recorder.count)
+        self._result.latencies_ms.append(elapsed * 1000)
+        self._result.db_ms.append(self.recorder.db_seconds * 1000)
+        self._result.statuses.append(response.status_code)
+        return response
+
+
+Scenario = Callable[[Bench], Awaitable[None]]
+
+
+async def run_scenarios(
+    scenarios: Dict[str, Scenario],
+    dataset: dict,
+    iterations: int = 20,
+    warmup: int = 2,
+    seed: int = 42,
+    routes: Optional[List[str]] = None,
+) -> Dict[str, RouteResult]:
+    """Run every scenario `warmup + iterations` times; only iterations are recorded."""
+    recorder = StatementRecorder()
+    results: Dict[str, RouteResult] = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for route, scenario in scenarios.items():
+                if routes and route not in routes:
+                    continue
+                # Don't charge one route for garbage left behind by the previous one
+                gc.collect()
+                bench = Bench(client, recorder, random.Random(f"{seed}:{route}"), dataset)
+                warm = RouteResult(route)
+                bench._result = warm
+                for _ in range(warmup):
+                    await scenario(bench)
+                result = RouteResult(route)
+                bench._result = result
+                for _ in range(iterations):
+                    await scenario(bench)
+                results[route] = result
+    finally:
+        recorder.close()
+        user_cache.clear()
+    return results
+
+
+def api_routes() -> List[str]:
+    """Every "METHOD /path" the app serves, from its OpenAPI schema."""
+    routes = []
+    for path, operations in app.openapi()["paths"].items():
+        for method in operations:
+            routes.append(f"{method.upper()} {path}")
+    return routes
+
+
+def uncovered_routes(scenarios: Dict[str, Scenario]) -> List[str]:
+    return [r for r in api_routes() if r not in scenarios and r not in EXCLUDED_ROUTES]
+
+
+def compare(
+    summaries: Dict[str, dict],
+    baseline: Dict[str, dict],
+    latency_tolerance: float = 2.0,
+    latency_slack_ms: float = 10.0,
+    check_latency: bool = True,
+) -> List[str]:
+    """
+    Compare a run against a baseline; returns a list of regressions.
+
+    Statement counts must not exceed the baseline. Latency percentiles may
+    exceed it by `latency_tolerance`x plus `latency_slack_ms` to absorb machine
+    noise; p99 is only checked with 100+ samples, below that it is just the max.
+    """
+    failures = []
+    for route, summary in summaries.items():
+        expected = baseline.get(route)
+        if expected is None:
+            failures.append(f"{route}: no baseline (run with --update-baseline)")
+            continue
+        if summary["statements"] > expected["statements"]:
+            failures.append(
+                f"{route}: {summary['statements']} SQL statements, baseline {expected['statements']}"
+            )
+        if check_latency:
+            keys = ["p50_ms", "p95_ms"] + (["p99_ms"] if summary["samples"] >= 100 else [])
+            for key in keys:
+                limit = expected[key] * latency_tolerance + latency_slack_ms
+                if summary[key] > limit:
+                    failures.append(f"{route}: {key} {summary[key]:.1f}ms exceeds {limit:.1f}ms")
+    return failures
@@ -0,0 +1,490 @@
+"""
+One benchmark scenario per API route, keyed by "METHOD /path template".
+
+Each scenario picks its targets from the generated dataset with the bench's
+seeded RNG, does any setup through untimed calls, then makes exactly one
+timed request. Write scenarios create what they modify, so the dataset stays
+the same shape from one iteration to the next.
+"""
+from typing import Dict, List
+from benchmarks.runner import Bench, Scenario
+
+ADMIN = {"X-User-Id": "1"}
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(route: str):
+    def register(fn: Scenario) -> Scenario:
+        SCENARIOS[route] = fn
+        return fn
+    return register
+
+
+def as_user(user_id: int) -> dict:
+    return {"X-User-Id": str(user_id)}
+
+
+def pick_release(bench: Bench) -> int:
+    return bench.rng.randint(1, bench.dataset["releases"])
+
+
+def pick_product(bench: Bench) -> int:
+    return bench.rng.randint(1, bench.dataset["products"])
+
+
+def pick_user(bench: Bench) -> int:
+    return bench.rng.randint(2, bench.dataset["users"])
+
+
+async def open_release(bench: Bench) -> dict:
+    """A generated release that still accepts sign-offs, with its detail loaded."""
+    while True:
+        response = await bench.client.get(f"/api/releases/{pick_release(bench)}", headers=ADMIN)
+        release = response.json()
+        if release["status"] != "cancelled":
+            return release
+
+
+async def stakeholder_ids(bench: Bench, release_id: int) -> List[int]:
+    response = await bench.client.get(f"/api/releases/{release_id}/stakeholders", headers=ADMIN)
+    return [s["user_id"] for s in response.json()]
+
+
+async def new_release(bench: Bench) -> dict:
+    response = await bench.client.post(
+        "/api/releases",
+        json={"product_id": pick_product(bench), "version": "9.9.9", "name": bench.unique("Release"), "template_id": 1},
+        headers=ADMIN,
+    )
+    return response.json()
+
+
+async def new_product(bench: Bench) -> dict:
+    response = await bench.client.post("/api/products", json={"name": bench.unique("Product")}, headers=ADMIN)
+    return response.json()
+
+
+async def new_template(bench: Bench) -> dict:
+    response = await bench.client.post(
+        "/api/templates",
+        json={"name": bench.unique("Template"), "criteria": [{"name": "Full Regression"}]},
+        headers=ADMIN,
+    )
+    return response.json()
+
+
+async def new_user(bench: Bench) -> dict:
+    name = bench.unique("User")
+    response = await bench.client.post(
+        "/api/users",
+        json={"name": name, "email": f"{name.replace(' ', '.').lower()}@bench.example.com"},
+        headers=ADMIN,
+    )
+    return response.json()
+
+
+# Health and auth
+
+@scenario("GET /health")
+async def health(bench: Bench):
+    await bench.measure("GET", "/health")
+
+
+@scenario("GET /api/auth/me")
+async def auth_me(bench: Bench):
+    await bench.measure("GET", "/api/auth/me", headers=as_user(pick_user(bench)))
+
+
+@scenario("POST /api/auth/logout")
+async def auth_logout(bench: Bench):
+    await bench.measure("POST", "/api/auth/logout", headers=ADMIN)
+
+
+# Products
+
+@scenario("GET /api/products")
+async def list_products(bench: Bench):
+    await bench.measure("GET", "/api/products", headers=ADMIN)
+
+
+@scenario("POST /api/products")
+async def create_product(bench: Bench):
+    await bench.measure("POST", "/api/products", expect=201, json={"name": bench.unique("Product")}, headers=ADMIN)
+
+
+@scenario("GET /api/products/{product_id}")
+async def get_product(bench: Bench):
+    await bench.measure("GET", f"/api/products/{pick_product(bench)}", headers=ADMIN)
+
+
+@scenario("PUT /api/products/{product_id}")
+async def update_product(bench: Bench):
+    await bench.measure(
+        "PUT", f"/api/products/{pick_product(bench)}", json={"description": bench.unique("Description")}, headers=ADMIN
+    )
+
+
+@scenario("DELETE /api/products/{product_id}")
+async def delete_product(bench: Bench):
+    product = await new_product(bench)
+    await bench.measure("DELETE", f"/api/products/{product['id']}", expect=204, headers=ADMIN)
+
+
+@scenario("GET /api/products/{product_id}/permissions")
+async def list_product_permissions(bench: Bench):
+    await bench.measure("GET", f"/api/products/{pick_product(bench)}/permissions", headers=ADMIN)
+
+
+@scenario("POST /api/products/{product_id}/permissions")
+async def grant_product_permissions(bench: Bench):
+    product = await new_product(bench)
+    user_ids = sorted({pick_user(bench) for _ in range(3)})
+    await bench.measure(
+        "POST", f"/api/products/{product['id']}/permissions", expect=201, json={"user_ids": user_ids}, headers=ADMIN
+    )
+
+
+@scenario("DELETE /api/products/{product_id}/permissions/{user_id}")
+async def revoke_product_permission(bench: Bench):
+    product = await new_product(bench)
+    user_id = pick_user(bench)
+    await bench.client.post(f"/api/products/{product['id']}/permissions", json={"user_ids": [user_id]}, headers=ADMIN)
+    await bench.measure("DELETE", f"/api/products/{product['id']}/permissions/{user_id}", expect=204, headers=ADMIN)
+
+
+@scenario("POST /api/product-permissions/bulk")
+async def bulk_product_permissions(bench: Bench):
+    user_ids = sorted({pick_user(bench) for _ in range(5)})
+    product_ids = sorted({pick_product(bench) for _ in range(5)})
+    action = bench.rng.choice(["grant", "revoke"])
+    await bench.measure(
+        "POST", "/api/product-permissions/bulk",
+        json={"action": action, "user_ids": user_ids, "product_ids": product_ids}, headers=ADMIN,
+    )
+
+
+# Templates
+
+@scenario("GET /api/templates")
+async def list_templates(bench: Bench):
+    await bench.measure("GET", "/api/templates", headers=ADMIN)
+
+
+@scenario("POST /api/templates")
+async def create_template(bench: Bench):
+    await bench.measure(
+        "POST",
+        "/api/templates",
+        expect=201,
+        json={"name": bench.unique("Template"), "criteria": [{"name": "Full Regression"}, {"name": "CPT Sign-off"}]},
+        headers=ADMIN,
+    )
+
+
+@scenario("GET /api/templates/{template_id}")
+async def get_template(bench: Bench):
+    await bench.measure("GET", f"/api/templates/{bench.rng.randint(1, bench.dataset['templates'])}", headers=ADMIN)
+
+
+@scenario("PUT /api/templates/{template_id}")
+async def update_template(bench: Bench):
+    template = await new_template(bench)
+    await bench.measure(
+        "PUT", f"/api/templates/{template['id']}", json={"description": bench.unique("Description")}, headers=ADMIN
+    )
+
+
+@scenario("DELETE /api/templates/{template_id}")
+async def delete_template(bench: Bench):
+    template = await new_template(bench)
+    await bench.measure("DELETE", f"/api/templates/{template['id']}", expect=204, headers=ADMIN)
+
+
+@scenario("POST /api/templates/{template_id}/criteria")
+async def add_template_criteria(bench: Bench):
+    template = await new_template(bench)
+    await bench.measure(
+        "POST", f"/api/templates/{template['id']}/criteria", expect=201, json={"name": "Security Audit"}, headers=ADMIN
+    )
+
+
+@scenario("POST /api/templates/{template_id}/apply")
+async def apply_template(bench: Bench):
+    response = await bench.client.post(
+        "/api/templates",
+        json={"name": bench.unique("Template"), "criteria": [{"name": "Accessibility Review"}, {"name": "Localization"}]},
+        headers=ADMIN,
+    )
+    release_ids = [(await new_release(bench))["id"] for _ in range(5)]
+    await bench.measure(
+        "POST", f"/api/templates/{response.json()['id']}/apply", json={"release_ids": release_ids}, headers=ADMIN
+    )
+
+
+@scenario("DELETE /api/templates/{template_id}/criteria/{criteria_id}")
+async def delete_template_criteria(bench: Bench):
+    template = await new_template(bench)
+    criteria_id = template["criteria"][0]["id"]
+    await bench.measure(
+        "DELETE", f"/api/templates/{template['id']}/criteria/{criteria_id}", expect=204, headers=ADMIN
+    )
+
+
+# Releases
+
+@scenario("GET /api/releases")
+async def list_releases(bench: Bench):
+    await bench.measure("GET", "/api/releases", params={"limit": 50}, headers=ADMIN)
+
+
+@scenario("POST /api/releases")
+async def create_release(bench: Bench):
+    await bench.measure(
+        "POST",
+        "/api/releases",
+        expect=201,
+        json={"product_id": pick_product(bench), "version": "9.9.9", "name": bench.unique("Release"), "template_id": 1},
+        headers=ADMIN,
+    )
+
+
+@scenario("POST /api/releases/{release_id}/clone")
+async def clone_release(bench: Bench):
+    await bench.measure(
+        "POST",
+        f"/api/releases/{pick_release(bench)}/clone",
+        expect=201,
+        json={"version": "9.9.9", "name": bench.unique("Release")},
+        headers=ADMIN,
+    )
+
+
+@scenario("GET /api/releases/{release_id}")
+async def get_release(bench: Bench):
+    # Releases are viewed repeatedly; the first view of a finished one stores its snapshot
+    url = f"/api/releases/{pick_release(bench)}"
+    await bench.client.get(url, headers=ADMIN)
+    await bench.measure("GET", url, headers=ADMIN)
+
+
+@scenario("PUT /api/releases/{release_id}")
+async def update_release(bench: Bench):
+    release = await new_release(bench)
+    await bench.measure(
+        "PUT", f"/api/releases/{release['id']}", json={"candidate_build": bench.unique("build")}, headers=ADMIN
+    )
+
+
+@scenario("DELETE /api/releases/{release_id}")
+async def delete_release(bench: Bench):
+    release = await new_release(bench)
+    await bench.measure("DELETE", f"/api/releases/{release['id']}", expect=204, headers=ADMIN)
+
+
+@scenario("POST /api/releases/{release_id}/criteria")
+async def add_release_criteria(bench: Bench):
+    release = await new_release(bench)
+    await bench.measure(
+        "POST", f"/api/releases/{release['id']}/criteria", expect=201, json={"name": "Custom check"}, headers=ADMIN
+    )
+
+
+@scenario("PUT /api/releases/{release_id}/criteria/{criteria_id}")
+async def update_release_criteria(bench: Bench):
+    release = await new_release(bench)
+    criteria_id = release["criteria"][0]["id"]
+    await bench.measure(
+        "PUT",
+        f"/api/releases/{release['id']}/criteria/{criteria_id}",
+        json={"description": bench.unique("Description")},
+        headers=ADMIN,
+    )
+
+
+@scenario("DELETE /api/releases/{release_id}/criteria/{criteria_id}")
+async def delete_release_criteria(bench: Bench):
+    release = await new_release(bench)
+    criteria_id = release["criteria"][0]["id"]
+    await bench.measure("DELETE", f"/api/releases/{release['id']}/criteria/{criteria_id}", expect=204, headers=ADMIN)
+
+
+@scenario("GET /api/releases/{release_id}/history")
+async def release_history(bench: Bench):
+    await bench.measure("GET", f"/api/releases/{pick_release(bench)}/history", headers=ADMIN)
+
+
+@scenario("POST /api/releases/rebuild-criteria-statuses")
+async def rebuild_criteria_statuses(bench: Bench):
+    await bench.measure("POST", "/api/releases/rebuild-criteria-statuses", headers=ADMIN)
+
+
+# Sign-offs
+
+@scenario("POST /api/criteria/{criteria_id}/sign-off")
+async def create_sign_off(bench: Bench):
+    release = await open_release(bench)
+    user_id = bench.rng.choice(await stakeholder_ids(bench, release["id"]))
+    criteria_id = bench.rng.choice(release["criteria"])["id"]
+    await bench.measure(
+        "POST",
+        f"/api/criteria/{criteria_id}/sign-off",
+        expect=201,
+        json={"status": "approved", "link": "https://ci.example.com/bench"},
+        headers=as_user(user_id),
+    )
+
+
+@scenario("DELETE /api/criteria/{criteria_id}/sign-off")
+async def revoke_sign_off(bench: Bench):
+    release = await open_release(bench)
+    user_id = bench.rng.choice(await stakeholder_ids(bench, release["id"]))
+    criteria_id = bench.rng.choice(release["criteria"])["id"]
+    await bench.client.post(
+        f"/api/criteria/{criteria_id}/sign-off",
+        json={"status": "approved", "link": "https://ci.example.com/bench"},
+        headers=as_user(user_id),
+    )
+    await bench.measure("DELETE", f"/api/criteria/{criteria_id}/sign-off", expect=204, headers=as_user(user_id))
+
+
+@scenario("POST /api/sign-offs/batch")
+async def create_sign_offs_batch(bench: Bench):
+    release = await open_release(bench)
+    user_id = bench.rng.choice(await stakeholder_ids(bench, release["id"]))
+    await bench.measure(
+        "POST",
+        "/api/sign-offs/batch",
+        json={"items": [
+            {"criteria_id": c["id"], "status": "approved", "link": "https://ci.example.com/bench"}
+            for c in release["criteria"]
+        ]},
+        headers=as_user(user_id),
+    )
+
+
+@scenario("GET /api/releases/{release_id}/sign-offs")
+async def list_release_sign_offs(bench: Bench):
+    await bench.measure("GET", f"/api/releases/{pick_release(bench)}/sign-offs", headers=ADMIN)
+
+
+@scenario("GET /api/releases/{release_id}/sign-off-matrix")
+async def sign_off_matrix(bench: Bench):
+    url = f"/api/releases/{pick_release(bench)}/sign-off-matrix"
+    await bench.client.get(url, headers=ADMIN)
+    await bench.measure("GET", url, headers=ADMIN)
+
+
+# Stakeholders
+
+@scenario("GET /api/releases/{release_id}/stakeholders")
+async def list_stakeholders(bench: Bench):
+    await bench.measure("GET", f"/api/releases/{pick_release(bench)}/stakeholders", headers=ADMIN)
+
+
+@scenario("POST /api/releases/{release_id}/stakeholders")
+async def assign_stakeholders(bench: Bench):
+    release = await new_release(bench)
+    user_ids = sorted({pick_user(bench) for _ in range(5)})
+    await bench.measure(
+        "POST", f"/api/releases/{release['id']}/stakeholders", expect=201, json={"user_ids": user_ids}, headers=ADMIN
+    )
+
+
+@scenario("POST /api/releases/{release_id}/stakeholders/bulk-remove")
+async def bulk_remove_stakeholders(bench: Bench):
+    release = await new_release(bench)
+    user_ids = sorted({pick_user(bench) for _ in range(5)})
+    await bench.client.post(f"/api/releases/{release['id']}/stakeholders", json={"user_ids": user_ids}, headers=ADMIN)
+    await bench.measure(
+        "POST", f"/api/releases/{release['id']}/stakeholders/bulk-remove", json={"user_ids": user_ids}, headers=ADMIN
+    )
+
+
+@scenario("DELETE /api/releases/{release_id}/stakeholders/{user_id}")
+async def remove_stakeholder(bench: Bench):
+    release = await new_release(bench)
+    user_id = pick_user(bench)
+    await bench.client.post(f"/api/releases/{release['id']}/stakeholders", json={"user_ids": [user_id]}, headers=ADMIN)
+    await bench.measure("DELETE", f"/api/releases/{release['id']}/stakeholders/{user_id}", expect=204, headers=ADMIN)
+
+
+# Dashboard and audit
+
+@scenario("GET /api/dashboard/my-pending")
+async def my_pending(bench: Bench):
+    await bench.measure("GET", "/api/dashboard/my-pending", headers=as_user(pick_user(bench)))
+
+
+@scenario("GET /api/dashboard/my-pending/count")
+async def my_pending_count(bench: Bench):
+    await bench.measure("GET", "/api/dashboard/my-pending/count", headers=as_user(pick_user(bench)))
+
+
+@scenario("GET /api/dashboard/releases-summary")
+async def releases_summary(bench: Bench):
+    await bench.measure("GET", "/api/dashboard/releases-summary", headers=ADMIN)
+
+
+@scenario("GET /api/audit")
+async def audit_logs(bench: Bench):
+    await bench.measure("GET", "/api/audit", params={"limit": 100}, headers=ADMIN)
+
+
+# Users and permissions
+
+@scenario("GET /api/users/me")
+async def users_me(bench: Bench):
+    await bench.measure("GET", "/api/users/me", headers=as_user(pick_user(bench)))
+
+
+@scenario("GET /api/users")
+async def list_users(bench: Bench):
+    await bench.measure("GET", "/api/users", params={"limit": 100}, headers=ADMIN)
+
+
+@scenario("POST /api/users")
+async def create_user(bench: Bench):
+    name = bench.unique("User")
+    await bench.measure(
+        "POST",
+        "/api/users",
+        expect=201,
+        json={"name": name, "email": f"{name.replace(' ', '.').lower()}@bench.example.com"},
+        headers=ADMIN,
+    )
+
+
+@scenario("GET /api/users/{user_id}")
+async def get_user(bench: Bench):
+    await bench.measure("GET", f"/api/users/{pick_user(bench)}", headers=ADMIN)
+
+
+@scenario("PUT /api/users/{user_id}")
+async def update_user(bench: Bench):
+    user = await new_user(bench)
+    await bench.measure("PUT", f"/api/users/{user['id']}", json={"name": bench.unique("Renamed")}, headers=ADMIN)
+
+
+@scenario("DELETE /api/users/{user_id}")
+async def delete_user(bench: Bench):
+    user = await new_user(bench)
+    await bench.measure("DELETE", f"/api/users/{user['id']}", expect=204, headers=ADMIN)
+
+
+@scenario("POST /api/users/{user_id}/grant-product-owner")
+async def grant_product_owner(bench: Bench):
+    user = await new_user(bench)
+    await bench.measure("POST", f"/api/users/{user['id']}/grant-product-owner", headers=ADMIN)
+
+
+@scenario("DELETE /api/users/{user_id}/revoke-product-owner")
+async def revoke_product_owner(bench: Bench):
+    user = await new_user(bench)
+    await bench.client.post(f"/api/users/{user['id']}/grant-product-owner", headers=ADMIN)
+    await bench.measure("DELETE", f"/api/users/{user['id']}/revoke-product-owner", headers=ADMIN)
+
+
+@scenario("GET /api/users/{user_id}/is-product-owner")
+async def is_product_owner(bench: Bench):
+    await bench.measure("GET", f"/api/users/{pick_user(bench)}/is-product-owner", headers=ADMIN)
@@ -0,0 +1,268 @@
+"""
+Compare CPU per request of the release detail and sign-off matrix bodies:
+ORM objects + pydantic response models (the previous path) against Core rows
++ plain dicts + orjson (the current one).
+
+Usage:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --criteria 40 --stakeholders 500 --iterations 20
+
+Seeds one large release (every stakeholder has signed off most criteria) in a
+temporary SQLite database and builds each body repeatedly against it, timing
+with time.process_time so only CPU spent in this process counts. The previous
+path is kept below as it was, followed by what FastAPI does with a returned
+model: dump it, validate it against response_model and JSON-encode it. Both
+paths must produce the same JSON.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Release detail / matrix serialization CPU benchmark")
+    parser.add_argument("--criteria", type=int, default=40, help="Criteria on the release")
+    parser.add_argument("--stakeholders", type=int, default=250, help="Stakeholders on the release")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed builds per path")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def seed_release(conn, criteria: int, stakeholders: int, seed: int) -> int:
+    """Insert one release with `criteria` x `stakeholders` sign-off cells; returns its id."""
+    from sqlalchemy import insert
+    from app.models.product import Product
+    from app.models.release import Release, ReleaseCriteria, ReleaseStatus, CriteriaStatus
+    from app.models.release_stakeholder import ReleaseStakeholder
+    from app.models.signoff import SignOff, SignOffStatus
+    from app.models.user import User, UserRole
+
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1)
+    conn.execute(insert(Product.__table__), [{"id": 1, "name": "Product", "created_at": now, "updated_at": now}])
+    conn.execute(insert(User.__table__), [
+        {
+            "id": user_id, "email": f"user{user_id}@example.com", "name": f"User {user_id:05d}",
+            "is_active": True, "is_admin": False, "role": UserRole.STAKEHOLDER,
+            "created_at": now, "updated_at": now,
+        }
+        for user_id in range(1, stakeholders + 1)
+    ])
+    conn.execute(insert(Release.__table__), [{
+        "id": 1, "product_id": 1, "version": "1.0", "name": "Big release", "status": ReleaseStatus.IN_REVIEW,
+        "created_at": now, "updated_at": now, "mandatory_total": criteria,
+    }])
+    conn.execute(insert(ReleaseStakeholder.__table__), [
+        {"release_id": 1, "user_id": user_id, "assigned_at": now + timedelta(seconds=user_id)}
+        for user_id in range(1, stakeholders + 1)
+    ])
+    conn.execute(insert(ReleaseCriteria.__table__), [
+        {
+            "id": criteria_id, "release_id": 1, "name": f"Check {criteria_id:03d}", "is_mandatory": True,
+            "status": CriteriaStatus.PENDING, "order": criteria_id, "created_at": now, "updated_at": now,
+        }
+        for criteria_id in range(1, criteria + 1)
+    ])
+    conn.execute(insert(SignOff.__table__), [
+        {
+            "criteria_id": criteria_id, "signed_by_id": user_id,
+            "status": SignOffStatus.APPROVED if rng.random() < 0.95 else SignOffStatus.REJECTED,
+            "comment": "Verified on the candidate build" if rng.random() < 0.3 else None,
+            "signed_at": now + timedelta(minutes=rng.randrange(10_000)),
+        }
+        for criteria_id in range(1, criteria + 1)
+        for user_id in range(1, stakeholders + 1)
+        if rng.random() < 0.9
+    ])
+    return 1
+
+
+# The previous path: ORM graph + pydantic models, then FastAPI's response handling
+
+def fastapi_encode(model) -> bytes:
+    validated = type(model).model_validate(model.model_dump())
+    return json.dumps(
+        validated.model_dump(mode="json"), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+async def orm_release_detail(db, release_id: int) -> bytes:
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+    from app.models.release import Release, ReleaseCriteria, CriteriaStatus
+    from app.models.release_stakeholder import ReleaseStakeholder
+    from app.schemas.release import ReleaseCriteriaResponse, ReleaseDetailResponse
+    from app.services.progress import progress_from_counters
+    from app.utils.signoff_logic import compute_criteria_statuses
+
+    result = await db.execute(
+        select(Release)
+        .where(Release.id == release_id, Release.is_deleted == False)
+        .options(
+            selectinload(Release.criteria).selectinload(ReleaseCriteria.sign_offs),
+            selectinload(Release.stakeholders).selectinload(ReleaseStakeholder.user)
+        )
+    )
+    release = result.scalar_one()
+    computed_statuses = compute_criteria_statuses(
+        release.criteria,
+        {release.id: {s.user_id for s in release.stakeholders}},
+        [so for c in release.criteria for so in c.sign_offs],
+    )
+    criteria = [
+        ReleaseCriteriaResponse.model_validate(c).model_copy(update={"status": computed_statuses[c.id]})
+        if c.status != CriteriaStatus.BLOCKED
+        else ReleaseCriteriaResponse.model_validate(c)
+        for c in release.criteria
+    ]
+    return fastapi_encode(ReleaseDetailResponse(
+        **{c.name: getattr(release, c.name) for c in Release.__table__.columns},
+        criteria=criteria,
+        progress=progress_from_counters(release),
+        stakeholders=release.stakeholders,
+    ))
+
+
+async def orm_sign_off_matrix(db, release_id: int) -> bytes:
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+    from app.models.release import ReleaseCriteria
+    from app.models.release_stakeholder import ReleaseStakeholder
+    from app.models.signoff import SignOff, SignOffStatus
+    from app.schemas.release import CriteriaSignOffMatrix, ReleaseSignOffMatrixResponse, StakeholderSignOffStatus
+    from app.schemas.release_stakeholder import StakeholderUser
+    from app.utils.signoff_logic import compute_criteria_statuses
+
+    stakeholders = (await db.execute(
+        select(ReleaseStakeholder)
+        .options(selectinload(ReleaseStakeholder.user))
+        .where(ReleaseStakeholder.release_id == release_id)
+        .order_by(ReleaseStakeholder.assigned_at)
+    )).scalars().all()
+    criteria_list = (await db.execute(
+        select(ReleaseCriteria)
+        .where(ReleaseCriteria.release_id == release_id)
+        .order_by(ReleaseCriteria.sort_key, ReleaseCriteria.id)
+    )).scalars().all()
+    all_signoffs = (await db.execute(
+        select(SignOff)
+        .join(ReleaseCriteria)
+        .where(ReleaseCriteria.release_id == release_id, SignOff.status != SignOffStatus.REVOKED)
+        .order_by(SignOff.id)
+    )).scalars().all()
+    computed_statuses = compute_criteria_statuses(
+        criteria_list, {release_id: {s.user_id for s in stakeholders}}, all_signoffs
+    )
+    signoff_map = {(s.criteria_id, s.signed_by_id): s for s in all_signoffs}
+    criteria_matrix = []
+    for criteria in criteria_list:
+        stakeholder_signoffs = []
+        for stakeholder in stakeholders:
+            user_signoff = signoff_map.get((criteria.id, stakeholder.user_id))
+            stakeholder_signoffs.append(StakeholderSignOffStatus(
+                user_id=stakeholder.user_id,
+                user_name=stakeholder.user.name,
+                user_email=stakeholder.user.email,
+                status=user_signoff.status.value if user_signoff else None,
+                comment=user_signoff.comment if user_signoff else None,
+                link=user_signoff.link if user_signoff else None,
+                signed_at=user_signoff.signed_at if user_signoff else None,
+            ))
+        criteria_matrix.append(CriteriaSignOffMatrix(
+            criteria_id=criteria.id,
+            criteria_name=criteria.name,
+            is_mandatory=criteria.is_mandatory,
+            computed_status=computed_statuses[criteria.id],
+            stakeholder_signoffs=stakeholder_signoffs,
+        ))
+    return fastapi_encode(ReleaseSignOffMatrixResponse(
+        release_id=release_id,
+        stakeholders=[
+            StakeholderUser(id=s.user.id, name=s.user.name, email=s.user.email, role=s.user.role.value)
+            for s in stakeholders
+        ],
+        criteria_matrix=criteria_matrix,
+    ))
+
+
+# The current path
+
+async def core_release_detail(db, release_id: int) -> bytes:
+    from app.api.releases import build_release_detail
+    from app.utils import fastjson
+    return fastjson.dumps(await build_release_detail(db, release_id))
+
+
+async def core_sign_off_matrix(db, release_id: int) -> bytes:
+    from app.api.stakeholders import build_sign_off_matrix
+    from app.utils import fastjson
+    return fastjson.dumps(await build_sign_off_matrix(db, release_id))
+
+
+async def cpu_ms_per_build(build, release_id: int, iterations: int):
+    """Mean CPU milliseconds per build (fresh session each time) and the last body."""
+    from app.database import async_session_maker
+
+    async def once():
+        async with async_session_maker() as db:
+            return await build(db, release_id)
+
+    body = await once()  # warm-up
+    started = time.process_time()
+    for _ in range(iterations):
+        body = await once()
+    return (time.process_time() - started) * 1000 / iterations, body
+
+
+async def run(release_id: int, iterations: int) -> bool:
+    pairs = {
+        "GET /api/releases/{release_id}": (orm_release_detail, core_release_detail),
+        "GET /api/releases/{release_id}/sign-off-matrix": (orm_sign_off_matrix, core_sign_off_matrix),
+    }
+    identical = True
+    print(f"\n{'route':50} {'orm+pydantic':>13} {'core+orjson':>12} {'speedup':>8} {'body':>9}")
+    for route, (previous, current) in pairs.items():
+        previous_ms, previous_body = await cpu_ms_per_build(previous, release_id, iterations)
+        current_ms, current_body = await cpu_ms_per_build(current, release_id, iterations)
+        if json.loads(previous_body) != json.loads(current_body):
+            print(f"{route}: bodies differ", file=sys.stderr)
+            identical = False
+        print(
+            f"{route:50} {previous_ms:>10.1f} ms {current_ms:>9.1f} ms {previous_ms / current_ms:>7.1f}x "
+            f"{len(current_body) / 1024:>6.0f} KB"
+        )
+    return identical
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    db_path = Path(tempfile.mkdtemp(prefix="release-tracker-serialization-")) / "bench.db"
+
+    # The app reads its database URL at import time
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["DATABASE_URL_SYNC"] = f"sqlite:///{db_path}"
+
+    from sqlalchemy import create_engine
+    import app.models  # noqa: F401  (register every table on Base.metadata)
+    from app.database import Base
+
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        release_id = seed_release(conn, args.criteria, args.stakeholders, args.seed)
+    sync_engine.dispose()
+
+    print(f"One release with {args.criteria} criteria x {args.stakeholders} stakeholders, "
+          f"{args.iterations} builds per path")
+    return 0 if asyncio.run(run(release_id, args.iterations)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before app.database creates its engine
+_db_dir = tempfile.mkdtemp(prefix="release-tracker-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/test.db"
+os.environ["DATABASE_URL_SYNC"] = f"sqlite:///{_db_dir}/test.db"
+
+import httpx
+import pytest
+from sqlalchemy import event
+from app.database import Base, engine, async_session_maker, recent_writers
+from app.api import auth as auth_api
+from app.config import get_settings
+from app.main import app
+from app.services.user_cache import user_cache
+
+
+class QueryCounter:
+    """Counts SQL statements sent to the database while active."""
+
+    def __init__(self, target_engine):
+        self.engine = target_engine.sync_engine
+        self.statements = []
+        self.active = False
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self):
+        self.statements = []
+        self.active = True
+        return self
+
+    def __exit__(self, *exc):
+        self.active = False
+
+    def close(self):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@pytest.fixture(autouse=True)
+async def database():
+    """Fresh schema and empty caches for every test."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    user_cache.clear()
+    recent_writers.clear()
+    yield
+    # Connections are bound to the test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db():
+    async with async_session_maker() as session:
+        yield session
+
+
+@pytest.fixture
+async def client():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as c:
+        yield c
+
+
+@pytest.fixture
+def query_counter():
+    counter = QueryCounter(engine)
+    yield counter
+    counter.close()
+
+
+@pytest.fixture
+def google_login(client, monkeypatch):
+    """Log in through /api/auth/google as whoever the next token claims to be."""
+    claims = {}
+
+    class FakeVerifier:
+        async def verify(self, credential, client_id):
+            return claims
+
+    monkeypatch.setattr(get_settings(), "google_client_id", "test-client")
+    monkeypatch.setattr(auth_api, "get_google_token_verifier", lambda: FakeVerifier())
+
+    async def login(email, name, picture=None):
+        claims.clear()
+        claims.update(sub=f"google-{email}", email=email, name=name, picture=picture, email_verified=True)
+        return await client.post("/api/auth/google", json={"credential": "token"})
+
+    return login
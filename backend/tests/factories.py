@@ -0,0 +1,58 @@
+"""Small helpers for creating test data directly through the ORM."""
+from typing import List, Optional
+from app.models.user import User, UserRole
+from app.models.product import Product
+from app.models.release import Release, ReleaseCriteria
+from app.models.release_stakeholder import ReleaseStakeholder
+from app.services.release_counts import adjust_release_counts
+
+
+def auth(user: User) -> dict:
+    """Request headers authenticating as `user`."""
+    return {"X-User-Id": str(user.id)}
+
+
+async def create_user(db, name: str = "User", is_admin: bool = False) -> User:
+    user = User(
+        email=f"{name.lower().replace(' ', '.')}@example.com",
+        name=name,
+        is_admin=is_admin,
+        role=UserRole.ADMIN if is_admin else UserRole.STAKEHOLDER,
+    )
+    db.add(user)
+    await db.commit()
+    return user
+
+
+async def create_users(db, count: int, prefix: str = "user") -> List[User]:
+    users = [
+        User(email=f"{prefix}{i}@example.com", name=f"{prefix} {i}", role=UserRole.STAKEHOLDER)
+        for i in range(count)
+    ]
+    db.add_all(users)
+    await db.commit()
+    return users
+
+
+async def create_release(
+    db,
+    name: str = "Release",
+    criteria: Optional[List[str]] = None,
+    stakeholders: Optional[List[User]] = None,
+    product: Optional[Product] = None,
+) -> Release:
+    if product is None:
+        product = Product(name=f"{name} product")
+        db.add(product)
+        await db.flush()
+    release = Release(product_id=product.id, version="1.0", name=name)
+    db.add(release)
+    await db.flush()
+    await adjust_release_counts(db, product.id, None, release.status)
+    for order, criteria_name in enumerate(criteria or []):
+        db.add(ReleaseCriteria(release_id=release.id, name=criteria_name, order=order))
+        release.mandatory_total += 1
+    for user in stakeholders or []:
+        db.add(ReleaseStakeholder(release_id=release.id, user_id=user.id))
+    await db.commit()
+    return release
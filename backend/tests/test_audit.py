@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+from app.models.audit import AuditLog
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from tests.factories import auth, create_user, create_release
+
+
+async def test_release_history_lists_the_release_entries_with_actor_names(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    release = await create_release(db, criteria=["Content Review"])
+    other = await create_release(db, "Other")
+    url = f"/api/releases/{release.id}"
+    await client.put(url, json={"name": "Renamed"}, headers=auth(admin))
+    await client.put(f"/api/releases/{other.id}", json={"name": "Elsewhere"}, headers=auth(admin))
+    criteria_id = (await client.get(url, headers=auth(admin))).json()["criteria"][0]["id"]
+    await client.put(f"{url}/criteria/{criteria_id}", json={"description": "Checked"}, headers=auth(admin))
+
+    response = await client.get(f"{url}/history", headers=auth(admin))
+
+    assert response.status_code == 200
+    history = response.json()
+    assert [(e["entity_type"], e["action"]) for e in history] == [
+        ("release_criteria", "update"),
+        ("release", "update"),
+    ]
+    assert {e["actor_name"] for e in history} == {"Admin"}
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+async def test_release_history_pages_by_cursor_without_gaps(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    release = await create_release(db)
+    start = datetime(2026, 10, 1)
+    # Pairs of entries share a timestamp, so only the id keeps pages apart
+    db.add_all([
+        AuditLog(
+            entity_type="release", entity_id=release.id, release_id=release.id, action="update",
+            timestamp=start + timedelta(minutes=i // 2),
+        )
+        for i in range(7)
+    ])
+    await db.commit()
+
+    seen, pages, cursor = [], 0, None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(f"/api/releases/{release.id}/history", params=params, headers=auth(admin))
+        assert response.status_code == 200
+        seen += [(e["timestamp"], e["id"]) for e in response.json()]
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert len(seen) == 7
+    assert seen == sorted(seen, reverse=True)
+    bad = await client.get(f"/api/releases/{release.id}/history", params={"cursor": "nope"}, headers=auth(admin))
+    assert bad.status_code == 400
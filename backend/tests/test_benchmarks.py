@@ -0,0 +1,26 @@
+import json
+from sqlalchemy import create_engine
+from app.config import get_settings
+from benchmarks.datagen import SCALES, generate
+from benchmarks.run import BASELINE_DIR
+from benchmarks.runner import compare, run_scenarios, uncovered_routes
+from benchmarks.scenarios import SCENARIOS
+
+
+def test_every_route_has_a_benchmark_scenario():
+    assert uncovered_routes(SCENARIOS) == []
+
+
+async def test_statement_counts_within_baseline():
+    """Guards every route against N+1 regressions; latency is checked by benchmarks.run."""
+    scale = SCALES["ci"]
+    sync_engine = create_engine(get_settings().database_url_sync)
+    with sync_engine.begin() as conn:
+        generate(conn, scale)
+    sync_engine.dispose()
+
+    results = await run_scenarios(SCENARIOS, scale.dataset(), iterations=3, warmup=2)
+
+    baseline = json.loads((BASELINE_DIR / "ci.json").read_text())
+    summaries = {route: result.summary() for route, result in results.items()}
+    assert compare(summaries, baseline, check_latency=False) == []
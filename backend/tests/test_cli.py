@@ -0,0 +1,49 @@
+from sqlalchemy import select, update
+from app.cli import repair_progress
+from app.models.release import Release, ReleaseCriteria, CriteriaStatus
+from app.services.progress import progress_from_counters
+from tests.factories import auth, create_users, create_release
+
+
+async def expected_progress(db, release_id):
+    rows = (await db.execute(
+        select(ReleaseCriteria.is_mandatory, ReleaseCriteria.status).where(ReleaseCriteria.release_id == release_id)
+    )).all()
+    mandatory = [status for is_mandatory, status in rows if is_mandatory]
+    optional = [status for is_mandatory, status in rows if not is_mandatory]
+    return (
+        len(mandatory), mandatory.count(CriteriaStatus.APPROVED),
+        len(optional), optional.count(CriteriaStatus.APPROVED),
+    )
+
+
+async def test_repair_progress_rebuilds_corrupted_counters(client, db):
+    (alice,) = await create_users(db, 1)
+    releases = [
+        await create_release(db, f"Release {i}", criteria=["Content Review", "Full Regression"], stakeholders=[alice])
+        for i in range(3)
+    ]
+    await create_release(db, "Empty")
+    headers, url = auth(alice), f"/api/releases/{releases[0].id}"
+    criteria = (await client.get(url, headers=headers)).json()["criteria"]
+    await client.post(f"/api/criteria/{criteria[0]['id']}/sign-off", json={"status": "approved"}, headers=headers)
+    before = (await client.get(url, headers=headers)).json()["progress"]
+
+    await db.execute(update(Release).values(
+        mandatory_total=99, mandatory_approved=42, optional_total=7, optional_approved=5
+    ))
+    await db.commit()
+
+    # A batch size smaller than the release count exercises the batching
+    assert await repair_progress(batch_size=2) == 4
+
+    db.expire_all()
+    for release in (await db.scalars(select(Release))).all():
+        progress = progress_from_counters(release)
+        assert (
+            progress["mandatory_total"], progress["mandatory_approved"],
+            progress["optional_total"], progress["optional_approved"],
+        ) == await expected_progress(db, release.id)
+    after = (await client.get(url, headers=headers)).json()["progress"]
+    assert after == before
+    assert after["mandatory_approved"] == 1
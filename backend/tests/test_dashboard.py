@@ -0,0 +1,164 @@
+from datetime import date, timedelta
+from sqlalchemy import select
+from app.models.product import Product
+from app.models.release import ReleaseCriteria, ReleaseStatus
+from app.models.signoff import SignOff, SignOffStatus
+from app.services.release_counts import recompute_release_counts
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from tests.factories import auth, create_user, create_users, create_release
+
+
+async def in_review(db, release, target_date=None):
+    release.status = ReleaseStatus.IN_REVIEW
+    release.target_date = target_date
+    await db.commit()
+    return release
+
+
+async def test_my_pending_excludes_active_signoffs(client, db):
+    user, other = await create_users(db, 2)
+    release = await in_review(
+        db, await create_release(db, criteria=["Signed", "Revoked", "Open", "Other signed"], stakeholders=[user, other])
+    )
+    signed, revoked, open_, other_signed = (
+        await db.scalars(select(ReleaseCriteria).where(ReleaseCriteria.release_id == release.id).order_by(ReleaseCriteria.order))
+    ).all()
+    db.add_all([
+        SignOff(criteria_id=signed.id, signed_by_id=user.id, status=SignOffStatus.APPROVED),
+        SignOff(criteria_id=revoked.id, signed_by_id=user.id, status=SignOffStatus.REVOKED),
+        SignOff(criteria_id=other_signed.id, signed_by_id=other.id, status=SignOffStatus.APPROVED),
+    ])
+    # Drafts and releases the user is not on never show up
+    await create_release(db, name="Draft", criteria=["Full Regression"], stakeholders=[user])
+    await in_review(db, await create_release(db, name="Not mine", criteria=["Full Regression"], stakeholders=[other]))
+
+    response = await client.get("/api/dashboard/my-pending", headers=auth(user))
+
+    assert response.status_code == 200
+    assert [item["criteria_id"] for item in response.json()] == [revoked.id, open_.id, other_signed.id]
+    assert response.json()[0] == {
+        "criteria_id": revoked.id,
+        "criteria_name": "Revoked",
+        "release_id": release.id,
+        "release_name": release.name,
+        "release_version": "1.0",
+        "is_mandatory": True,
+        "criteria_status": "pending",
+    }
+    count = await client.get("/api/dashboard/my-pending/count", headers=auth(user))
+    assert count.json() == {"count": 3}
+
+
+async def test_my_pending_pages_by_target_date(client, db):
+    user = await create_user(db, "Stakeholder")
+    today = date(2026, 10, 17)
+    undated = await in_review(db, await create_release(db, "Undated", criteria=["A", "B"], stakeholders=[user]))
+    later = await in_review(db, await create_release(db, "Later", criteria=["A", "B"], stakeholders=[user]), today + timedelta(days=7))
+    sooner = await in_review(db, await create_release(db, "Sooner", criteria=["A", "B"], stakeholders=[user]), today)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 4}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/dashboard/my-pending", params=params, headers=auth(user))
+        assert response.status_code == 200
+        seen += [item["release_id"] for item in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    assert seen == [sooner.id] * 2 + [later.id] * 2 + [undated.id] * 2
+
+    # Without a limit everything comes back in one response
+    response = await client.get("/api/dashboard/my-pending", headers=auth(user))
+    assert [item["release_id"] for item in response.json()] == seen
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+async def test_my_pending_rejects_bad_cursor(client, db):
+    user = await create_user(db, "Stakeholder")
+
+    response = await client.get("/api/dashboard/my-pending", params={"cursor": "nope"}, headers=auth(user))
+
+    assert response.status_code == 400
+
+
+async def test_my_pending_is_one_query(client, db, query_counter):
+    user = await create_user(db, "Stakeholder")
+    await client.get("/api/users/me", headers=auth(user))
+
+    counts = {}
+    for size in (1, 20):
+        for i in range(size):
+            await in_review(db, await create_release(db, f"Release {size}-{i}", criteria=["A", "B"], stakeholders=[user]))
+        with query_counter:
+            response = await client.get("/api/dashboard/my-pending", headers=auth(user))
+        assert response.status_code == 200
+        counts[size] = query_counter.count
+
+    assert counts == {1: 1, 20: 1}
+
+
+async def test_releases_summary_follows_release_writes(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    first = await create_release(db, "First")
+    second = await create_release(db, "Second")
+    extra = await create_release(db, "Extra", product=await db.get(Product, first.product_id))
+
+    await client.put(f"/api/releases/{first.id}", json={"status": "in_review"}, headers=auth(admin))
+    await client.put(f"/api/releases/{first.id}", json={"status": "cancelled"}, headers=auth(admin))
+    await client.put(f"/api/releases/{second.id}", json={"name": "Renamed"}, headers=auth(admin))
+    assert (await client.delete(f"/api/releases/{extra.id}", headers=auth(admin))).status_code == 204
+    created = await client.post(
+        "/api/releases",
+        json={"product_id": second.product_id, "version": "2.0", "name": "New"},
+        headers=auth(admin),
+    )
+    assert created.status_code == 201
+
+    response = await client.get(
+        "/api/dashboard/releases-summary", params={"include_products": True}, headers=auth(admin)
+    )
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["total"] == 3
+    assert summary["by_status"] == {"draft": 2, "in_review": 0, "approved": 0, "released": 0, "cancelled": 1}
+    assert [(p["product_id"], p["total"], p["by_status"]["draft"]) for p in summary["by_product"]] == [
+        (first.product_id, 1, 0),
+        (second.product_id, 2, 2),
+    ]
+
+    # The maintained counters agree with a full rebuild
+    await recompute_release_counts(db)
+    await db.commit()
+    rebuilt = await client.get(
+        "/api/dashboard/releases-summary", params={"include_products": True}, headers=auth(admin)
+    )
+    assert rebuilt.json() == summary
+    totals_only = await client.get("/api/dashboard/releases-summary", headers=auth(admin))
+    assert totals_only.json() == {"total": 3, "by_status": summary["by_status"]}
+
+
+async def test_releases_summary_is_one_query(client, db, query_counter):
+    user = await create_user(db, "Stakeholder")
+    for i in range(5):
+        await create_release(db, f"Release {i}")
+    await client.get("/api/users/me", headers=auth(user))
+
+    with query_counter:
+        response = await client.get("/api/dashboard/releases-summary", headers=auth(user))
+
+    assert response.json()["total"] == 5
+    assert "by_product" not in response.json()
+    # One aggregate over the product counters, returning a single row
+    assert query_counter.count == 1
+
+    with query_counter:
+        response = await client.get(
+            "/api/dashboard/releases-summary", params={"include_products": True}, headers=auth(user)
+        )
+    assert len(response.json()["by_product"]) == 5
+    assert query_counter.count == 2
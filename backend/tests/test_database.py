@@ -0,0 +1,127 @@
+import asyncio
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.database import (
+    WriterQueue, async_session_maker, engine, is_statement_timeout, pool_capacity, settings, writer_queue,
+)
+from tests.factories import auth, create_user
+
+# Runs well past any sensible test deadline unless interrupted
+SLOW_QUERY = text(
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) SELECT count(*) FROM n"
+)
+
+
+async def test_sqlite_connections_get_production_pragmas():
+    async with engine.connect() as conn:
+        values = {
+            pragma: (await conn.execute(text(f"PRAGMA {pragma}"))).scalar()
+            for pragma in ("journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size")
+        }
+
+    assert values == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "busy_timeout": 5000,
+        "cache_size": -64 * 1024,
+        "mmap_size": 256 * 1024 * 1024,
+    }
+
+
+async def test_writer_queue_runs_one_writer_at_a_time_in_arrival_order():
+    queue = WriterQueue(enabled=True)
+    active, order, overlaps = [], [], []
+
+    async def writer(n):
+        async with queue.turn():
+            if active:
+                overlaps.append(n)
+            active.append(n)
+            order.append(n)
+            await asyncio.sleep(0.001)
+            active.remove(n)
+
+    await asyncio.gather(*(writer(n) for n in range(10)))
+
+    assert overlaps == []
+    assert order == list(range(10))
+
+
+async def test_write_sessions_hold_a_turn_only_while_in_a_transaction():
+    queue = WriterQueue(enabled=True)
+    async with async_session_maker() as session:
+        queue.queue_transactions(session)
+        # Work before the first statement (a network call, say) leaves the queue free
+        await asyncio.wait_for(queue.acquire(), timeout=1)
+        queue.release()
+
+        await session.execute(text("SELECT 1"))
+        other = asyncio.create_task(queue.acquire())
+        await asyncio.sleep(0.01)
+        assert not other.done()
+
+        await session.commit()
+        await asyncio.wait_for(other, timeout=1)
+        queue.release()
+
+
+async def test_reads_proceed_while_writes_wait_for_their_turn(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+
+    async with writer_queue.turn():
+        write = asyncio.create_task(client.post("/api/products", json={"name": "Queued"}, headers=auth(admin)))
+        read = await asyncio.wait_for(client.get("/api/products", headers=auth(admin)), timeout=5)
+        assert read.status_code == 200
+        await asyncio.sleep(0.05)
+        assert not write.done()
+
+    assert (await write).status_code == 201
+
+
+async def test_concurrent_writes_all_succeed(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+
+    responses = await asyncio.gather(*(
+        client.post("/api/products", json={"name": f"Product {i}"}, headers=auth(admin)) for i in range(20)
+    ))
+
+    assert [r.status_code for r in responses] == [201] * 20
+
+
+async def test_slow_sqlite_statements_are_cancelled_at_the_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "db_statement_timeout_ms", 50)
+
+    async with engine.connect() as conn:
+        with pytest.raises(OperationalError) as raised:
+            await asyncio.wait_for(conn.execute(SLOW_QUERY), timeout=10)
+        assert is_statement_timeout(raised.value)
+        await conn.rollback()
+        # The connection stays usable; only the statement was cancelled
+        assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+
+
+async def test_exhausted_pool_fails_fast_with_503(client, db, monkeypatch):
+    admin = await create_user(db, "Admin", is_admin=True)
+    await db.close()
+    monkeypatch.setattr(engine.sync_engine.pool, "_timeout", 0.05)
+
+    def sample(name):
+        return REGISTRY.get_sample_value(name) or 0.0
+
+    checked_out = sample("db_pool_connections_checked_out")
+    timeouts = sample("db_pool_checkout_timeouts_total")
+    held = [await engine.connect() for _ in range(pool_capacity)]
+    try:
+        assert sample("db_pool_connections_checked_out") == checked_out + pool_capacity
+        response = await asyncio.wait_for(client.get("/api/products", headers=auth(admin)), timeout=5)
+    finally:
+        for conn in held:
+            await conn.close()
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+    assert sample("db_pool_checkout_timeouts_total") == timeouts + 1
+    assert sample("db_pool_connections_checked_out") == checked_out
+    assert (await client.get("/api/products", headers=auth(admin))).status_code == 200
@@ -0,0 +1,105 @@
+from app.utils.etag import etag_matches, make_etag
+from tests.factories import auth, create_user, create_users, create_release
+
+
+async def conditional_get(client, url, user, etag):
+    return await client.get(url, headers={**auth(user), "If-None-Match": etag})
+
+
+def test_etag_matching():
+    class FakeRequest:
+        def __init__(self, header):
+            self.headers = {"if-none-match": header} if header is not None else {}
+
+    etag = make_etag("release", 1, 7)
+    assert etag == 'W/"release-1-7"'
+    assert etag_matches(FakeRequest('W/"release-1-7"'), etag)
+    assert etag_matches(FakeRequest('"release-1-6", "release-1-7"'), etag)
+    assert etag_matches(FakeRequest("*"), etag)
+    assert not etag_matches(FakeRequest('W/"release-1-6"'), etag)
+    assert not etag_matches(FakeRequest(None), etag)
+
+
+async def test_release_detail_and_matrix_revalidate(client, db, query_counter):
+    admin = await create_user(db, "Admin", is_admin=True)
+    stakeholder, newcomer = await create_users(db, 2)
+    release = await create_release(db, criteria=["Full Regression"], stakeholders=[stakeholder])
+    await client.get("/api/users/me", headers=auth(admin))
+
+    for url in (f"/api/releases/{release.id}", f"/api/releases/{release.id}/sign-off-matrix"):
+        first = await client.get(url, headers=auth(admin))
+        etag = first.headers["ETag"]
+
+        with query_counter:
+            unchanged = await conditional_get(client, url, admin, etag)
+        assert unchanged.status_code == 304
+        assert unchanged.headers["ETag"] == etag
+        assert unchanged.content == b""
+        assert query_counter.count == 1
+
+    # Every kind of write that changes the payload moves the tag on
+    detail_url = f"/api/releases/{release.id}"
+    criteria_id = (await client.get(detail_url, headers=auth(admin))).json()["criteria"][0]["id"]
+    writes = [
+        lambda: client.put(detail_url, json={"name": "Renamed", "status": "in_review"}, headers=auth(admin)),
+        lambda: client.post(f"/api/criteria/{criteria_id}/sign-off", json={"status": "approved", "link": "https://ci.example.com/1"}, headers=auth(stakeholder)),
+        lambda: client.delete(f"/api/criteria/{criteria_id}/sign-off", headers=auth(stakeholder)),
+        lambda: client.post(f"/api/releases/{release.id}/stakeholders", json={"user_ids": [newcomer.id]}, headers=auth(admin)),
+        lambda: client.put(f"/api/users/{newcomer.id}", json={"name": "Newcomer"}, headers=auth(admin)),
+        lambda: client.delete(f"/api/releases/{release.id}/stakeholders/{newcomer.id}", headers=auth(admin)),
+        lambda: client.post(f"/api/releases/{release.id}/criteria", json={"name": "CPT Sign-off"}, headers=auth(admin)),
+    ]
+    etag = (await client.get(detail_url, headers=auth(admin))).headers["ETag"]
+    for write in writes:
+        assert (await write()).status_code < 300
+        response = await conditional_get(client, detail_url, admin, etag)
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        etag = response.headers["ETag"]
+
+
+async def test_missing_release_is_still_404(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+
+    response = await conditional_get(client, "/api/releases/999", admin, "*")
+
+    assert response.status_code == 404
+
+
+async def test_product_and_template_lists_revalidate(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    owner = await create_user(db, "Owner")
+
+    products = await client.get("/api/products", headers=auth(admin))
+    templates = await client.get("/api/templates", headers=auth(admin))
+    assert (await conditional_get(client, "/api/products", admin, products.headers["ETag"])).status_code == 304
+    assert (await conditional_get(client, "/api/templates", admin, templates.headers["ETag"])).status_code == 304
+
+    product = (await client.post("/api/products", json={"name": "App"}, headers=auth(admin))).json()
+    etag = (await client.get("/api/products", headers=auth(admin))).headers["ETag"]
+    assert etag != products.headers["ETag"]
+    await client.post(f"/api/products/{product['id']}/permissions", json={"user_ids": [owner.id]}, headers=auth(admin))
+    response = await conditional_get(client, "/api/products", admin, etag)
+    assert response.status_code == 200
+    assert response.json()[0]["product_owners"][0]["user_id"] == owner.id
+
+    template = await client.post("/api/templates", json={"name": "Mobile", "criteria": []}, headers=auth(admin))
+    assert template.status_code == 201
+    assert (await conditional_get(client, "/api/templates", admin, templates.headers["ETag"])).status_code == 200
+
+
+async def test_google_login_with_a_new_name_moves_the_release_tags_on(client, db, google_login):
+    admin = await create_user(db, "Admin", is_admin=True)
+    stakeholder = await create_user(db, "Stakeholder")
+    release = await create_release(db, criteria=["Full Regression"], stakeholders=[stakeholder])
+    url = f"/api/releases/{release.id}"
+    etag = (await client.get(url, headers=auth(admin))).headers["ETag"]
+
+    assert (await google_login(stakeholder.email, "Stakeholder")).status_code == 200
+    assert (await conditional_get(client, url, admin, etag)).status_code == 304
+
+    assert (await google_login(stakeholder.email, "Renamed Stakeholder")).status_code == 200
+    response = await conditional_get(client, url, admin, etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "Renamed Stakeholder" in response.text
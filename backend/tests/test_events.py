@@ -0,0 +1,237 @@
+import asyncio
+import json
+import pytest
+from app.main import app
+from app.models.template import Template, TemplateCriteria
+from app.services.events import (
+    EventBus,
+    LocalEventBackend,
+    RESYNC,
+    encode_messages,
+    event_bus,
+    MAX_MESSAGE_BYTES,
+)
+from tests.factories import auth, create_user, create_users, create_release
+
+
+@pytest.fixture
+async def watch():
+    """Subscribe to a release on the app's bus; unsubscribes afterwards."""
+    subscriptions = []
+
+    async def subscribe(release_id):
+        subscription = await event_bus.subscribe(release_id)
+        subscriptions.append(subscription)
+        return subscription
+
+    yield subscribe
+    for subscription in subscriptions:
+        event_bus.unsubscribe(subscription)
+
+
+def drain(subscription):
+    events = []
+    while not subscription._queue.empty():
+        events.append(subscription._queue.get_nowait())
+    return events
+
+
+async def test_sign_off_publishes_deltas(client, db, watch):
+    user = await create_user(db, "Stakeholder")
+    release = await create_release(db, criteria=["Full Regression"], stakeholders=[user])
+    criteria_id = (await db.run_sync(lambda s: release.criteria))[0].id
+    subscription = await watch(release.id)
+
+    response = await client.post(
+        f"/api/criteria/{criteria_id}/sign-off",
+        json={"status": "approved", "link": "https://ci/1"},
+        headers=auth(user),
+    )
+    assert response.status_code == 201
+    events = drain(subscription)
+    assert [e["type"] for e in events] == ["sign_off.created", "criteria.status_changed"]
+    assert events[0]["sign_off_id"] == response.json()["id"]
+    assert events[1] == {
+        "type": "criteria.status_changed",
+        "criteria_id": criteria_id,
+        "status": "approved",
+        "release_id": release.id,
+    }
+
+    # Signing again replaces the previous sign-off
+    await client.post(
+        f"/api/criteria/{criteria_id}/sign-off",
+        json={"status": "rejected"},
+        headers=auth(user),
+    )
+    assert [e["type"] for e in drain(subscription)] == [
+        "sign_off.revoked",
+        "sign_off.created",
+        "criteria.status_changed",
+    ]
+
+    await client.delete(f"/api/criteria/{criteria_id}/sign-off", headers=auth(user))
+    events = drain(subscription)
+    assert [e["type"] for e in events] == ["sign_off.revoked", "criteria.status_changed"]
+    assert events[1]["status"] == "pending"
+
+
+async def test_stakeholder_changes_publish_deltas(client, db, watch):
+    admin = await create_user(db, "Admin", is_admin=True)
+    users = await create_users(db, 2)
+    release = await create_release(db, criteria=["Full Regression"])
+    other_release = await create_release(db, name="Other")
+    subscription = await watch(release.id)
+    other_subscription = await watch(other_release.id)
+
+    await client.post(
+        f"/api/releases/{release.id}/stakeholders",
+        json={"user_ids": [u.id for u in users]},
+        headers=auth(admin),
+    )
+    events = drain(subscription)
+    assert [e["type"] for e in events] == ["stakeholder.added", "stakeholder.added"]
+    assert events[0]["user"]["name"] == users[0].name
+
+    await client.delete(f"/api/releases/{release.id}/stakeholders/{users[0].id}", headers=auth(admin))
+    await client.post(
+        f"/api/releases/{release.id}/stakeholders/bulk-remove",
+        json={"user_ids": [users[1].id]},
+        headers=auth(admin),
+    )
+    assert [(e["type"], e["user_id"]) for e in drain(subscription)] == [
+        ("stakeholder.removed", users[0].id),
+        ("stakeholder.removed", users[1].id),
+    ]
+    assert drain(other_subscription) == []
+
+
+async def test_adding_criteria_publishes_one_message_per_release(client, db, watch, monkeypatch):
+    admin = await create_user(db, "Admin", is_admin=True)
+    template = Template(name="Platform")
+    db.add(template)
+    await db.flush()
+    db.add_all([
+        TemplateCriteria(template_id=template.id, name="Security Audit", order=0),
+        TemplateCriteria(template_id=template.id, name="Accessibility", is_mandatory=False, order=1),
+    ])
+    await db.commit()
+    has_audit = await create_release(db, "Has audit", criteria=["Security Audit"])
+    empty = await create_release(db, "Empty")
+    untouched = await create_release(db, "Untouched")
+    subscriptions = {release.id: await watch(release.id) for release in (has_audit, empty, untouched)}
+    published = []
+    real_publish = event_bus.publish
+
+    async def record_publish(release_id, release_events):
+        published.append(release_id)
+        await real_publish(release_id, release_events)
+
+    monkeypatch.setattr(event_bus, "publish", record_publish)
+    response = await client.post(
+        f"/api/templates/{template.id}/apply", json={"release_ids": [has_audit.id, empty.id]}, headers=auth(admin)
+    )
+
+    assert response.status_code == 200
+    assert published == [has_audit.id, empty.id]
+    added = {release_id: drain(s) for release_id, s in subscriptions.items()}
+    assert [(e["type"], e["criteria"]["name"]) for e in added[has_audit.id]] == [("criteria.added", "Accessibility")]
+    assert [e["criteria"]["name"] for e in added[empty.id]] == ["Security Audit", "Accessibility"]
+    assert added[empty.id][1]["criteria"]["is_mandatory"] is False
+    assert added[empty.id][1]["criteria"]["status"] == "pending"
+    assert added[untouched.id] == []
+
+    response = await client.post(
+        f"/api/releases/{untouched.id}/criteria", json={"name": "Custom check"}, headers=auth(admin)
+    )
+    assert [(e["type"], e["criteria"]["id"]) for e in drain(subscriptions[untouched.id])] == [
+        ("criteria.added", response.json()["id"]),
+    ]
+
+
+async def open_stream(path, headers):
+    """Drive a streaming request through the raw ASGI interface."""
+    messages: asyncio.Queue = asyncio.Queue()
+    disconnected = asyncio.Event()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    task = asyncio.create_task(app(scope, receive, messages.put))
+    return messages, disconnected, task
+
+
+async def next_frame(messages):
+    while True:
+        message = await asyncio.wait_for(messages.get(), timeout=5)
+        if message["type"] == "http.response.body" and message.get("body", b"").startswith(b"event:"):
+            return message["body"].decode()
+
+
+async def test_event_stream_forwards_published_events(db):
+    user = await create_user(db, "Viewer")
+    release = await create_release(db)
+
+    messages, disconnected, task = await open_stream(f"/api/releases/{release.id}/events", auth(user))
+    start = await asyncio.wait_for(messages.get(), timeout=5)
+    assert start["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+    assert (await next_frame(messages)).startswith("event: ready\n")
+
+    await event_bus.publish(release.id, [{"type": "stakeholder.removed", "user_id": 7}])
+    frame = await next_frame(messages)
+    event_line, data_line = frame.strip().split("\n")
+    assert event_line == "event: stakeholder.removed"
+    assert json.loads(data_line[len("data: "):]) == {
+        "type": "stakeholder.removed",
+        "user_id": 7,
+        "release_id": release.id,
+    }
+
+    disconnected.set()
+    await asyncio.wait_for(task, timeout=5)
+    assert event_bus.subscriber_count(release.id) == 0
+
+
+async def test_event_stream_unknown_release(client, db):
+    user = await create_user(db, "Viewer")
+
+    response = await client.get("/api/releases/999/events", headers=auth(user))
+
+    assert response.status_code == 404
+
+
+async def test_slow_subscriber_gets_resync():
+    bus = EventBus(LocalEventBackend(), max_queue=3)
+    subscription = await bus.subscribe(1)
+
+    await bus.publish(1, [{"type": "stakeholder.removed", "user_id": i} for i in range(5)])
+
+    events = drain(subscription)
+    assert events[0] == {"type": RESYNC, "release_id": 1}
+    assert [e["user_id"] for e in events[1:]] == [4]
+
+
+def test_large_batches_are_split_under_notify_limit():
+    events = [{"type": "stakeholder.removed", "user_id": i, "padding": "x" * 200} for i in range(200)]
+
+    messages = encode_messages(1, events)
+
+    assert len(messages) > 1
+    assert all(len(m.encode()) <= MAX_MESSAGE_BYTES for m in messages)
+    assert sum(len(json.loads(m)["events"]) for m in messages) == len(events)
@@ -0,0 +1,150 @@
+import asyncio
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import crypt, jwt as google_jwt
+from app.utils.google_auth import GoogleTokenVerifier, GoogleCertsUnavailableError
+
+
+def make_key(key_id: str):
+    """Return (signer, PEM certificate) for a throwaway RSA key."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(1)
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    return crypt.RSASigner.from_string(pem, key_id=key_id), cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class CertsServer:
+    """Local stand-in for Google's certs endpoint."""
+
+    def __init__(self, certs, max_age=3600, age=0):
+        self.certs = certs
+        self.max_age = max_age
+        self.age = age
+        self.hits = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.hits += 1
+                body = json.dumps(server.certs).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={server.max_age}, must-revalidate")
+                self.send_header("Age", str(server.age))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/oauth2/v1/certs"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def make_token(signer, audience="client-id", issuer="https://accounts.google.com"):
+    now = int(time.time())
+    claims = {"iss": issuer, "aud": audience, "sub": "123", "email": "a@example.com", "iat": now, "exp": now + 600}
+    return google_jwt.encode(signer, claims).decode()
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return make_key("key-1"), make_key("key-2")
+
+
+@pytest.fixture
+def certs_server(keys):
+    (_, cert1), _ = keys
+    server = CertsServer({"key-1": cert1})
+    yield server
+    server.close()
+
+
+async def test_concurrent_logins_share_one_fetch(keys, certs_server):
+    (signer, _), _ = keys
+    verifier = GoogleTokenVerifier(certs_server.url)
+
+    results = await asyncio.gather(*[verifier.verify(make_token(signer), "client-id") for _ in range(20)])
+
+    assert all(r["sub"] == "123" for r in results)
+    assert certs_server.hits == 1
+
+
+async def test_cache_lifetime_honours_max_age_and_age(keys, certs_server):
+    (signer, _), _ = keys
+    certs_server.max_age, certs_server.age = 600, 100
+    verifier = GoogleTokenVerifier(certs_server.url)
+
+    await verifier.verify(make_token(signer), "client-id")
+
+    assert 490 < verifier._expires_at - time.monotonic() <= 500
+
+
+async def test_rejects_wrong_audience_and_issuer(keys, certs_server):
+    (signer, _), _ = keys
+    verifier = GoogleTokenVerifier(certs_server.url)
+
+    with pytest.raises(ValueError):
+        await verifier.verify(make_token(signer, audience="someone-else"), "client-id")
+    with pytest.raises(ValueError):
+        await verifier.verify(make_token(signer, issuer="https://evil.example.com"), "client-id")
+
+
+async def test_refetches_once_on_key_rotation(keys, certs_server):
+    (_, cert1), (signer2, cert2) = keys
+    verifier = GoogleTokenVerifier(certs_server.url, min_refetch_interval=0)
+    await verifier.get_certs()
+
+    certs_server.certs = {"key-1": cert1, "key-2": cert2}
+    claims = await verifier.verify(make_token(signer2), "client-id")
+
+    assert claims["sub"] == "123"
+    assert certs_server.hits == 2
+
+
+async def test_refreshes_in_background_near_expiry(keys, certs_server):
+    (signer, _), _ = keys
+    verifier = GoogleTokenVerifier(certs_server.url, refresh_margin=60)
+    await verifier.get_certs()
+    verifier._expires_at = time.monotonic() + 30  # inside the refresh margin
+
+    await verifier.verify(make_token(signer), "client-id")
+    await verifier._refresh_task
+
+    assert certs_server.hits == 2
+    assert verifier._expires_at - time.monotonic() > 60
+
+
+async def test_unreachable_endpoint_without_cache(keys):
+    (signer, _), _ = keys
+    server = CertsServer({})
+    url = server.url
+    server.close()
+    verifier = GoogleTokenVerifier(url, timeout=1)
+
+    with pytest.raises(GoogleCertsUnavailableError):
+        await verifier.verify(make_token(signer), "client-id")
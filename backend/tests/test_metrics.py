@@ -0,0 +1,109 @@
+import asyncio
+import os
+import subprocess
+import sys
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.services.metrics import statement_operation
+from tests.factories import auth, create_user, create_release
+from tests.test_events import open_stream
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_request_metrics_use_route_template(client, db, query_counter):
+    user = await create_user(db, "Viewer")
+    release = await create_release(db, criteria=["Full Regression"], stakeholders=[user])
+    labels = {"method": "GET", "route": "/api/releases/{release_id}"}
+    requests_before = sample("http_requests_total", status="200", **labels)
+    statements_before = sample("http_request_db_statements_sum", **labels)
+    waits_before = sample("db_pool_checkout_wait_seconds_count")
+
+    with query_counter:
+        response = await client.get(f"/api/releases/{release.id}", headers=auth(user))
+
+    assert response.status_code == 200
+    assert sample("http_requests_total", status="200", **labels) == requests_before + 1
+    assert sample("http_request_duration_seconds_count", **labels) >= 1
+    assert sample("http_request_db_statements_sum", **labels) - statements_before == query_counter.count
+    assert sample("db_pool_checkout_wait_seconds_count") > waits_before
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+
+async def test_unknown_paths_share_one_label(client):
+    before = sample("http_requests_total", method="GET", route="<unmatched>", status="404")
+
+    await client.get("/no/such/path/1")
+    await client.get("/no/such/path/2")
+
+    assert sample("http_requests_total", method="GET", route="<unmatched>", status="404") == before + 2
+
+
+async def test_metrics_endpoint_serves_prometheus_text(client):
+    await client.get("/health")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/health"}' in response.text
+    assert "db_pool_checkout_wait_seconds_bucket" in response.text
+
+
+async def test_event_streams_leave_the_in_flight_gauge_once_started(db):
+    user = await create_user(db, "Viewer")
+    release = await create_release(db)
+    labels = {"method": "GET", "route": "/api/releases/{release_id}/events"}
+    durations_before = sample("http_request_duration_seconds_count", **labels)
+
+    messages, disconnected, task = await open_stream(f"/api/releases/{release.id}/events", auth(user))
+    start = await asyncio.wait_for(messages.get(), timeout=5)
+    assert start["status"] == 200
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+    disconnected.set()
+    await asyncio.wait_for(task, timeout=5)
+    assert sample("http_requests_in_progress", method="GET") == 0
+    assert sample("http_request_duration_seconds_count", **labels) == durations_before + 1
+
+
+async def test_failed_statements_leave_no_timing_state_behind(db, query_counter):
+    connection = await db.connection()
+    selects_before = sample("db_statement_duration_seconds_count", operation="SELECT")
+
+    for _ in range(3):
+        with pytest.raises(OperationalError):
+            await connection.execute(text("SELECT * FROM no_such_table"))
+    with query_counter:
+        await connection.execute(text("SELECT 1"))
+
+    assert not any("query_start" in str(key) for key in connection.info)
+    assert query_counter.count == 1
+    assert sample("db_statement_duration_seconds_count", operation="SELECT") == selects_before + 1
+
+
+def test_statement_operation_labels():
+    assert statement_operation("  select 1") == "SELECT"
+    assert statement_operation("INSERT INTO x VALUES (1)") == "INSERT"
+    assert statement_operation("PRAGMA foreign_keys=ON") == "OTHER"
+
+
+def test_multiprocess_metrics_are_aggregated(tmp_path):
+    """Samples written by separate worker processes are summed by /metrics."""
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    record = (
+        "from app.services.metrics import HTTP_REQUESTS; "
+        "HTTP_REQUESTS.labels('GET', '/health', '200').inc(3)"
+    )
+    render = "from app.services.metrics import render_metrics; print(render_metrics()[0].decode())"
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", record], env=env, check=True)
+    output = subprocess.run(
+        [sys.executable, "-c", render], env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+    assert 'http_requests_total{method="GET",route="/health",status="200"} 6.0' in output
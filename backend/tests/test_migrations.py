@@ -0,0 +1,46 @@
+from datetime import datetime
+from pathlib import Path
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "alembic"
+
+
+def alembic_config(url: str) -> Config:
+    # No ini file, so env.py leaves the test run's logging alone
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def test_audit_log_release_id_backfill(tmp_path):
+    url = f"sqlite:///{tmp_path}/migrations.db"
+    config = alembic_config(url)
+    command.upgrade(config, "27ab7cbdd29b")
+
+    engine = sa.create_engine(url)
+    with engine.begin() as conn:
+        audit_logs = sa.Table("audit_logs", sa.MetaData(), autoload_with=conn)
+        now = datetime(2026, 10, 1)
+        rows = [
+            (1, "release", 7, None, None),
+            (2, "release_criteria", 3, None, {"release_id": 7, "name": "Content Review"}),
+            (3, "release_stakeholder", 4, {"release_id": 8}, None),
+            (4, "product", 1, None, {"name": "Mobile"}),
+        ]
+        conn.execute(audit_logs.insert(), [
+            {"id": id_, "entity_type": entity_type, "entity_id": entity_id, "action": "update",
+             "old_value": old_value, "new_value": new_value, "timestamp": now}
+            for id_, entity_type, entity_id, old_value, new_value in rows
+        ])
+
+    command.upgrade(config, "6e1f0a2b7c9d")
+
+    with engine.connect() as conn:
+        rows = conn.execute(sa.text("SELECT id, release_id FROM audit_logs ORDER BY id")).all()
+        indexes = {index["name"] for index in sa.inspect(conn).get_indexes("audit_logs")}
+    engine.dispose()
+    assert rows == [(1, 7), (2, 7), (3, 8), (4, None)]
+    assert "ix_audit_logs_release_id_timestamp" in indexes
@@ -0,0 +1,166 @@
+from sqlalchemy import select, func
+from app.models.product import Product
+from app.models.product_permission import ProductPermission
+from app.models.user import User, UserRole
+from app.services.permissions import sync_roles
+from app.services.user_cache import user_cache
+from tests.factories import auth, create_user, create_users
+
+
+async def create_products(db, count: int, prefix: str = "Product"):
+    products = [Product(name=f"{prefix} {i}") for i in range(count)]
+    db.add_all(products)
+    await db.commit()
+    return products
+
+
+async def roles(db, users):
+    result = await db.execute(select(User.id, User.role).where(User.id.in_([u.id for u in users])))
+    return dict(result.all())
+
+
+async def permission_pairs(db):
+    result = await db.execute(select(ProductPermission.product_id, ProductPermission.user_id))
+    return set(result.all())
+
+
+async def test_grant_product_owner_on_all_products_skips_existing(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    user = await create_user(db, "Owner")
+    products = await create_products(db, 3)
+    db.add(ProductPermission(product_id=products[0].id, user_id=user.id, granted_by_id=admin.id))
+    await db.commit()
+
+    response = await client.post(f"/api/users/{user.id}/grant-product-owner", headers=auth(admin))
+
+    assert response.status_code == 200
+    assert await permission_pairs(db) == {(p.id, user.id) for p in products}
+    assert (await roles(db, [user]))[user.id] == UserRole.PRODUCT_OWNER
+
+    response = await client.delete(f"/api/users/{user.id}/revoke-product-owner", headers=auth(admin))
+
+    assert response.status_code == 200
+    assert await permission_pairs(db) == set()
+    assert (await roles(db, [user]))[user.id] == UserRole.STAKEHOLDER
+
+
+async def test_grant_product_owner_round_trips_are_constant(client, db, query_counter):
+    admin = await create_user(db, "Admin", is_admin=True)
+    await client.get("/api/users/me", headers=auth(admin))
+    # The first write also creates the products change counter
+    await client.post("/api/products", json={"name": "Warm-up"}, headers=auth(admin))
+
+    counts = {}
+    for size in (1, 50):
+        await create_products(db, size, prefix=f"Batch {size}")
+        user = await create_user(db, f"Owner {size}")
+        with query_counter:
+            response = await client.post(f"/api/users/{user.id}/grant-product-owner", headers=auth(admin))
+        assert response.status_code == 200
+        counts[size] = query_counter.count
+
+    assert counts[1] == counts[50], counts
+    assert await db.scalar(select(func.count()).select_from(ProductPermission)) == 2 + 52  # each owner gets every product that exists at the time
+
+
+async def test_grant_product_permissions_keeps_caller_order(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    users = await create_users(db, 3)
+    product = (await create_products(db, 1))[0]
+    db.add(ProductPermission(product_id=product.id, user_id=users[1].id, granted_by_id=admin.id))
+    await db.commit()
+
+    response = await client.post(
+        f"/api/products/{product.id}/permissions",
+        json={"user_ids": [users[2].id, users[1].id, users[0].id]},
+        headers=auth(admin),
+    )
+
+    assert response.status_code == 201
+    assert [p["user_id"] for p in response.json()] == [users[2].id, users[0].id]
+    assert all(p["granted_by_id"] == admin.id for p in response.json())
+    assert set((await roles(db, [users[0], users[2]])).values()) == {UserRole.PRODUCT_OWNER}
+
+
+async def test_bulk_grant_and_revoke(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    users = await create_users(db, 3)
+    products = await create_products(db, 4)
+    user_ids = [u.id for u in users[:2]]
+
+    response = await client.post(
+        "/api/product-permissions/bulk",
+        json={"action": "grant", "user_ids": user_ids, "product_ids": [p.id for p in products]},
+        headers=auth(admin),
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"action": "grant", "changed": 8}
+    assert await roles(db, users) == {
+        users[0].id: UserRole.PRODUCT_OWNER,
+        users[1].id: UserRole.PRODUCT_OWNER,
+        users[2].id: UserRole.STAKEHOLDER,
+    }
+
+    # Revoking some products keeps the role; revoking the rest drops it
+    response = await client.post(
+        "/api/product-permissions/bulk",
+        json={"action": "revoke", "user_ids": [users[0].id], "product_ids": [p.id for p in products[:3]]},
+        headers=auth(admin),
+    )
+    assert response.json() == {"action": "revoke", "changed": 3}
+    assert (await roles(db, users))[users[0].id] == UserRole.PRODUCT_OWNER
+
+    response = await client.post(
+        "/api/product-permissions/bulk",
+        json={"action": "revoke", "user_ids": [users[0].id], "product_ids": [products[3].id]},
+        headers=auth(admin),
+    )
+    assert response.json() == {"action": "revoke", "changed": 1}
+    assert (await roles(db, users))[users[0].id] == UserRole.STAKEHOLDER
+    assert await permission_pairs(db) == {(p.id, users[1].id) for p in products}
+
+
+async def test_bulk_rejects_unknown_ids_and_non_admins(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    user = await create_user(db, "Stakeholder")
+    product = (await create_products(db, 1))[0]
+
+    unknown_user = await client.post(
+        "/api/product-permissions/bulk",
+        json={"action": "grant", "user_ids": [user.id, 9999], "product_ids": [product.id]},
+        headers=auth(admin),
+    )
+    unknown_product = await client.post(
+        "/api/product-permissions/bulk",
+        json={"action": "grant", "user_ids": [user.id], "product_ids": [product.id, 9999]},
+        headers=auth(admin),
+    )
+    forbidden = await client.post(
+        "/api/product-permissions/bulk",
+        json={"action": "grant", "user_ids": [user.id], "product_ids": [product.id]},
+        headers=auth(user),
+    )
+
+    assert unknown_user.status_code == 400
+    assert unknown_product.status_code == 400
+    assert forbidden.status_code == 403
+    assert await permission_pairs(db) == set()
+
+
+async def test_cached_identity_is_dropped_only_when_role_change_commits(client, db):
+    user = await create_user(db, "Owner")
+    user_id = user.id
+    await client.get("/api/users/me", headers=auth(user))
+    assert user_cache.get(user_id) is not None
+
+    # Until the commit, the cached copy still matches what other requests can read
+    await sync_roles(db, [user_id])
+    assert user_cache.get(user_id) is not None
+    await db.rollback()
+    await db.commit()
+    assert user_cache.get(user_id) is not None
+
+    await sync_roles(db, [user_id])
+    await db.commit()
+    assert user_cache.get(user_id) is None
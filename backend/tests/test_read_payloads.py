@@ -0,0 +1,85 @@
+from datetime import date
+from sqlalchemy import insert, select
+from app.models.release import ReleaseCriteria
+from app.schemas.release import ReleaseDetailResponse, ReleaseSignOffMatrixResponse
+from tests.factories import auth, create_user, create_users, create_release
+
+
+async def signed_off_release(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    alice, bob = await create_users(db, 2)
+    release = await create_release(
+        db, criteria=["Custom check", "Bug Verification", "Content Review"], stakeholders=[alice, bob]
+    )
+    url = f"/api/releases/{release.id}"
+    await client.put(url, json={"status": "in_review", "target_date": "2026-11-02"}, headers=auth(admin))
+    criteria = {c["name"]: c["id"] for c in (await client.get(url, headers=auth(admin))).json()["criteria"]}
+    sign_off = lambda name, user, body: client.post(f"/api/criteria/{criteria[name]}/sign-off", json=body, headers=auth(user))
+    await sign_off("Content Review", alice, {"status": "approved", "comment": "Looks good ✓"})
+    await sign_off("Content Review", bob, {"status": "approved"})
+    await sign_off("Bug Verification", alice, {"status": "rejected", "comment": "Crash on start"})
+    await client.delete(f"/api/criteria/{criteria['Bug Verification']}/sign-off", headers=auth(alice))
+    await sign_off("Bug Verification", alice, {"status": "approved"})
+    await client.put(
+        f"/api/releases/{release.id}/criteria/{criteria['Custom check']}", json={"status": "blocked"}, headers=auth(admin)
+    )
+    return admin, alice, bob, release
+
+
+async def test_detail_payload_matches_response_model(client, db):
+    admin, alice, bob, release = await signed_off_release(client, db)
+
+    body = (await client.get(f"/api/releases/{release.id}", headers=auth(admin))).json()
+
+    assert ReleaseDetailResponse.model_validate(body).model_dump(mode="json") == body
+    assert body["target_date"] == date(2026, 11, 2).isoformat()
+    assert [c["name"] for c in body["criteria"]] == ["Content Review", "Bug Verification", "Custom check"]
+    assert [c["status"] for c in body["criteria"]] == ["approved", "pending", "blocked"]
+    # Revoked sign-offs stay in the history
+    assert [s["status"] for s in body["criteria"][1]["sign_offs"]] == ["revoked", "approved"]
+    assert body["criteria"][0]["sign_offs"][0]["comment"] == "Looks good ✓"
+    assert [s["user"]["name"] for s in body["stakeholders"]] == [alice.name, bob.name]
+    assert body["progress"]["mandatory_total"] == 3
+
+
+async def test_matrix_payload_matches_response_model(client, db):
+    admin, alice, bob, release = await signed_off_release(client, db)
+
+    body = (await client.get(f"/api/releases/{release.id}/sign-off-matrix", headers=auth(admin))).json()
+
+    assert ReleaseSignOffMatrixResponse.model_validate(body).model_dump(mode="json") == body
+    assert [s["id"] for s in body["stakeholders"]] == [alice.id, bob.id]
+    rows = {c["criteria_name"]: c for c in body["criteria_matrix"]}
+    assert list(rows) == ["Content Review", "Bug Verification", "Custom check"]
+    assert rows["Content Review"]["computed_status"] == "approved"
+    assert [s["status"] for s in rows["Bug Verification"]["stakeholder_signoffs"]] == ["approved", None]
+    assert rows["Custom check"]["stakeholder_signoffs"][0] == {
+        "user_id": alice.id,
+        "user_name": alice.name,
+        "user_email": alice.email,
+        "status": None,
+        "comment": None,
+        "link": None,
+        "signed_at": None,
+    }
+
+
+async def test_criteria_follow_their_stored_sort_key(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    release = await create_release(db, criteria=["beta", "Security Audit", "Alpha"])
+    url = f"/api/releases/{release.id}"
+    await db.execute(insert(ReleaseCriteria), [{"release_id": release.id, "name": "Content Review"}])
+    await db.commit()
+    await client.post(f"{url}/criteria", json={"name": "Bug Verification"}, headers=auth(admin))
+
+    names = lambda body: [c["name"] for c in body["criteria"]]
+    detail = (await client.get(url, headers=auth(admin))).json()
+    assert names(detail) == ["Content Review", "Bug Verification", "Security Audit", "Alpha", "beta"]
+
+    beta = next(c["id"] for c in detail["criteria"] if c["name"] == "beta")
+    await client.put(f"{url}/criteria/{beta}", json={"name": "Full Regression"}, headers=auth(admin))
+    detail = (await client.get(url, headers=auth(admin))).json()
+    assert names(detail) == ["Content Review", "Bug Verification", "Full Regression", "Security Audit", "Alpha"]
+    matrix = (await client.get(f"{url}/sign-off-matrix", headers=auth(admin))).json()
+    assert [c["criteria_name"] for c in matrix["criteria_matrix"]] == names(detail)
+    assert await db.scalar(select(ReleaseCriteria.sort_key).where(ReleaseCriteria.id == beta)) == "0:03"
@@ -0,0 +1,80 @@
+from typing import List
+from pydantic import TypeAdapter
+from app.models.product import Product
+from app.models.product_permission import ProductPermission
+from app.schemas.product import ProductResponse
+from app.schemas.release import ReleaseResponse
+from app.schemas.user import UserResponse
+from tests.factories import auth, create_user, create_users, create_release
+
+
+def assert_matches_model(body, model):
+    adapter = TypeAdapter(List[model])
+    assert adapter.dump_python(adapter.validate_python(body), mode="json") == body
+
+
+async def fetch_all_pages(client, url, user, limit):
+    items, params = [], {"limit": limit}
+    while True:
+        response = await client.get(url, params=params, headers=auth(user))
+        assert response.status_code == 200
+        items += response.json()
+        if "X-Next-Cursor" not in response.headers:
+            return items
+        params = {"limit": limit, "cursor": response.headers["X-Next-Cursor"]}
+
+
+async def test_release_and_user_lists_page_by_cursor(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    users = await create_users(db, 4)
+    product = Product(name="App")
+    db.add(product)
+    await db.flush()
+    releases = [await create_release(db, name=f"Release {i}", product=product) for i in range(5)]
+
+    listed_releases = await fetch_all_pages(client, "/api/releases", admin, limit=2)
+    listed_users = await fetch_all_pages(client, "/api/users", admin, limit=2)
+
+    assert [r["id"] for r in listed_releases] == [r.id for r in reversed(releases)]
+    assert_matches_model(listed_releases, ReleaseResponse)
+    assert [u["id"] for u in listed_users] == [admin.id] + [u.id for u in users]
+    assert_matches_model(listed_users, UserResponse)
+
+
+async def test_product_list_includes_owners(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    owners = await create_users(db, 2)
+    products = [Product(name=name) for name in ("Beta", "Alpha", "Gamma")]
+    db.add_all(products)
+    await db.flush()
+    db.add_all([
+        ProductPermission(product_id=products[0].id, user_id=owners[0].id, granted_by_id=admin.id),
+        ProductPermission(product_id=products[0].id, user_id=owners[1].id, granted_by_id=admin.id),
+        ProductPermission(product_id=products[2].id, user_id=owners[1].id, granted_by_id=admin.id),
+    ])
+    await db.commit()
+
+    response = await client.get("/api/products", params={"limit": 2}, headers=auth(admin))
+
+    body = response.json()
+    assert [p["name"] for p in body] == ["Alpha", "Beta"]
+    assert body[0]["product_owners"] == []
+    assert [o["user_id"] for o in body[1]["product_owners"]] == [owners[0].id, owners[1].id]
+    assert_matches_model(body, ProductResponse)
+
+
+async def test_product_pages_use_the_same_total_order(client, db, query_counter):
+    admin = await create_user(db, "Admin", is_admin=True)
+    names = ["Delta", "alpha", "Charlie", "Bravo", "echo"]
+    db.add_all([Product(name=name) for name in names])
+    await db.commit()
+
+    listed = []
+    for skip in range(0, len(names), 2):
+        with query_counter:
+            response = await client.get("/api/products", params={"skip": skip, "limit": 2}, headers=auth(admin))
+        listed += [p["name"] for p in response.json()]
+        ordered = [s for s in query_counter.statements if "FROM products" in s]
+        assert ordered and all("ORDER BY products.name, products.id" in s for s in ordered)
+
+    assert listed == sorted(names)
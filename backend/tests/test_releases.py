@@ -0,0 +1,148 @@
+from sqlalchemy import column, func, literal, select
+from sqlalchemy.dialects import postgresql
+from app.models.audit import AuditLog
+from app.models.product_permission import ProductPermission
+from app.models.release import ReleaseCriteria
+from app.models.template import Template, TemplateCriteria
+from app.utils.criteria_order import criteria_sort_key, criteria_sort_key_sql
+from tests.factories import auth, create_user, create_users, create_release
+
+
+async def create_template(db, criteria):
+    template = Template(name="Platform")
+    db.add(template)
+    await db.flush()
+    for order, (name, is_mandatory, owner) in enumerate(criteria):
+        db.add(TemplateCriteria(
+            template_id=template.id, name=name, is_mandatory=is_mandatory,
+            default_owner_id=owner.id if owner else None, order=order,
+        ))
+    await db.commit()
+    return template
+
+
+async def test_create_release_from_template_round_trips_are_constant(client, db, query_counter):
+    """Benchmark: a template with 1 or 60 criteria costs the same number of statements."""
+    admin = await create_user(db, "Admin", is_admin=True)
+    await client.get("/api/users/me", headers=auth(admin))
+    release = await create_release(db)
+
+    counts = {}
+    for size in (1, 60):
+        template = await create_template(db, [(f"Check {i}", i % 2 == 0, admin) for i in range(size)])
+        with query_counter:
+            response = await client.post(
+                "/api/releases",
+                json={"product_id": release.product_id, "version": "2.0", "name": f"Size {size}",
+                      "template_id": template.id, "candidate_build": "rc1"},
+                headers=auth(admin),
+            )
+        assert response.status_code == 201
+        body = response.json()
+        assert len(body["criteria"]) == size
+        assert {c["owner_id"] for c in body["criteria"]} == {admin.id}
+        assert body["progress"]["mandatory_total"] + body["progress"]["optional_total"] == size
+        assert body["candidate_build"] == "rc1"
+        counts[size] = query_counter.count
+
+    assert counts[1] == counts[60], counts
+
+
+async def test_copied_criteria_get_the_same_sort_key_as_orm_created_ones(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    names = ["Évaluation Finale", "ÜBERPRÜFUNG", "Zulu"]
+    template = await create_template(db, [(name, True, None) for name in names])
+    source = await create_release(db, "Source", criteria=names)
+
+    created = await client.post(
+        "/api/releases",
+        json={"product_id": source.product_id, "version": "2.0", "name": "From template", "template_id": template.id},
+        headers=auth(admin),
+    )
+    cloned = await client.post(f"/api/releases/{source.id}/clone", json={"version": "3.0", "name": "Clone"}, headers=auth(admin))
+
+    for release_id in (source.id, created.json()["id"], cloned.json()["id"]):
+        rows = (await db.execute(
+            select(ReleaseCriteria.name, ReleaseCriteria.sort_key).where(ReleaseCriteria.release_id == release_id)
+        )).all()
+        assert sorted(rows) == sorted((name, criteria_sort_key(name)) for name in names)
+    assert [c["name"] for c in created.json()["criteria"]] == ["Zulu", "Évaluation Finale", "ÜBERPRÜFUNG"]
+
+
+async def test_sql_sort_keys_fold_non_ascii_without_replacing_lower(db):
+    # SQLite's own lower() keeps folding ASCII only; keys use py_lower()
+    assert await db.scalar(select(func.lower(literal("ÉCLAIR")))) == "Éclair"
+    assert await db.scalar(select(criteria_sort_key_sql(literal("ÉCLAIR")))) == criteria_sort_key("ÉCLAIR")
+    # PostgreSQL folds under an explicit ICU collation, not the database default
+    compiled = str(criteria_sort_key_sql(column("name")).compile(dialect=postgresql.dialect()))
+    assert 'lower((name) COLLATE "und-x-icu")' in compiled
+
+
+async def test_clone_release_copies_criteria_stakeholders_and_build(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    alice, bob = await create_users(db, 2)
+    source = await create_release(db, "2.0", criteria=["Security Audit", "Content Review"], stakeholders=[alice, bob])
+    url = f"/api/releases/{source.id}"
+    await client.put(url, json={"candidate_build": "build-42", "target_date": "2026-12-01"}, headers=auth(admin))
+    criteria = (await client.get(url, headers=auth(admin))).json()["criteria"]
+    await client.put(f"{url}/criteria/{criteria[1]['id']}", json={"owner_id": bob.id}, headers=auth(admin))
+    await client.post(f"/api/criteria/{criteria[0]['id']}/sign-off", json={"status": "approved"}, headers=auth(alice))
+
+    response = await client.post(
+        f"{url}/clone", json={"version": "2.1", "name": "2.1", "target_date": None}, headers=auth(admin)
+    )
+
+    assert response.status_code == 201
+    clone = response.json()
+    assert (clone["version"], clone["candidate_build"], clone["target_date"]) == ("2.1", "build-42", None)
+    assert [(c["name"], c["owner_id"], c["status"], c["sign_offs"]) for c in clone["criteria"]] == [
+        ("Content Review", None, "pending", []),
+        ("Security Audit", bob.id, "pending", []),
+    ]
+    assert [s["user_id"] for s in clone["stakeholders"]] == [alice.id, bob.id]
+    assert clone["progress"]["mandatory_total"] == 2 and clone["progress"]["mandatory_approved"] == 0
+    audit = await db.scalar(select(AuditLog.new_value).where(AuditLog.entity_id == clone["id"], AuditLog.entity_type == "release"))
+    assert audit["cloned_from_id"] == source.id
+
+    without = await client.post(
+        f"{url}/clone", json={"version": "2.2", "name": "2.2", "include_stakeholders": False}, headers=auth(admin)
+    )
+    assert without.json()["stakeholders"] == []
+    assert (await client.post(f"{url}/clone", json={"version": "3", "name": "3"}, headers=auth(alice))).status_code == 403
+    db.add(ProductPermission(product_id=source.product_id, user_id=alice.id, granted_by_id=admin.id))
+    await db.commit()
+    assert (await client.post(f"{url}/clone", json={"version": "3", "name": "3"}, headers=auth(alice))).status_code == 201
+    assert (await client.post("/api/releases/9999/clone", json={"version": "3", "name": "3"}, headers=auth(alice))).status_code == 404
+
+
+async def test_apply_template_adds_missing_criteria_to_many_releases(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    user = await create_user(db, "Stakeholder")
+    template = await create_template(db, [("Security Audit", True, None), ("Accessibility", False, user)])
+    has_audit = await create_release(db, "Has audit", criteria=["Security Audit"], stakeholders=[user])
+    empty = await create_release(db, "Empty")
+    criteria = (await client.get(f"/api/releases/{has_audit.id}", headers=auth(admin))).json()["criteria"]
+    await client.post(f"/api/criteria/{criteria[0]['id']}/sign-off", json={"status": "approved"}, headers=auth(user))
+
+    url = f"/api/templates/{template.id}/apply"
+    response = await client.post(url, json={"release_ids": [empty.id, has_audit.id]}, headers=auth(admin))
+
+    assert response.status_code == 200
+    # In the order the releases were given
+    assert response.json() == {"criteria_added": 3, "releases_updated": [empty.id, has_audit.id]}
+    for release, expected in ((has_audit, (1, 1, 1, 0)), (empty, (1, 0, 1, 0))):
+        body = (await client.get(f"/api/releases/{release.id}", headers=auth(admin))).json()
+        assert [c["name"] for c in body["criteria"]] == ["Security Audit", "Accessibility"]
+        progress = body["progress"]
+        assert (
+            progress["mandatory_total"], progress["mandatory_approved"],
+            progress["optional_total"], progress["optional_approved"],
+        ) == expected
+    audited = (await db.scalars(select(AuditLog.release_id).where(AuditLog.entity_type == "release_criteria"))).all()
+    assert sorted(audited) == sorted([has_audit.id, empty.id, empty.id])
+
+    again = await client.post(url, json={"release_ids": [has_audit.id, empty.id]}, headers=auth(admin))
+    assert again.json() == {"criteria_added": 0, "releases_updated": []}
+    invalid = await client.post(url, json={"release_ids": [empty.id, 9999]}, headers=auth(admin))
+    assert invalid.status_code == 400
+    assert (await client.post(url, json={"release_ids": [empty.id]}, headers=auth(user))).status_code == 403
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import httpx
+import pytest
+from sqlalchemy import delete, func, select
+from starlette.requests import Request
+from app import database
+from app.main import app
+from app.models.release_snapshot import ReleaseSnapshot
+from app.utils.jwt import create_access_token
+from tests.factories import auth, create_user, create_release
+
+
+class SqliteReplica:
+    """A second SQLite file serving reads, which only catches up when replicate() copies the primary."""
+
+    def __init__(self):
+        self.path = os.path.join(tempfile.mkdtemp(prefix="release-tracker-replica-"), "replica.db")
+        self.engine = database.make_engine(f"sqlite+aiosqlite:///{self.path}")
+
+    async def replicate(self):
+        await self.engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+        async with database.engine.connect() as conn:
+            await conn.exec_driver_sql(f"VACUUM INTO '{self.path}'")
+
+
+@pytest.fixture
+async def replica(monkeypatch):
+    replica = SqliteReplica()
+    await replica.replicate()
+    monkeypatch.setattr(database, "replica_engines", [replica.engine])
+    yield replica
+    await replica.engine.dispose()
+
+
+async def product_names(client, user):
+    response = await client.get("/api/products", headers=auth(user))
+    assert response.status_code == 200
+    return {p["name"] for p in response.json()}
+
+
+async def test_reads_use_the_replica_except_right_after_the_users_own_write(client, db, replica, monkeypatch):
+    admin = await create_user(db, "Admin", is_admin=True)
+    viewer = await create_user(db, "Viewer")
+    await replica.replicate()
+
+    response = await client.post("/api/products", json={"name": "Fresh"}, headers=auth(admin))
+    assert response.status_code == 201
+    assert database.LAST_WRITE_COOKIE in response.cookies
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as other_client:
+        # The writer sees its product at once, from any client; anyone else reads the lagging replica
+        assert await product_names(client, admin) == {"Fresh"}
+        assert await product_names(other_client, admin) == {"Fresh"}
+        assert await product_names(other_client, viewer) == set()
+
+        monkeypatch.setattr(database.settings, "read_your_writes_seconds", 0)
+        assert await product_names(client, admin) == set()
+
+        await replica.replicate()
+        assert await product_names(other_client, viewer) == {"Fresh"}
+
+
+async def test_the_cookie_pins_reads_when_another_worker_took_the_write(client, db, replica):
+    admin = await create_user(db, "Admin", is_admin=True)
+    await replica.replicate()
+
+    await client.post("/api/products", json={"name": "Fresh"}, headers=auth(admin))
+    # As if the write had been served by another process
+    database.recent_writers.clear()
+
+    assert await product_names(client, admin) == {"Fresh"}
+    client.cookies.clear()
+    assert await product_names(client, admin) == set()
+
+
+def test_request_user_id_prefers_the_impersonated_user():
+    token = create_access_token(7, "seven@example.com")
+
+    def request(headers):
+        return Request({"type": "http", "headers": [(k.encode(), v.encode()) for k, v in headers.items()]})
+
+    assert database.request_user_id(request({"authorization": f"Bearer {token}"})) == 7
+    assert database.request_user_id(request({"authorization": f"Bearer {token}", "x-user-id": "9"})) == 9
+    assert database.request_user_id(request({"authorization": "Bearer nonsense"})) is None
+    assert database.request_user_id(request({"x-user-id": "abc"})) is None
+
+
+async def test_writes_during_a_read_go_to_the_primary(client, db, replica):
+    admin = await create_user(db, "Admin", is_admin=True)
+    release = await create_release(db, criteria=["Content Review"])
+    for status in ("in_review", "cancelled"):
+        await client.put(f"/api/releases/{release.id}", json={"status": status}, headers=auth(admin))
+    await db.execute(delete(ReleaseSnapshot))
+    await db.commit()
+    await replica.replicate()
+    client.cookies.clear()
+
+    response = await client.get(f"/api/releases/{release.id}", headers=auth(admin))
+
+    assert response.status_code == 200
+    count = select(func.count()).select_from(ReleaseSnapshot)
+    assert await db.scalar(count) == 1
+    async with replica.engine.connect() as conn:
+        assert await conn.scalar(count) == 0
+
+
+async def test_without_replicas_no_cookie_is_set(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+
+    response = await client.post("/api/products", json={"name": "Solo"}, headers=auth(admin))
+
+    assert response.status_code == 201
+    assert database.LAST_WRITE_COOKIE not in response.cookies
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+from app.models.release import CriteriaStatus
+from app.models.signoff import SignOffStatus
+from app.utils.signoff_logic import compute_criteria_statuses
+
+APPROVED, REJECTED, REVOKED = SignOffStatus.APPROVED, SignOffStatus.REJECTED, SignOffStatus.REVOKED
+
+
+def criteria(criteria_id, release_id=1, is_mandatory=True, status=CriteriaStatus.PENDING):
+    return SimpleNamespace(id=criteria_id, release_id=release_id, is_mandatory=is_mandatory, status=status)
+
+
+def sign_off(criteria_id, user_id, status):
+    return SimpleNamespace(criteria_id=criteria_id, signed_by_id=user_id, status=status)
+
+
+def test_mandatory_and_optional_criteria_follow_the_same_rules():
+    statuses = compute_criteria_statuses(
+        [criteria(1), criteria(2, is_mandatory=False), criteria(3), criteria(4, is_mandatory=False)],
+        {1: {10, 11}},
+        [
+            sign_off(1, 10, APPROVED), sign_off(1, 11, APPROVED),
+            sign_off(2, 10, APPROVED), sign_off(2, 11, APPROVED),
+            sign_off(3, 10, APPROVED),
+        ],
+    )
+
+    assert statuses == {
+        1: CriteriaStatus.APPROVED,
+        2: CriteriaStatus.APPROVED,
+        3: CriteriaStatus.PENDING,
+        4: CriteriaStatus.PENDING,
+    }
+
+
+def test_any_rejection_wins_over_approvals():
+    statuses = compute_criteria_statuses(
+        [criteria(1)],
+        {1: {10, 11, 12}},
+        [sign_off(1, 10, APPROVED), sign_off(1, 11, REJECTED), sign_off(1, 12, APPROVED)],
+    )
+
+    assert statuses == {1: CriteriaStatus.REJECTED}
+
+
+def test_revoked_sign_offs_and_non_stakeholders_do_not_count():
+    statuses = compute_criteria_statuses(
+        [criteria(1), criteria(2)],
+        {1: {10, 11}},
+        [
+            sign_off(1, 10, APPROVED), sign_off(1, 11, REVOKED),
+            # A rejection by someone no longer assigned is ignored
+            sign_off(2, 10, APPROVED), sign_off(2, 11, APPROVED), sign_off(2, 99, REJECTED),
+        ],
+    )
+
+    assert statuses == {1: CriteriaStatus.PENDING, 2: CriteriaStatus.APPROVED}
+
+
+def test_criteria_without_stakeholders_stay_pending():
+    statuses = compute_criteria_statuses(
+        [criteria(1, release_id=1), criteria(2, release_id=2)],
+        {1: set()},
+        [sign_off(1, 10, APPROVED), sign_off(2, 10, REJECTED)],
+    )
+
+    assert statuses == {1: CriteriaStatus.PENDING, 2: CriteriaStatus.PENDING}
+
+
+def test_blocked_criteria_get_their_computed_status():
+    """BLOCKED is never computed; callers keep a manually blocked criteria's stored status."""
+    statuses = compute_criteria_statuses(
+        [criteria(1, status=CriteriaStatus.BLOCKED), criteria(2, release_id=2, status=CriteriaStatus.BLOCKED)],
+        {1: {10}, 2: {10}},
+        [sign_off(1, 10, APPROVED)],
+    )
+
+    assert statuses == {1: CriteriaStatus.APPROVED, 2: CriteriaStatus.PENDING}
+    assert CriteriaStatus.BLOCKED not in statuses.values()
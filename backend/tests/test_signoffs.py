@@ -0,0 +1,221 @@
+import asyncio
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from app.api import signoffs
+from app.database import writer_queue
+from app.models.audit import AuditLog
+from app.models.release import ReleaseCriteria
+from app.models.signoff import SignOff, SignOffStatus
+from app.schemas.signoff import SignOffCreate
+from tests.factories import auth, create_user, create_users, create_release
+
+CRITERIA = ["Content Review", "Full Regression", "Performance"]
+
+
+async def criteria_ids(client, user, release):
+    response = await client.get(f"/api/releases/{release.id}", headers=auth(user))
+    return [c["id"] for c in response.json()["criteria"]]
+
+
+async def sign_off_batch(client, user, items):
+    return await client.post("/api/sign-offs/batch", json={"items": items}, headers=auth(user))
+
+
+async def test_batch_reports_each_item_and_commits_the_valid_ones(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    lead, other = await create_users(db, 2)
+    mine = await create_release(db, "Mine", criteria=CRITERIA, stakeholders=[lead])
+    theirs = await create_release(db, "Theirs", criteria=CRITERIA, stakeholders=[other])
+    cancelled = await create_release(db, "Cancelled", criteria=CRITERIA, stakeholders=[lead])
+    for status in ("in_review", "cancelled"):
+        await client.put(f"/api/releases/{cancelled.id}", json={"status": status}, headers=auth(admin))
+    content, regression, performance = await criteria_ids(client, admin, mine)
+    await client.post(f"/api/criteria/{content}/sign-off", json={"status": "rejected"}, headers=auth(lead))
+
+    response = await sign_off_batch(client, lead, [
+        {"criteria_id": content, "status": "approved", "comment": "Fixed"},
+        {"criteria_id": regression, "status": "approved"},
+        {"criteria_id": performance, "status": "approved"},
+        {"criteria_id": performance, "status": "rejected"},
+        {"criteria_id": (await criteria_ids(client, admin, theirs))[0], "status": "approved"},
+        {"criteria_id": (await criteria_ids(client, admin, cancelled))[0], "status": "approved"},
+        {"criteria_id": 9999, "status": "approved"},
+    ])
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status_code"] for r in results] == [201, 400, 201, 400, 403, 400, 404]
+    assert results[1]["detail"] == "A test results link is required for 'Full Regression'"
+    assert results[0]["sign_off"]["comment"] == "Fixed"
+    assert results[1]["sign_off"] is None
+
+    active = (await db.execute(
+        select(SignOff.criteria_id, SignOff.status).where(SignOff.status != SignOffStatus.REVOKED)
+    )).all()
+    assert sorted(active) == [(content, SignOffStatus.APPROVED), (performance, SignOffStatus.APPROVED)]
+    actions = (await db.scalars(select(AuditLog.action).where(AuditLog.entity_type == "sign_off"))).all()
+    assert sorted(actions) == ["auto_revoke", "sign_off:approved", "sign_off:approved", "sign_off:rejected"]
+
+    detail = (await client.get(f"/api/releases/{mine.id}", headers=auth(lead))).json()
+    assert [c["status"] for c in detail["criteria"]] == ["approved", "pending", "approved"]
+    assert detail["progress"]["mandatory_approved"] == 2
+
+
+async def test_batch_matches_one_request_per_criteria(client, db):
+    stakeholders = await create_users(db, 2)
+    single = await create_release(db, "Single", criteria=CRITERIA, stakeholders=stakeholders)
+    batched = await create_release(db, "Batched", criteria=CRITERIA, stakeholders=stakeholders)
+    decisions = [
+        {"status": "approved"},
+        {"status": "approved", "link": "https://ci.example.com/1"},
+        {"status": "rejected", "comment": "Too slow"},
+    ]
+
+    for user in stakeholders:
+        for criteria_id, decision in zip(await criteria_ids(client, user, single), decisions):
+            await client.post(f"/api/criteria/{criteria_id}/sign-off", json=decision, headers=auth(user))
+        ids = await criteria_ids(client, user, batched)
+        response = await sign_off_batch(client, user, [
+            {"criteria_id": criteria_id, **decision} for criteria_id, decision in zip(ids, decisions)
+        ])
+        assert [r["status_code"] for r in response.json()["results"]] == [201, 201, 201]
+
+    def outcome(detail):
+        return [c["status"] for c in detail["criteria"]], detail["progress"]
+
+    single_detail = (await client.get(f"/api/releases/{single.id}", headers=auth(stakeholders[0]))).json()
+    batched_detail = (await client.get(f"/api/releases/{batched.id}", headers=auth(stakeholders[0]))).json()
+    assert outcome(batched_detail) == outcome(single_detail)
+    assert outcome(batched_detail)[0] == ["approved", "approved", "rejected"]
+
+
+async def test_batch_round_trips_are_constant(client, db, query_counter):
+    """Benchmark: 1 item or 8 criteria x 5 releases cost the same number of statements."""
+    lead = await create_user(db, "Lead")
+    await client.get("/api/users/me", headers=auth(lead))
+    names = [f"Check {i}" for i in range(8)]
+
+    counts = {}
+    for releases in (1, 5):
+        items = []
+        for i in range(releases):
+            release = await create_release(db, f"Platform {releases}-{i}", criteria=names, stakeholders=[lead])
+            items += [{"criteria_id": c, "status": "approved"} for c in await criteria_ids(client, lead, release)]
+        items = items[:1] if releases == 1 else items
+        # Reject first so the measured batch also auto-revokes and changes every status
+        await sign_off_batch(client, lead, [{**item, "status": "rejected"} for item in items])
+        with query_counter:
+            response = await sign_off_batch(client, lead, items)
+        assert [r["status_code"] for r in response.json()["results"]] == [201] * len(items)
+        counts[len(items)] = query_counter.count
+
+    assert counts[1] == counts[40], counts
+    assert await db.scalar(select(func.count()).select_from(SignOff).where(SignOff.status == SignOffStatus.REVOKED)) == 41
+
+
+async def test_revoke_reads_the_status_after_taking_the_release_lock(client, db, monkeypatch, query_counter):
+    """A sign-off committed just before the revoke locks the release must not skew progress."""
+    alice, bob = await create_users(db, 2)
+    release = await create_release(db, criteria=["Content Review"], stakeholders=[alice, bob])
+    criteria_id = (await criteria_ids(client, alice, release))[0]
+    await client.post(f"/api/criteria/{criteria_id}/sign-off", json={"status": "approved"}, headers=auth(alice))
+
+    real_bump = signoffs.bump_release
+
+    async def bump_after_bob_approves(session, *release_ids):
+        # Bob's approval commits after the revoke's first read: the criteria
+        # it saw as pending is approved by the time the lock is taken
+        monkeypatch.setattr(signoffs, "bump_release", real_bump)
+        query_counter.active = False
+        await signoffs._create_sign_off(session, criteria_id, SignOffCreate(status="approved"), bob.id)
+        query_counter.active = True
+        await real_bump(session, *release_ids)
+
+    monkeypatch.setattr(signoffs, "bump_release", bump_after_bob_approves)
+    with query_counter:
+        response = await client.delete(f"/api/criteria/{criteria_id}/sign-off", headers=auth(alice))
+
+    assert response.status_code == 204
+    # The status the revoke starts from is read after the lock, not before
+    lock = next(i for i, sql in enumerate(query_counter.statements) if sql.startswith("UPDATE releases"))
+    assert not any("release_criteria.status" in sql for sql in query_counter.statements[:lock])
+    detail = (await client.get(f"/api/releases/{release.id}", headers=auth(alice))).json()
+    assert detail["criteria"][0]["status"] == "pending"
+    assert detail["progress"]["mandatory_approved"] == 0
+
+
+async def test_only_one_active_sign_off_per_user_and_criteria(db):
+    user = await create_user(db, "Stakeholder")
+    release = await create_release(db, criteria=["Content Review"], stakeholders=[user])
+    criteria_id = (await db.scalars(select(ReleaseCriteria.id).where(ReleaseCriteria.release_id == release.id))).one()
+    revoked = dict(criteria_id=criteria_id, signed_by_id=user.id, status=SignOffStatus.REVOKED)
+    db.add_all([SignOff(**revoked), SignOff(**revoked), SignOff(**{**revoked, "status": SignOffStatus.APPROVED})])
+    await db.commit()
+
+    db.add(SignOff(**{**revoked, "status": SignOffStatus.REJECTED}))
+    with pytest.raises(IntegrityError):
+        await db.commit()
+
+
+async def test_conflicting_inserts_are_skipped_and_the_write_retried(db, query_counter):
+    user = await create_user(db, "Stakeholder")
+    release = await create_release(db, criteria=["Content Review"], stakeholders=[user])
+    criteria_id = (await db.scalars(select(ReleaseCriteria.id).where(ReleaseCriteria.release_id == release.id))).one()
+    db.add(SignOff(criteria_id=criteria_id, signed_by_id=user.id, status=SignOffStatus.APPROVED))
+    await db.commit()
+
+    with query_counter:
+        skipped = await db.scalar(
+            signoffs.insert_sign_offs(),
+            [{"criteria_id": criteria_id, "signed_by_id": user.id, "status": SignOffStatus.REJECTED}],
+        )
+    assert skipped is None
+    assert "ON CONFLICT" in query_counter.statements[0]
+    assert await db.scalar(select(func.count()).select_from(SignOff)) == 1
+    await db.rollback()
+
+    attempts = []
+
+    async def write(session):
+        attempts.append(session)
+        if len(attempts) == 1:
+            raise signoffs.SignOffConflict()
+        return "written"
+
+    assert await signoffs.with_conflict_retries(db, write) == "written"
+    assert len(attempts) == 2
+
+
+async def test_concurrent_sign_offs_leave_one_active_each(client, db, monkeypatch):
+    """Stress: racing submissions by the same users, with nothing queueing the writers."""
+    monkeypatch.setattr(writer_queue, "enabled", False)
+    stakeholders = await create_users(db, 3)
+    release = await create_release(db, criteria=["Content Review"], stakeholders=stakeholders)
+    criteria_id = (await criteria_ids(client, stakeholders[0], release))[0]
+    rounds = 8
+
+    responses = await asyncio.gather(*(
+        client.post(
+            f"/api/criteria/{criteria_id}/sign-off",
+            json={"status": "approved", "comment": f"Run {n}"},
+            headers=auth(user),
+        )
+        for n in range(rounds)
+        for user in stakeholders
+    ))
+
+    assert [r.status_code for r in responses] == [201] * rounds * len(stakeholders)
+    active = (await db.execute(
+        select(SignOff.signed_by_id, func.count())
+        .where(SignOff.status != SignOffStatus.REVOKED)
+        .group_by(SignOff.signed_by_id)
+    )).all()
+    assert sorted(active) == sorted((user.id, 1) for user in stakeholders)
+    actions = (await db.execute(
+        select(AuditLog.action, func.count()).where(AuditLog.entity_type == "sign_off").group_by(AuditLog.action)
+    )).all()
+    assert dict(actions) == {"sign_off:approved": rounds * 3, "auto_revoke": (rounds - 1) * 3}
+    detail = (await client.get(f"/api/releases/{release.id}", headers=auth(stakeholders[0]))).json()
+    assert detail["criteria"][0]["status"] == "approved"
+    assert detail["progress"]["mandatory_approved"] == 1
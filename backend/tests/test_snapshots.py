@@ -0,0 +1,90 @@
+from sqlalchemy import delete, select
+from app.models.release_snapshot import ReleaseSnapshot
+from tests.factories import auth, create_user, create_users, create_release
+
+
+async def snapshot_kinds(db, release_id):
+    result = await db.execute(select(ReleaseSnapshot.kind).where(ReleaseSnapshot.release_id == release_id))
+    return set(result.scalars().all())
+
+
+async def test_final_status_freezes_detail_and_matrix(client, db, query_counter):
+    admin = await create_user(db, "Admin", is_admin=True)
+    stakeholders = await create_users(db, 2)
+    release = await create_release(db, criteria=["Content Review", "Full Regression"], stakeholders=stakeholders)
+    detail_url = f"/api/releases/{release.id}"
+    matrix_url = f"/api/releases/{release.id}/sign-off-matrix"
+    await client.put(detail_url, json={"status": "in_review"}, headers=auth(admin))
+    criteria_id = (await client.get(detail_url, headers=auth(admin))).json()["criteria"][0]["id"]
+    await client.post(
+        f"/api/criteria/{criteria_id}/sign-off", json={"status": "approved", "comment": "Looks good ✓"}, headers=auth(stakeholders[0])
+    )
+    assert await snapshot_kinds(db, release.id) == set()
+
+    response = await client.put(detail_url, json={"status": "released"}, headers=auth(admin))
+    assert response.status_code == 200
+    assert await snapshot_kinds(db, release.id) == {"release", "matrix"}
+
+    frozen = {}
+    for url in (detail_url, matrix_url):
+        with query_counter:
+            frozen[url] = await client.get(url, headers=auth(admin))
+        assert frozen[url].status_code == 200
+        assert frozen[url].headers["content-type"] == "application/json"
+        assert query_counter.count == 1
+
+    # Rebuilding from the tables gives the same bodies
+    await db.execute(delete(ReleaseSnapshot))
+    await db.commit()
+    for url in (detail_url, matrix_url):
+        live = await client.get(url, headers=auth(admin))
+        assert live.content == frozen[url].content
+        assert live.headers["ETag"] == frozen[url].headers["ETag"]
+    assert frozen[detail_url].json()["status"] == "released"
+
+
+async def test_writes_after_freezing_are_not_hidden(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    stakeholder = await create_user(db, "Stakeholder")
+    release = await create_release(db, criteria=["Content Review"], stakeholders=[stakeholder])
+    detail_url = f"/api/releases/{release.id}"
+    await client.put(detail_url, json={"status": "in_review"}, headers=auth(admin))
+    await client.put(detail_url, json={"status": "cancelled"}, headers=auth(admin))
+    frozen = await client.get(detail_url, headers=auth(admin))
+
+    await client.put(detail_url, json={"candidate_build": "1.2.3"}, headers=auth(admin))
+
+    response = await client.get(detail_url, headers=auth(admin))
+    assert response.json()["candidate_build"] == "1.2.3"
+    assert response.headers["ETag"] != frozen.headers["ETag"]
+    # ...and that view re-froze the release at its new revision
+    again = await client.get(detail_url, headers=auth(admin))
+    assert again.content == response.content
+
+
+async def test_google_login_rename_reaches_frozen_releases(client, db, google_login):
+    admin = await create_user(db, "Admin", is_admin=True)
+    stakeholder = await create_user(db, "Stakeholder")
+    release = await create_release(db, criteria=["Content Review"], stakeholders=[stakeholder])
+    detail_url = f"/api/releases/{release.id}"
+    matrix_url = f"/api/releases/{release.id}/sign-off-matrix"
+    await client.put(detail_url, json={"status": "in_review"}, headers=auth(admin))
+    await client.put(detail_url, json={"status": "released"}, headers=auth(admin))
+    assert await snapshot_kinds(db, release.id) == {"release", "matrix"}
+
+    assert (await google_login(stakeholder.email, "Renamed Stakeholder")).status_code == 200
+
+    for url in (detail_url, matrix_url):
+        response = await client.get(url, headers=auth(admin))
+        assert "Renamed Stakeholder" in response.text
+        assert "\"Stakeholder\"" not in response.text
+
+
+async def test_open_releases_are_not_frozen(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    release = await create_release(db, criteria=["Content Review"])
+
+    await client.get(f"/api/releases/{release.id}", headers=auth(admin))
+    await client.get(f"/api/releases/{release.id}/sign-off-matrix", headers=auth(admin))
+
+    assert await snapshot_kinds(db, release.id) == set()
@@ -0,0 +1,160 @@
+from sqlalchemy import select, func, update
+from app.models.audit import AuditLog
+from app.models.release import Release, ReleaseCriteria, CriteriaStatus
+from app.models.release_stakeholder import ReleaseStakeholder
+from tests.factories import auth, create_user, create_users, create_release
+
+
+async def assign(client, admin, release, user_ids):
+    return await client.post(
+        f"/api/releases/{release.id}/stakeholders",
+        json={"user_ids": user_ids},
+        headers=auth(admin),
+    )
+
+
+async def test_assign_stakeholders_skips_existing_and_duplicates(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    users = await create_users(db, 3)
+    release = await create_release(db, criteria=["Full Regression"], stakeholders=[users[0]])
+
+    response = await assign(client, admin, release, [users[0].id, users[1].id, users[1].id, users[2].id])
+
+    assert response.status_code == 201
+    assert [s["user_id"] for s in response.json()] == [users[1].id, users[2].id]
+    count = await db.scalar(select(func.count()).select_from(ReleaseStakeholder))
+    assert count == 3
+    audit_count = await db.scalar(
+        select(func.count()).select_from(AuditLog).where(AuditLog.action == "assign", AuditLog.release_id == release.id)
+    )
+    assert audit_count == 2
+
+
+async def test_assign_stakeholders_rejects_unknown_users(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    release = await create_release(db)
+
+    response = await assign(client, admin, release, [admin.id, 9999])
+
+    assert response.status_code == 400
+
+
+async def test_bulk_remove_stakeholders(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    users = await create_users(db, 3)
+    release = await create_release(db, criteria=["Full Regression"], stakeholders=users)
+
+    response = await client.post(
+        f"/api/releases/{release.id}/stakeholders/bulk-remove",
+        json={"user_ids": [users[0].id, users[1].id, 9999]},
+        headers=auth(admin),
+    )
+
+    assert response.status_code == 200
+    assert sorted(s["user_id"] for s in response.json()) == [users[0].id, users[1].id]
+    remaining = (await db.scalars(select(ReleaseStakeholder.user_id))).all()
+    assert remaining == [users[2].id]
+
+    missing = await client.post(
+        "/api/releases/9999/stakeholders/bulk-remove", json={"user_ids": [users[2].id]}, headers=auth(admin)
+    )
+    assert missing.status_code == 404
+
+
+async def test_assign_stakeholders_round_trips_are_constant(client, db, query_counter):
+    """Benchmark: assigning 1 or 160 users costs the same number of statements."""
+    admin = await create_user(db, "Admin", is_admin=True)
+    # Warm the authenticated-user cache so only the endpoint's own queries are counted
+    await client.get("/api/users/me", headers=auth(admin))
+
+    counts = {}
+    for size in (1, 10, 40, 160):
+        users = await create_users(db, size, prefix=f"batch{size}-")
+        release = await create_release(db, name=f"Release {size}", criteria=["Full Regression", "CPT Sign-off"])
+        with query_counter:
+            response = await assign(client, admin, release, [u.id for u in users])
+        assert response.status_code == 201
+        assert len(response.json()) == size
+        counts[size] = query_counter.count
+
+    print(f"\nassign_stakeholders statements by user count: {counts}")
+    assert len(set(counts.values())) == 1, counts
+
+
+async def test_bulk_remove_round_trips_are_constant(client, db, query_counter):
+    admin = await create_user(db, "Admin", is_admin=True)
+    await client.get("/api/users/me", headers=auth(admin))
+
+    counts = {}
+    for size in (1, 40, 160):
+        users = await create_users(db, size, prefix=f"remove{size}-")
+        release = await create_release(db, name=f"Release {size}", criteria=["Full Regression"], stakeholders=users)
+        with query_counter:
+            response = await client.post(
+                f"/api/releases/{release.id}/stakeholders/bulk-remove",
+                json={"user_ids": [u.id for u in users]},
+                headers=auth(admin),
+            )
+        assert response.status_code == 200
+        counts[size] = query_counter.count
+
+    assert len(set(counts.values())) == 1, counts
+
+
+async def stored_statuses(db, release):
+    result = await db.execute(
+        select(ReleaseCriteria.status, Release.mandatory_approved)
+        .join(Release, Release.id == ReleaseCriteria.release_id)
+        .where(ReleaseCriteria.release_id == release.id)
+        .order_by(ReleaseCriteria.id)
+        .execution_options(populate_existing=True)
+    )
+    rows = result.all()
+    return [status for status, _ in rows], rows[0].mandatory_approved
+
+
+async def test_stakeholder_changes_update_stored_statuses_and_progress(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    approver, holdout, newcomer = await create_users(db, 3)
+    release = await create_release(db, criteria=["Content Review", "Bug Verification"], stakeholders=[approver, holdout])
+    detail = (await client.get(f"/api/releases/{release.id}", headers=auth(admin))).json()
+    for criteria in detail["criteria"]:
+        await client.post(f"/api/criteria/{criteria['id']}/sign-off", json={"status": "approved"}, headers=auth(approver))
+    assert await stored_statuses(db, release) == ([CriteriaStatus.PENDING] * 2, 0)
+
+    response = await client.delete(f"/api/releases/{release.id}/stakeholders/{holdout.id}", headers=auth(admin))
+    assert response.status_code == 204
+    assert await stored_statuses(db, release) == ([CriteriaStatus.APPROVED] * 2, 2)
+
+    await assign(client, admin, release, [newcomer.id])
+    assert await stored_statuses(db, release) == ([CriteriaStatus.PENDING] * 2, 0)
+
+
+async def test_rebuild_criteria_statuses_repairs_every_release(client, db):
+    admin = await create_user(db, "Admin", is_admin=True)
+    user = await create_user(db, "Stakeholder")
+    releases = [
+        await create_release(db, f"Release {i}", criteria=["Content Review"], stakeholders=[user]) for i in range(3)
+    ]
+    for release in releases:
+        detail = (await client.get(f"/api/releases/{release.id}", headers=auth(admin))).json()
+        await client.post(
+            f"/api/criteria/{detail['criteria'][0]['id']}/sign-off", json={"status": "approved"}, headers=auth(user)
+        )
+    # Drift the stored state of two releases, as a missed recompute would
+    await db.execute(
+        update(ReleaseCriteria)
+        .where(ReleaseCriteria.release_id.in_([releases[0].id, releases[2].id]))
+        .values(status=CriteriaStatus.PENDING)
+    )
+    await db.execute(update(Release).where(Release.id == releases[0].id).values(mandatory_approved=0))
+    await db.execute(update(Release).where(Release.id == releases[2].id).values(mandatory_approved=0))
+    await db.commit()
+
+    assert (await client.post("/api/releases/rebuild-criteria-statuses", headers=auth(user))).status_code == 403
+    response = await client.post("/api/releases/rebuild-criteria-statuses?batch_size=2", headers=auth(admin))
+
+    assert response.status_code == 200
+    assert response.json() == {"releases_checked": 3, "releases_changed": 2, "criteria_updated": 2}
+    for release in releases:
+        assert await stored_statuses(db, release) == ([CriteriaStatus.APPROVED], 1)
@@ -12,9 +12,20 @@ export interface AuditLogEntry {
   timestamp: string;
 }
 
+// Page size when following the history's X-Next-Cursor header
+const HISTORY_PAGE_SIZE = 500;
+
 export async function getReleaseHistory(releaseId: number): Promise<AuditLogEntry[]> {
-  const { data } = await api.get(`/releases/${releaseId}/history`);
-  return data;
+  const entries: AuditLogEntry[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await api.get(`/releases/${releaseId}/history`, {
+      params: { limit: HISTORY_PAGE_SIZE, cursor },
+    });
+    entries.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return entries;
 }
 
 export async function queryAuditLogs(params?: {
@@ -136,9 +136,17 @@ export interface ReleaseDetail extends Release {
   stakeholders: ReleaseStakeholder[];
 }
 
+export interface ProductReleaseSummary {
+  product_id: number;
+  product_name: string;
+  total: number;
+  by_status: Record<ReleaseStatus, number>;
+}
+
 export interface DashboardSummary {
   total: number;
   by_status: Record<ReleaseStatus, number>;
+  by_product?: ProductReleaseSummary[];
 }
 
 export interface PendingSignOff {
@@ -148,6 +156,7 @@ export interface PendingSignOff {
   release_name: string;
   release_version: string;
   is_mandatory: boolean;
+  criteria_status: CriteriaStatus;
 }
 
 // Stakeholder types